@@ -1,17 +1,49 @@
 """带重试与错误处理的基础 HTTP 客户端"""
 
-from typing import Any, Dict, Optional
+import asyncio
+import gzip
+import importlib.util
+import time
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 import httpx
 from loguru import logger
 
+from halo_mcp_server.client.breaker import BreakerState, CircuitBreaker, api_group_of
+from halo_mcp_server.client.cache import ResponseCache, make_cache_key
+from halo_mcp_server.client.cassette import Cassette
+from halo_mcp_server.client.limiter import AdaptiveLimiter, Slot
+from halo_mcp_server.client.metrics import RequestMetrics
+from halo_mcp_server.client.retry import RetryPolicy, build_retry_policies
+from halo_mcp_server.client.singleflight import SingleFlight
+from halo_mcp_server.client.timeouts import (
+    TimeoutProfile,
+    build_timeout_profiles,
+    current_timeout_override,
+    deadline_exceeded,
+    fits_deadline,
+    operation_class_for,
+    remaining_budget,
+)
 from halo_mcp_server.config import settings
 from halo_mcp_server.exceptions import (
     AuthenticationError,
     AuthorizationError,
+    DeadlineExceededError,
+    HaloMCPError,
     NetworkError,
     ResourceNotFoundError,
 )
+from halo_mcp_server.utils import codec
+from halo_mcp_server.utils.jsonstream import ItemStreamParser
+
+# 预热连接时请求的轻量路径（Halo 的健康检查端点）
+WARMUP_PATH = "/actuator/health"
+# 请求体 gzip 压缩级别：兼顾压缩率与 CPU 开销
+GZIP_LEVEL = 6
+# 服务端拒绝压缩请求体时可能返回的状态码
+GZIP_REJECTED_STATUSES = frozenset({400, 415})
 
 
 class BaseHTTPClient:
@@ -32,6 +64,27 @@ class BaseHTTPClient:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
+        self._cache = ResponseCache(
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_size_mb * 1024 * 1024,
+            ttl=settings.cache_ttl,
+        )
+        self._inflight = SingleFlight()
+        self.retry_policies: Dict[str, RetryPolicy] = build_retry_policies()
+        self.timeout_profiles: Dict[str, TimeoutProfile] = build_timeout_profiles()
+        self._retry_stats: Dict[str, Any] = {
+            "retries": 0,
+            "exhausted": 0,
+            "deadline_skipped": 0,
+            "by_method": {},
+        }
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._probe_tasks: Set["asyncio.Task[None]"] = set()
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._metrics = RequestMetrics()
+        # 服务端是否接受 gzip 请求体：None 表示尚未确认
+        self._request_gzip: Optional[bool] = None
+        self._cassette: Optional[Cassette] = None
 
     async def __aenter__(self):
         """异步上下文管理器入口。"""
@@ -45,6 +98,8 @@ class BaseHTTPClient:
     async def connect(self) -> None:
         """创建 HTTP 客户端连接。"""
         if self._client is None:
+            http2 = self._http2_available()
+            transport, event_hooks = self._cassette_hooks()
             self._client = httpx.AsyncClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
@@ -52,17 +107,103 @@ class BaseHTTPClient:
                     max_connections=settings.http_pool_size,
                     max_keepalive_connections=settings.http_pool_size // 2,
                 ),
-                headers=self._headers,
+                # Content-Type 由每次请求设置：作为客户端默认请求头时会覆盖 httpx
+                # 为 multipart 上传生成的带 boundary 的请求头
+                headers={k: v for k, v in self._headers.items() if k != "Content-Type"},
                 follow_redirects=True,
+                http1=not (http2 and settings.http2_prior_knowledge),
+                http2=http2,
+                transport=transport,
+                event_hooks=event_hooks,
+            )
+            logger.debug(f"HTTP 客户端已连接：{self.base_url}（HTTP/2：{'是' if http2 else '否'}）")
+
+    def _cassette_hooks(
+        self,
+    ) -> Tuple[Optional[httpx.AsyncBaseTransport], Optional[Dict[str, List[Any]]]]:
+        """
+        按 ``HTTP_CASSETTE_MODE`` 准备录制钩子或回放传输层。
+
+        返回:
+            (回放用的传输层, 录制用的事件钩子)，未启用时均为 None
+        """
+        mode = settings.http_cassette_mode
+        if mode == "record":
+            self._cassette = Cassette(settings.http_cassette_path)
+            logger.info(f"HTTP 录制模式：请求将保存到 {self._cassette.path}")
+            return None, self._cassette.event_hooks()
+        if mode == "replay":
+            self._cassette = Cassette.load(settings.http_cassette_path)
+            logger.info(
+                f"HTTP 回放模式：使用 {self._cassette.path}"
+                f"（{len(self._cassette.interactions)} 条记录）"
+            )
+            return self._cassette.transport(settings.http_cassette_latency_ms), None
+        return None, None
+
+    def _http2_available(self) -> bool:
+        """
+        判断是否启用 HTTP/2。
+
+        HTTPS 下通过 ALPN 协商，服务端不支持时自动回退 HTTP/1.1；明文 HTTP 只有在
+        ``http2_prior_knowledge`` 开启时才会直接使用 h2c。
+        """
+        if not settings.enable_http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "已启用 HTTP/2，但未安装 h2（pip install 'halo-mcp-server[http2]'），回退到 HTTP/1.1"
+            )
+            return False
+        if self.base_url.startswith("http://") and not settings.http2_prior_knowledge:
+            logger.info(
+                "明文 HTTP 地址不会协商 HTTP/2，如服务端支持 h2c 请开启 HTTP2_PRIOR_KNOWLEDGE"
             )
-            logger.debug(f"HTTP 客户端已连接：{self.base_url}")
+        return True
+
+    async def warm_up(self, connections: int) -> int:
+        """
+        预先建立 keep-alive 连接，使首批请求无需再承担 DNS 解析与 TCP/TLS 握手。
+
+        并发发出轻量的 HEAD 健康检查请求，不经过重试、熔断与指标统计；
+        状态码不影响结果，只要连接建立成功即计入。预热失败（含回放模式下录制文件
+        中没有健康检查请求）只记录日志，不影响客户端启动。
+
+        参数:
+            connections: 期望建立的连接数（不超过连接池的 keep-alive 上限）
+
+        返回:
+            成功建立的连接数
+        """
+        if not self._client:
+            await self.connect()
+
+        count = min(connections, settings.http_pool_size // 2)
+        if count <= 0:
+            return 0
+
+        async def open_connection() -> bool:
+            try:
+                response = await self._client.head(WARMUP_PATH)
+                await response.aclose()
+                return True
+            except Exception as e:
+                logger.debug(f"预热连接失败：{e}")
+                return False
+
+        results = await asyncio.gather(*(open_connection() for _ in range(count)))
+        return sum(results)
 
     async def close(self) -> None:
         """关闭 HTTP 客户端连接。"""
+        for task in list(self._probe_tasks):
+            task.cancel()
         if self._client is not None:
             await self._client.aclose()
             self._client = None
             logger.debug("HTTP 客户端已关闭")
+        if self._cassette is not None and settings.http_cassette_mode == "record":
+            self._cassette.save()
 
     def set_auth_token(self, token: str) -> None:
         """
@@ -92,10 +233,14 @@ class BaseHTTPClient:
         data: Optional[Dict[str, Any]] = None,
         files: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        use_cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         发起带重试逻辑的 HTTP 请求。
 
+        GET 请求在启用缓存时优先读取响应缓存，并发的相同 GET 合并为一次请求；
+        其他方法完成后会使同一资源集合的缓存失效。
+
         参数:
             method: HTTP 方法
             path: 请求路径
@@ -104,6 +249,7 @@ class BaseHTTPClient:
             data: 表单数据
             files: 上传文件
             headers: 额外请求头
+            use_cache: 是否使用 GET 响应缓存（默认跟随 ``settings.enable_cache``）
 
         返回:
             响应 JSON
@@ -113,125 +259,694 @@ class BaseHTTPClient:
             ResourceNotFoundError：资源未找到
             NetworkError：网络/HTTP 错误
         """
+        method = method.upper()
+
+        if method != "GET":
+            try:
+                response = await self._send(
+                    method, path, params=params, json=json, data=data, files=files, headers=headers
+                )
+            finally:
+                if method not in ("HEAD", "OPTIONS"):
+                    self._cache.invalidate(path)
+                    # 写操作之前发出的 GET 的结果不再分享给之后的调用方
+                    self._inflight.forget_all()
+            return self._parse_response(response)
+
+        body = await self._get_body(path, params, headers, use_cache)
+        if not self._cache_enabled(use_cache):
+            return self._decode(body)
+        # 命中缓存与 304 重新验证时复用条目已解码的对象，不再重复解析
+        return self._cache.decoded(make_cache_key(path, params), body, self._decode)
+
+    async def _get_body(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        use_cache: Optional[bool],
+    ) -> bytes:
+        """
+        获取 GET 响应体原始字节，依次经过响应缓存与请求合并。
+
+        参数:
+            path: 请求路径
+            params: 查询参数
+            headers: 额外请求头
+            use_cache: 是否使用 GET 响应缓存
+
+        返回:
+            响应体字节（204 为空字节串）
+        """
+        cacheable = self._cache_enabled(use_cache)
+        key = make_cache_key(path, params)
+
+        if cacheable:
+            body = self._cache.get(key)
+            if body is not None:
+                logger.debug(f"缓存命中：{key}")
+                return body
+
+        # 自定义请求头可能改变响应内容，自定义超时与截止时间不应由其他调用方继承，
+        # 此类请求不参与合并
+        if (
+            headers
+            or current_timeout_override()
+            or remaining_budget() is not None
+            or not settings.enable_request_coalescing
+        ):
+            return await self._fetch(path, key, params, headers, cacheable)
+        return await self._inflight.do(key, lambda: self._fetch(path, key, params, None, cacheable))
+
+    async def _fetch(
+        self,
+        path: str,
+        key: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        cacheable: bool,
+    ) -> bytes:
+        """
+        发送 GET 请求并在成功时写入响应缓存，返回响应体字节。
+
+        缓存中存在带验证器的过期条目时附带 ``If-None-Match``/``If-Modified-Since``，
+        服务端返回 304 时直接复用缓存的响应体，不再重新下载。
+        请求进行期间发生写操作（缓存失效）时，响应不写入缓存。
+        """
+        generation = self._cache.generation
+        request_headers = headers
+        stale = self._cache.get_stale(key) if cacheable else None
+        if stale is not None:
+            request_headers = {**stale.conditional_headers(), **(headers or {})}
+
+        response = await self._send("GET", path, params=params, headers=request_headers)
+
+        if response.status_code == 304 and stale is not None:
+            body = self._cache.revalidated(key)
+            if body is not None:
+                logger.debug(f"缓存重新验证通过（304）：{key}")
+                return body
+            # 等待期间条目被淘汰，只能无条件重新获取
+            response = await self._send("GET", path, params=params, headers=headers)
+
+        if cacheable and response.status_code == 200:
+            self._cache.set(
+                key,
+                path,
+                response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                generation=generation,
+            )
+        return response.content
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        经所属 API 组的熔断器发送请求。
+
+        熔断器打开时直接抛出 ``NetworkError``，不再等待超时与重试。
+        超出调用方截止时间不说明服务端异常，不计入熔断器。
+
+        返回:
+            状态码为 2xx/3xx 的原始响应
+
+        异常:
+            AuthenticationError：认证失败
+            ResourceNotFoundError：资源未找到
+            NetworkError：网络/HTTP 错误或熔断中
+            DeadlineExceededError：超出工具调用的截止时间
+        """
+        if not settings.enable_circuit_breaker:
+            return await self._send_with_retries(
+                method,
+                path,
+                params=params,
+                json=json,
+                data=data,
+                files=files,
+                headers=headers,
+                stream=stream,
+            )
+
+        breaker = self._breaker_for(api_group_of(path))
+        if not breaker.allow():
+            raise NetworkError(
+                f"API 组 {breaker.group} 已熔断，请求被拒绝"
+                f"（约 {breaker.retry_in():.0f} 秒后探测恢复）",
+                details={"api_group": breaker.group, "circuit_state": breaker.state.value},
+            )
+        if method == "GET":
+            breaker.probe_path = path
+
+        try:
+            response = await self._send_with_retries(
+                method,
+                path,
+                params=params,
+                json=json,
+                data=data,
+                files=files,
+                headers=headers,
+                stream=stream,
+            )
+        except DeadlineExceededError:
+            raise
+        except NetworkError as e:
+            if e.status_code is None or e.status_code >= 500:
+                if breaker.record_failure():
+                    logger.error(
+                        f"API 组 {breaker.group} 连续失败 {breaker.consecutive_failures} 次，熔断器已打开"
+                    )
+                    self._schedule_probe(breaker)
+            else:
+                breaker.record_success()
+            raise
+        except HaloMCPError:
+            # 401/403/404 说明服务端仍正常响应
+            breaker.record_success()
+            raise
+
+        breaker.record_success()
+        return response
+
+    async def _send_with_retries(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        发送请求并处理重试与错误状态码。
+
+        ``stream=True`` 时收到响应头即返回，响应体由调用方读取并负责关闭响应。
+        设置了截止时间（工具参数 ``deadline_ms``）时，每次尝试（含并发限制排队）
+        都不超过剩余时间，退避后已来不及的重试会被跳过。
+
+        返回:
+            状态码为 2xx/3xx 的原始响应
+
+        异常:
+            AuthenticationError：认证失败
+            ResourceNotFoundError：资源未找到
+            NetworkError：网络/HTTP 错误
+            DeadlineExceededError：超出工具调用的截止时间
+        """
         if not self._client:
             await self.connect()
 
-        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        url = self._url(path)
         request_headers = {**self._headers, **(headers or {})}
 
         # Remove Content-Type for multipart/form-data (httpx will set it)
         if files:
             request_headers.pop("Content-Type", None)
 
-        retry_count = 0
-        last_error = None
+        # 请求体只编码一次，重试时复用
+        content = codec.dumps_bytes(json) if json is not None else None
+        if content is not None:
+            request_headers["Content-Type"] = "application/json"
+
+        plain_content = content
+        compressed = await self._compress_body(content)
+        if compressed is not None:
+            content = compressed
+            request_headers["Content-Encoding"] = "gzip"
+        # 本次请求是否在用明文重发被拒的压缩请求体
+        probing_gzip = False
+
+        policy = self.retry_policy_for(method)
+        group = api_group_of(path)
+        attempt = 0
+        response: Optional[httpx.Response] = None
+        started_at = time.perf_counter()
+
+        try:
+            while True:
+                response = None
+                try:
+                    logger.debug(f"API 请求：{method} {url}")
+
+                    # 超时按截止时间前的剩余时间收紧，每次尝试重新计算
+                    request = self._client.build_request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        content=content,
+                        data=data,
+                        files=files,
+                        headers=request_headers,
+                        timeout=self.timeout_for(method, path),
+                    )
+                    remaining = remaining_budget()
+                    if remaining is None:
+                        response = await self._send_once(group, request, stream)
+                    elif remaining <= 0:
+                        raise DeadlineExceededError(f"已超出截止时间，请求未发送：{method} {url}")
+                    else:
+                        response = await asyncio.wait_for(
+                            self._send_once(group, request, stream), remaining
+                        )
 
-        while retry_count <= settings.max_retries:
-            try:
-                logger.debug(f"API 请求：{method} {url}")
-
-                response = await self._client.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=json,
-                    data=data,
-                    files=files,
-                    headers=request_headers,
-                )
+                except (httpx.TimeoutException, httpx.NetworkError) as e:
+                    if attempt < policy.max_retries and policy.should_retry_error(e):
+                        delay = policy.backoff(attempt + 1)
+                        if self._retry_fits(delay):
+                            attempt += 1
+                            logger.warning(
+                                f"请求失败，正在重试（{attempt}/{policy.max_retries}）：{e}"
+                            )
+                            await self._wait_retry(method, delay)
+                            continue
+                    if isinstance(e, httpx.TimeoutException) and deadline_exceeded():
+                        raise DeadlineExceededError(f"请求超出截止时间：{method} {url}")
+                    if attempt:
+                        logger.error(f"请求在重试 {attempt} 次后仍失败：{e}")
+                        self._retry_stats["exhausted"] += 1
+                    raise NetworkError(f"网络错误：{e}")
 
-                # Handle error status codes
-                if response.status_code == 401:
-                    logger.error("认证失败（401）")
-                    raise AuthenticationError("认证失败。请检查令牌或凭据。")
-
-                if response.status_code == 403:
-                    logger.error("权限不足（403）")
-                    raise AuthorizationError("权限不足。访问受限。")
-
-                if response.status_code == 404:
-                    logger.error(f"资源未找到（404）：{url}")
-                    raise ResourceNotFoundError("资源", path)
-
-                if response.status_code >= 500:
-                    error_detail = response.text
-                    try:
-                        error_json = response.json()
-                        error_detail = (
-                            error_json.get("detail") or error_json.get("message") or error_detail
-                        )
-                    except Exception:
-                        pass
+                except asyncio.TimeoutError:
+                    raise DeadlineExceededError(f"请求超出截止时间：{method} {url}")
 
-                    logger.error(f"HTTP {response.status_code} 错误：{error_detail}")
-                    raise NetworkError(
-                        f"HTTP {response.status_code} 错误：{error_detail}",
-                        status_code=response.status_code,
-                    )
+                except DeadlineExceededError:
+                    raise
 
-                if response.status_code >= 400:
-                    error_detail = response.text
-                    try:
-                        error_json = response.json()
-                        error_detail = (
-                            error_json.get("detail") or error_json.get("message") or error_detail
+                except Exception as e:
+                    logger.error(f"请求过程中出现未预期错误：{e}", exc_info=True)
+                    raise NetworkError(f"未预期错误：{e}")
+
+                if "Content-Encoding" in request_headers and self._request_gzip is None:
+                    if response.status_code in GZIP_REJECTED_STATUSES:
+                        # 可能是服务端不支持压缩请求体，用明文重发一次以确认（不计入重试）
+                        await response.aclose()
+                        content = plain_content
+                        request_headers.pop("Content-Encoding")
+                        probing_gzip = True
+                        continue
+                    if response.status_code < 400:
+                        self._request_gzip = True
+                elif probing_gzip and response.status_code < 400:
+                    logger.warning("服务端不接受 gzip 压缩的请求体，已关闭请求体压缩")
+                    self._request_gzip = False
+                probing_gzip = False
+
+                if attempt < policy.max_retries:
+                    delay = policy.retry_delay_for_status(response, attempt + 1)
+                    if delay is not None and self._retry_fits(delay):
+                        attempt += 1
+                        logger.warning(
+                            f"HTTP {response.status_code}，{delay:.2f} 秒后重试"
+                            f"（{attempt}/{policy.max_retries}）：{method} {url}"
                         )
-                    except Exception:
-                        pass
+                        await response.aclose()
+                        await self._wait_retry(method, delay)
+                        continue
+                elif attempt and response.status_code in policy.retry_statuses:
+                    self._retry_stats["exhausted"] += 1
+
+                if stream and response.status_code >= 400:
+                    # 错误详情在响应体中
+                    await response.aread()
+                self._raise_for_status(response, path, url)
+                logger.debug(f"API 响应：{response.status_code}")
+                return response
+        finally:
+            if settings.enable_metrics:
+                self._record_metrics(method, path, content, response, started_at, attempt)
+
+    async def _send_once(self, group: str, request: httpx.Request, stream: bool) -> httpx.Response:
+        """在所属 API 组的并发限制内发送一次请求。"""
+        async with self._concurrency_slot(group) as slot:
+            response = await self._client.send(request, stream=stream)
+            status = response.status_code
+            slot.overloaded = status >= 500 or status == 429
+        return response
+
+    def _retry_fits(self, delay: float) -> bool:
+        """退避 ``delay`` 秒后是否仍在截止时间内；来不及时记录一次跳过的重试。"""
+        if fits_deadline(delay):
+            return True
+        logger.warning(f"距截止时间不足 {delay:.2f} 秒，跳过重试")
+        self._retry_stats["deadline_skipped"] += 1
+        return False
+
+    async def _compress_body(self, content: Optional[bytes]) -> Optional[bytes]:
+        """
+        按配置对 JSON 请求体进行 gzip 压缩。
 
-                    logger.error(f"HTTP {response.status_code} 错误：{error_detail}")
-                    raise NetworkError(
-                        f"HTTP {response.status_code} 错误：{error_detail}",
-                        status_code=response.status_code,
-                    )
+        返回:
+            压缩后的请求体；未启用、低于阈值、服务端已知不支持或压缩无收益时返回 None
+        """
+        if (
+            content is None
+            or not settings.enable_request_compression
+            or self._request_gzip is False
+            or len(content) < settings.request_compression_min_kb * 1024
+        ):
+            return None
+
+        # 数 MB 的正文压缩耗时可达数十毫秒，放到线程中避免阻塞事件循环
+        compressed = await asyncio.to_thread(gzip.compress, content, GZIP_LEVEL)
+        return compressed if len(compressed) < len(content) else None
+
+    def _record_metrics(
+        self,
+        method: str,
+        path: str,
+        content: Optional[bytes],
+        response: Optional[httpx.Response],
+        started_at: float,
+        retries: int,
+    ) -> None:
+        """记录一次逻辑请求（含全部重试）的耗时、体积、状态码与重试次数。"""
+        if response is None:
+            status: Any = "error"
+            request_bytes = len(content or b"")
+            response_bytes = 0
+        else:
+            status = response.status_code
+            request_bytes = int(response.request.headers.get("Content-Length") or 0)
+            try:
+                response_bytes = len(response.content)
+            except httpx.ResponseNotRead:
+                response_bytes = int(response.headers.get("Content-Length") or 0)
+        self._metrics.record(
+            method,
+            path,
+            status,
+            time.perf_counter() - started_at,
+            request_bytes,
+            response_bytes,
+            retries,
+        )
 
-                # Parse response
-                if response.status_code == 204:
-                    return {}
+    def get_metrics(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        获取按接口路由模板聚合的请求指标快照。
 
-                try:
-                    result = response.json()
-                    logger.debug(f"API 响应：{response.status_code}")
-                    return result
-                except Exception as e:
-                    logger.warning(f"解析 JSON 响应失败：{e}")
-                    return {"text": response.text}
-
-            except (httpx.TimeoutException, httpx.ConnectError, httpx.NetworkError) as e:
-                last_error = e
-                retry_count += 1
-                if retry_count <= settings.max_retries:
-                    logger.warning(
-                        f"请求失败，正在重试（{retry_count}/{settings.max_retries}）：{e}"
-                    )
-                    await self._wait_retry()
-                else:
-                    logger.error(f"请求在重试 {settings.max_retries} 次后仍失败：{e}")
-                    raise NetworkError(f"网络错误：{e}")
+        参数:
+            reset: 导出后是否清空指标
+
+        返回:
+            以 ``方法 路由模板`` 为键的指标字典
+        """
+        snapshot = self._metrics.snapshot()
+        if reset:
+            self._metrics.reset()
+        return snapshot
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.base_url}{path}"
+
+    def _breaker_for(self, group: str) -> CircuitBreaker:
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                group,
+                failure_threshold=settings.circuit_breaker_threshold,
+                recovery_timeout=settings.circuit_breaker_recovery_timeout,
+            )
+            self._breakers[group] = breaker
+        return breaker
 
-            except (AuthenticationError, ResourceNotFoundError, NetworkError):
-                raise
+    def _schedule_probe(self, breaker: CircuitBreaker) -> None:
+        """在后台调度半开探测。"""
+        task = asyncio.create_task(self._probe_until_closed(breaker))
+        self._probe_tasks.add(task)
+        task.add_done_callback(self._probe_tasks.discard)
 
-            except Exception as e:
-                logger.error(f"请求过程中出现未预期错误：{e}", exc_info=True)
-                raise NetworkError(f"未预期错误：{e}")
+    async def _probe_until_closed(self, breaker: CircuitBreaker) -> None:
+        """
+        等待恢复时间后以单个不重试的 GET 探测 API 组。
+
+        服务端返回非 5xx 响应即视为恢复并关闭熔断器，否则重新打开并继续等待。
+        """
+        while breaker.state != BreakerState.CLOSED:
+            await asyncio.sleep(breaker.retry_in())
+            if breaker.state == BreakerState.CLOSED or self._client is None:
+                return
+
+            breaker.half_open()
+            path = breaker.probe_path or f"/apis/{breaker.group}"
+            try:
+                response = await self._client.request("GET", self._url(path), headers=self._headers)
+                healthy = response.status_code < 500
+            except httpx.HTTPError as e:
+                logger.debug(f"熔断探测失败：{breaker.group}：{e}")
+                healthy = False
+
+            if healthy:
+                breaker.record_success()
+                logger.info(f"API 组 {breaker.group} 探测成功，熔断器已关闭")
+            else:
+                breaker.trip()
+                logger.warning(f"API 组 {breaker.group} 探测失败，熔断器保持打开")
+
+    def _concurrency_slot(self, group: str) -> AsyncContextManager[Slot]:
+        """获取 API 组的自适应并发槽位；未启用时不做限制。"""
+        if not settings.enable_adaptive_concurrency:
+            return nullcontext(Slot())
+        limiter = self._limiters.get(group)
+        if limiter is None:
+            limiter = AdaptiveLimiter(
+                group,
+                initial_limit=settings.http_pool_size,
+                min_limit=settings.adaptive_concurrency_min,
+                max_limit=settings.adaptive_concurrency_max,
+            )
+            self._limiters[group] = limiter
+        return limiter.slot()
+
+    def get_concurrency_limits(self) -> Dict[str, Dict[str, Any]]:
+        """获取各 API 组当前的并发上限、在途请求数与排队深度。"""
+        return {group: limiter.snapshot() for group, limiter in self._limiters.items()}
+
+    def get_circuit_breakers(self) -> Dict[str, Dict[str, Any]]:
+        """获取各 API 组熔断器状态。"""
+        return {group: breaker.snapshot() for group, breaker in self._breakers.items()}
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response, path: str, url: str) -> None:
+        """将错误状态码转换为对应异常。"""
+        if response.status_code == 401:
+            logger.error("认证失败（401）")
+            raise AuthenticationError("认证失败。请检查令牌或凭据。")
+
+        if response.status_code == 403:
+            logger.error("权限不足（403）")
+            raise AuthorizationError("权限不足。访问受限。")
+
+        if response.status_code == 404:
+            logger.error(f"资源未找到（404）：{url}")
+            raise ResourceNotFoundError("资源", path)
+
+        if response.status_code >= 400:
+            error_detail = response.text
+            try:
+                error_json = response.json()
+                error_detail = error_json.get("detail") or error_json.get("message") or error_detail
+            except Exception:
+                pass
+
+            logger.error(f"HTTP {response.status_code} 错误：{error_detail}")
+            raise NetworkError(
+                f"HTTP {response.status_code} 错误：{error_detail}",
+                status_code=response.status_code,
+            )
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> Dict[str, Any]:
+        """解析响应 JSON；204 返回空字典，非 JSON 响应返回文本。"""
+        if response.status_code == 204:
+            return {}
+        return BaseHTTPClient._decode(response.content)
+
+    @staticmethod
+    def _decode(body: bytes) -> Dict[str, Any]:
+        """解析响应体 JSON；空响应体返回空字典，非 JSON 内容返回文本。"""
+        if not body:
+            return {}
+
+        try:
+            return codec.loads(body)
+        except Exception as e:
+            logger.warning(f"解析 JSON 响应失败：{e}")
+            return {"text": body.decode("utf-8", errors="replace")}
+
+    def _cache_enabled(self, use_cache: Optional[bool]) -> bool:
+        """判断本次 GET 是否使用响应缓存。"""
+        if not settings.enable_cache or self._cache.ttl <= 0:
+            return False
+        return True if use_cache is None else use_cache
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """获取响应缓存统计（条目数、字节数、命中率等）。"""
+        return self._cache.stats()
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """获取 GET 请求合并统计（leaders 为实际发出的请求数，coalesced 为被合并的请求数）。"""
+        return self._inflight.stats()
+
+    def clear_cache(self) -> None:
+        """清空响应缓存。"""
+        self._cache.clear()
+
+    async def _wait_retry(self, method: str, delay: float) -> None:
+        """记录一次重试并在重试前等待。"""
+        self._retry_stats["retries"] += 1
+        self._retry_stats["by_method"][method] = self._retry_stats["by_method"].get(method, 0) + 1
+        await asyncio.sleep(delay)
+
+    def timeout_for(self, method: str, path: str) -> httpx.Timeout:
+        """
+        获取请求的超时：按操作类别（元数据读取、内容写入、上传、发布）取配置，
+        再应用当前工具调用的 ``timeout`` 覆盖，并收紧到截止时间前的剩余时间。
+
+        参数:
+            method: HTTP 方法
+            path: 请求路径
+
+        返回:
+            httpx 超时对象
+        """
+        profile = self.timeout_profiles[operation_class_for(method, path)]
+        profile = profile.with_overrides(current_timeout_override())
+        remaining = remaining_budget()
+        if remaining is not None:
+            profile = profile.capped(max(remaining, 0.001))
+        return profile.to_httpx()
 
-        raise NetworkError(f"请求在重试 {settings.max_retries} 次后仍失败：{last_error}")
+    def retry_policy_for(self, method: str) -> RetryPolicy:
+        """获取指定 HTTP 方法的重试策略。"""
+        return self.retry_policies.get(method.upper()) or self.retry_policies["POST"]
 
-    async def _wait_retry(self) -> None:
-        """重试前等待。"""
-        import asyncio
+    def set_retry_policy(self, method: str, policy: RetryPolicy) -> None:
+        """覆盖指定 HTTP 方法的重试策略。"""
+        self.retry_policies[method.upper()] = policy
 
-        await asyncio.sleep(settings.retry_delay)
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """获取重试统计（总重试次数、按方法分布、重试耗尽次数、因截止时间跳过的重试次数）。"""
+        return {**self._retry_stats, "by_method": dict(self._retry_stats["by_method"])}
 
     async def get(
         self,
         path: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        use_cache: Optional[bool] = None,
     ) -> Dict[str, Any]:
-        """GET 请求。"""
-        return await self._request("GET", path, params=params, headers=headers)
+        """
+        GET 请求。
+
+        使用缓存时返回的对象与缓存条目共享，调用方不得修改。读取后需要修改并回写的场景
+        （依赖 ``metadata.version`` 乐观锁）应传入 ``use_cache=False`` 以获取最新的独立数据。
+        """
+        return await self._request("GET", path, params=params, headers=headers, use_cache=use_cache)
+
+    async def get_raw(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        use_cache: Optional[bool] = None,
+    ) -> bytes:
+        """
+        GET 请求，直接返回响应体原始字节而不解析 JSON。
+
+        适用于只需将 Halo 响应原样转交给调用方的只读场景，省去解析与重新序列化；
+        与 :meth:`get` 共享响应缓存、请求合并、重试与熔断逻辑。
+
+        参数:
+            path: 请求路径
+            params: 查询参数
+            headers: 额外请求头
+            use_cache: 是否使用 GET 响应缓存（默认跟随 ``settings.enable_cache``）
+
+        返回:
+            响应体字节（204 为空字节串）
+        """
+        return await self._get_body(path, params, headers, use_cache)
+
+    def decode_raw(
+        self, body: bytes, path: str, params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        解码 :meth:`get_raw` 读取到的响应体。
+
+        与响应缓存中该请求的条目一致时复用条目已解码的对象，与 :meth:`get` 相同，调用方不得修改。
+
+        参数:
+            body: :meth:`get_raw` 返回的响应体
+            path: 请求路径
+            params: 查询参数
+
+        返回:
+            解析后的 JSON 数据
+        """
+        return self._cache.decoded(make_cache_key(path, params), body, self._decode)
+
+    async def stream_items(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        key: str = "items",
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        流式 GET 列表接口，边下载边解析，逐个产出 ``items`` 数组中的元素。
+
+        内存占用只与单个元素大小有关，适合大 ``size`` 的列表与导出场景。
+        不经过响应缓存与请求合并；重试、熔断与并发限制只作用于响应头到达之前。
+
+        参数:
+            path: 请求路径
+            params: 查询参数
+            headers: 额外请求头
+            key: 要流式解析的顶层数组字段名
+            meta: 传入字典时，遍历结束后写入响应中的顶层标量字段（如 ``total``、``hasNext``）
+
+        返回:
+            逐个元素的异步迭代器
+
+        异常:
+            NetworkError：网络/HTTP 错误或响应体不是合法 JSON
+            DeadlineExceededError：读取响应体时超出截止时间（已产出的元素仍然有效）
+        """
+        response = await self._send("GET", path, params=params, headers=headers, stream=True)
+        parser = ItemStreamParser(key)
+        try:
+            async for chunk in response.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield item
+                if deadline_exceeded():
+                    raise DeadlineExceededError(f"读取列表响应时超出截止时间：{path}")
+            parser.close()
+        except codec.JSONDecodeError as e:
+            raise NetworkError(f"解析列表响应失败：{e}")
+        except httpx.HTTPError as e:
+            if isinstance(e, httpx.TimeoutException) and deadline_exceeded():
+                raise DeadlineExceededError(f"读取列表响应时超出截止时间：{path}")
+            raise NetworkError(f"读取列表响应失败：{e}")
+        finally:
+            await response.aclose()
+
+        if meta is not None:
+            meta.update(parser.meta)
 
     async def post(
         self,
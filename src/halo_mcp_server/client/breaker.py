@@ -0,0 +1,114 @@
+"""按 API 组划分的熔断器"""
+
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class BreakerState(str, Enum):
+    """熔断器状态"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def api_group_of(path: str) -> str:
+    """
+    提取路径所属的 API 组。
+
+    ``/apis/uc.api.content.halo.run/v1alpha1/posts`` → ``uc.api.content.halo.run``，
+    非 ``/apis`` 路径归入 ``default`` 组。
+    """
+    parts = [p for p in path.split("?", 1)[0].split("/") if p]
+    if len(parts) >= 2 and parts[0] == "apis":
+        return parts[1]
+    return "default"
+
+
+class CircuitBreaker:
+    """
+    单个 API 组的熔断器。
+
+    连续失败达到阈值后打开，打开期间请求直接失败；经过恢复时间后进入半开状态，
+    由后台探测请求决定关闭还是重新打开。半开期间业务请求仍然快速失败，
+    避免大量请求同时压向尚未恢复的服务。
+    """
+
+    def __init__(self, group: str, failure_threshold: int, recovery_timeout: float):
+        """
+        初始化熔断器。
+
+        参数:
+            group: API 组名
+            failure_threshold: 触发熔断的连续失败次数
+            recovery_timeout: 打开后等待多久开始探测（秒）
+        """
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = BreakerState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_path: Optional[str] = None
+        self.total_failures = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """是否允许请求通过；拒绝时计数。"""
+        if self.state == BreakerState.CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """记录一次成功：清零失败计数并关闭熔断器。"""
+        self.consecutive_failures = 0
+        self.state = BreakerState.CLOSED
+        self.opened_at = None
+
+    def record_failure(self) -> bool:
+        """
+        记录一次失败。
+
+        返回:
+            本次失败是否使熔断器由关闭转为打开
+        """
+        self.total_failures += 1
+        self.consecutive_failures += 1
+        if (
+            self.state == BreakerState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self.trip()
+            return True
+        return False
+
+    def trip(self) -> None:
+        """打开熔断器。"""
+        self.state = BreakerState.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def half_open(self) -> None:
+        """进入半开状态，等待探测结果。"""
+        self.state = BreakerState.HALF_OPEN
+
+    def retry_in(self) -> float:
+        """距离下一次探测的剩余秒数。"""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出当前状态。"""
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "total_failures": self.total_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
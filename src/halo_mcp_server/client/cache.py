@@ -0,0 +1,278 @@
+"""GET 响应缓存（LRU + TTL，按条目数与字节数双重限额，支持条件请求重新验证）"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Optional
+from urllib.parse import urlencode
+
+# 写入某类资源后一并失效的关联资源：文章列表内嵌分类与标签，分类与标签带有文章计数
+RELATED_RESOURCES: Dict[str, FrozenSet[str]] = {
+    "posts": frozenset({"tags", "categories"}),
+    "tags": frozenset({"posts"}),
+    "categories": frozenset({"posts"}),
+}
+
+# 条目尚未解码的标记（解码结果本身可能为 None）
+_UNDECODED = object()
+
+
+@dataclass
+class CacheEntry:
+    """
+    缓存条目：保存原始响应体，以及首次读取时解码出的对象。
+
+    解码结果在命中与 304 重新验证之间共享，调用方不得修改；
+    需要修改后回写的场景应使用 ``use_cache=False`` 获取独立的对象。
+    """
+
+    path: str
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    decoded: Any = field(default=_UNDECODED, repr=False, compare=False)
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """构造重新验证用的条件请求头。"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+
+def resource_of(path: str) -> str:
+    """
+    提取路径对应的资源集合名。
+
+    Halo 的路径形如 ``/apis/<group>/<version>/<plural>/...``，同一资源会在
+    console / uc / extension 等多个 API 组下暴露，因此失效时按 ``<plural>``
+    匹配，而不是按完整前缀匹配。非 ``/apis`` 路径直接返回去掉查询串的路径。
+    """
+    path = path.split("?", 1)[0]
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 4 and parts[0] == "apis":
+        return parts[3]
+    return path.rstrip("/")
+
+
+def segments_of(path: str) -> FrozenSet[str]:
+    """
+    提取路径中 ``/apis/<group>/<version>/`` 之后的全部路径段。
+
+    用于失效匹配：``/apis/.../tags/{name}/posts`` 这类跨资源的列表接口
+    在 ``posts`` 段上也能被文章的写操作命中。非 ``/apis`` 路径返回 :func:`resource_of` 的结果。
+    """
+    path = path.split("?", 1)[0]
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 4 and parts[0] == "apis":
+        return frozenset(parts[3:])
+    return frozenset({path.rstrip("/")})
+
+
+def make_cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    生成缓存键：路径 + 规范化后的查询参数。
+
+    参数按键排序、忽略 ``None`` 值，列表参数按顺序展开，
+    因此 ``{"size": 20, "page": 0}`` 与 ``{"page": 0, "size": 20}`` 命中同一条目。
+    """
+    if not params:
+        return path
+    items = []
+    for key in sorted(params):
+        value = params[key]
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            items.extend((key, _normalize_value(v)) for v in value)
+        else:
+            items.append((key, _normalize_value(value)))
+    if not items:
+        return path
+    return f"{path}?{urlencode(items)}"
+
+
+def _normalize_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+class ResponseCache:
+    """有界的 GET 响应缓存。"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        """
+        初始化缓存。
+
+        参数:
+            max_entries: 最大条目数
+            max_bytes: 所有响应体合计的最大字节数
+            ttl: 条目存活时间（秒），0 表示不缓存
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.revalidations = 0
+        self.bytes_saved = 0
+        # 每次失效或清空时递增；请求发出前记录，返回时已变化则不写回缓存
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        读取未过期的响应体，命中时刷新 LRU 顺序。
+
+        过期但带有验证器（ETag/Last-Modified）的条目会保留，供 :meth:`get_stale` 重新验证。
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            if not entry.has_validators:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.body
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """获取可用于重新验证的条目（不论是否过期），没有验证器时返回 ``None``。"""
+        entry = self._entries.get(key)
+        if entry is None or not entry.has_validators:
+            return None
+        return entry
+
+    def set(
+        self,
+        key: str,
+        path: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        写入响应体及其验证器；超过单条上限的响应不缓存。
+
+        ``generation`` 为请求发出前的 :attr:`generation`。请求进行期间发生过失效时，
+        响应可能早于写操作生成，不写入缓存。
+        """
+        if self.ttl <= 0 or len(body) > self.max_bytes:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(
+            path=path,
+            body=body,
+            expires_at=time.monotonic() + self.ttl,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def revalidated(self, key: str) -> Optional[bytes]:
+        """
+        服务端返回 304 后刷新条目的过期时间。
+
+        返回:
+            缓存的响应体；条目已被淘汰时返回 ``None``
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.expires_at = time.monotonic() + self.ttl
+        self._entries.move_to_end(key)
+        self.revalidations += 1
+        self.bytes_saved += entry.size
+        return entry.body
+
+    def decoded(self, key: str, body: bytes, decode: Callable[[bytes], Any]) -> Any:
+        """
+        返回响应体的解码结果，每个缓存条目只解码一次。
+
+        参数:
+            key: 缓存键
+            body: 本次读取到的响应体
+            decode: 解码函数
+
+        返回:
+            解码结果；``body`` 与条目不一致（未写入缓存或已被替换）时单独解码，不共享
+        """
+        entry = self._entries.get(key)
+        if entry is None or (entry.body is not body and entry.body != body):
+            return decode(body)
+        if entry.decoded is _UNDECODED:
+            entry.decoded = decode(body)
+        return entry.decoded
+
+    def invalidate(self, path: str) -> int:
+        """
+        使写操作涉及的资源集合的条目失效。
+
+        条目路径的任一段是被写入的资源集合或其关联资源（见 ``RELATED_RESOURCES``）即失效，
+        因此 ``/tags/{name}/posts`` 等跨资源列表与分类/标签的文章计数也会随文章写入失效。
+
+        返回:
+            被移除的条目数
+        """
+        resource = resource_of(path)
+        affected = RELATED_RESOURCES.get(resource, frozenset()) | {resource}
+        self.generation += 1
+        stale = [k for k, e in self._entries.items() if affected & segments_of(e.path)]
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """清空所有条目（保留统计计数）。"""
+        self.generation += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """返回命中率等统计信息。"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "revalidations": self.revalidations,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
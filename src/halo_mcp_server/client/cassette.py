@@ -0,0 +1,205 @@
+"""HTTP 请求录制与回放（cassette）"""
+
+import asyncio
+import base64
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import httpx
+from loguru import logger
+
+from halo_mcp_server.utils import codec
+
+CASSETTE_VERSION = 1
+# 回放时需要保留的响应头，其余（Date、Set-Cookie 等）不写入 cassette
+KEPT_RESPONSE_HEADERS = ("content-type", "etag", "last-modified", "retry-after", "location")
+# 响应体中需要脱敏的顶层字段（登录接口返回的令牌）
+REDACTED_FIELDS = ("access_token", "refresh_token")
+
+_STARTED_AT = "halo_mcp_cassette_started_at"
+
+
+class CassetteMiss(LookupError):
+    """回放时 cassette 中没有与请求匹配的记录。"""
+
+
+def request_key(method: str, url: httpx.URL) -> str:
+    """
+    生成请求匹配键：方法 + 路径 + 排序后的查询参数。
+
+    不包含主机与请求体，录制与回放可以使用不同的 ``HALO_BASE_URL``，
+    请求体中的时间戳等易变内容也不影响匹配。
+    """
+    query = "&".join(f"{k}={v}" for k, v in sorted(url.params.multi_items()))
+    return f"{method.upper()} {url.path}" + (f"?{query}" if query else "")
+
+
+class Cassette:
+    """
+    按顺序保存请求/响应对的 cassette 文件。
+
+    回放时同一匹配键的记录按录制顺序依次返回，用尽后重复返回最后一条，
+    因此同一接口在录制前后多次调用（如更新前后读取文章）也能得到对应的响应。
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        初始化 cassette。
+
+        参数:
+            path: cassette 文件路径
+        """
+        self.path = Path(path)
+        self.interactions: List[Dict[str, Any]] = []
+        self._cursors: Dict[str, int] = {}
+        self._index: Dict[str, List[int]] = {}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        """
+        从文件加载 cassette。
+
+        异常:
+            FileNotFoundError：文件不存在
+            ValueError：文件版本不受支持
+        """
+        cassette = cls(path)
+        data = codec.loads(cassette.path.read_bytes())
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"不支持的 cassette 版本：{data.get('version')}")
+        for interaction in data["interactions"]:
+            cassette._append(interaction)
+        return cassette
+
+    def save(self) -> None:
+        """写入 cassette 文件。"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        self.path.write_text(codec.dumps(data, pretty=True), encoding="utf-8")
+        logger.info(f"已录制 {len(self.interactions)} 个请求到 {self.path}")
+
+    def _append(self, interaction: Dict[str, Any]) -> None:
+        self._index.setdefault(interaction["key"], []).append(len(self.interactions))
+        self.interactions.append(interaction)
+
+    # ========== 录制 ==========
+
+    def event_hooks(self) -> Dict[str, List[Callable[..., Any]]]:
+        """返回用于 ``httpx.AsyncClient(event_hooks=...)`` 的录制钩子。"""
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        request.extensions[_STARTED_AT] = time.perf_counter()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        # 录制模式下需要完整响应体，流式响应也会在此读取
+        await response.aread()
+        request = response.request
+        started_at = request.extensions.get(_STARTED_AT, time.perf_counter())
+        self.record(request, response, time.perf_counter() - started_at)
+
+    def record(self, request: httpx.Request, response: httpx.Response, latency: float) -> None:
+        """
+        追加一条请求/响应记录。
+
+        参数:
+            request: 请求
+            response: 已读取响应体的响应
+            latency: 请求耗时（秒）
+        """
+        body, encoding = _encode_body(_redact(response.content, response.headers))
+        headers = {
+            name: response.headers[name]
+            for name in KEPT_RESPONSE_HEADERS
+            if name in response.headers
+        }
+        self._append(
+            {
+                "key": request_key(request.method, request.url),
+                "request": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "body_bytes": int(request.headers.get("Content-Length") or 0),
+                },
+                "response": {
+                    "status": response.status_code,
+                    "headers": headers,
+                    "body": body,
+                    "encoding": encoding,
+                },
+                "latency_ms": round(latency * 1000, 2),
+            }
+        )
+
+    # ========== 回放 ==========
+
+    def match(self, request: httpx.Request) -> Dict[str, Any]:
+        """
+        查找与请求匹配的下一条记录。
+
+        异常:
+            CassetteMiss：没有匹配的记录
+        """
+        key = request_key(request.method, request.url)
+        positions = self._index.get(key)
+        if not positions:
+            raise CassetteMiss(f"cassette {self.path} 中没有匹配的请求：{key}")
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return self.interactions[positions[min(cursor, len(positions) - 1)]]
+
+    def transport(self, latency_ms: float = -1.0) -> httpx.MockTransport:
+        """
+        创建回放用的 MockTransport。
+
+        参数:
+            latency_ms: 每个请求的模拟延迟（毫秒）；为负数时使用录制时的实际耗时
+
+        返回:
+            按 cassette 响应请求的传输层
+        """
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            interaction = self.match(request)
+            delay = interaction["latency_ms"] if latency_ms < 0 else latency_ms
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            recorded = interaction["response"]
+            return httpx.Response(
+                recorded["status"],
+                headers=recorded["headers"],
+                content=_decode_body(recorded["body"], recorded["encoding"]),
+            )
+
+        return httpx.MockTransport(handler)
+
+
+def _redact(content: bytes, headers: httpx.Headers) -> bytes:
+    """将 JSON 响应体中的令牌字段替换为占位符。"""
+    if "json" not in headers.get("content-type", "") or not any(
+        field.encode() in content for field in REDACTED_FIELDS
+    ):
+        return content
+    try:
+        data = codec.loads(content)
+    except codec.JSONDecodeError:
+        return content
+    if isinstance(data, dict):
+        for field in REDACTED_FIELDS:
+            if field in data:
+                data[field] = "redacted"
+    return codec.dumps_bytes(data)
+
+
+def _encode_body(content: bytes) -> Tuple[str, str]:
+    try:
+        return content.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def _decode_body(body: str, encoding: Optional[str]) -> bytes:
+    if encoding == "base64":
+        return base64.b64decode(body)
+    return body.encode("utf-8")
@@ -1,13 +1,31 @@
 """Halo API 客户端"""
 
+import asyncio
+from enum import Enum
 from typing import Any, Dict, List, Optional
 
+import httpx
 from loguru import logger
 
 from halo_mcp_server.client.base import BaseHTTPClient
+from halo_mcp_server.client.token_store import CachedToken, TokenStore, token_expiry
 from halo_mcp_server.config import settings
 from halo_mcp_server.exceptions import AuthenticationError, ConfigurationError
 
+LOGIN_PATH = "/apis/api.console.halo.run/v1alpha1/auth/login"
+
+# 后台刷新失败后的重试间隔（秒）
+TOKEN_REFRESH_RETRY_DELAY = 30.0
+
+
+class AuthState(str, Enum):
+    """认证状态"""
+
+    UNINITIALIZED = "uninitialized"
+    CONNECTING = "connecting"
+    READY = "ready"
+    FAILED = "failed"
+
 
 class HaloClient(BaseHTTPClient):
     """带认证的 Halo API 客户端"""
@@ -18,31 +36,67 @@ class HaloClient(BaseHTTPClient):
             base_url=settings.halo_base_url,
             timeout=settings.mcp_timeout,
         )
-        self._authenticated = False
+        self.auth_state = AuthState.UNINITIALIZED
+        self.auth_error: Optional[BaseException] = None
+        # 进行中的认证；并发调用方等待同一次认证
+        self._auth_task: Optional["asyncio.Task[None]"] = None
+        self._token: Optional[CachedToken] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._token_store: Optional[TokenStore] = None
+        # 并发请求同时收到 401 时只重新登录一次
+        self._auth_lock = asyncio.Lock()
+        self._auth_stats: Dict[str, int] = {"reauths": 0, "replays": 0, "failures": 0}
+        # 录制/回放时总是真实登录，保证 cassette 中包含登录请求
+        if settings.enable_token_cache and settings.http_cassette_mode == "off":
+            self._token_store = TokenStore(settings.token_cache_path)
 
     async def authenticate(self) -> None:
         """
         与 Halo 服务器进行认证。
 
+        已有认证在进行时等待其结果，不会重复登录；
+        单个调用方被取消不会中断其他调用方等待的认证。
+
         异常:
             ConfigurationError：未配置认证方式
             AuthenticationError：认证失败
         """
+        if self._auth_task is None or self._auth_task.done():
+            self._auth_task = asyncio.create_task(self._run_authentication())
+        await asyncio.shield(self._auth_task)
+
+    async def _run_authentication(self) -> None:
+        """执行一次认证并维护认证状态。"""
+        self.auth_state = AuthState.CONNECTING
+        try:
+            await self._authenticate()
+        except BaseException as e:
+            self.auth_state = AuthState.FAILED
+            self.auth_error = e
+            raise
+        self.auth_state = AuthState.READY
+        self.auth_error = None
+
+    async def _authenticate(self) -> None:
+        """按配置使用令牌或用户名/密码认证。"""
         # Try token authentication first
         if settings.has_token_auth:
             token = settings.halo_token
             if token:  # Type guard to ensure token is not None
                 self.set_auth_token(token)
-                self._authenticated = True
                 logger.info("使用令牌认证成功")
                 return
 
         # Try password authentication
         if settings.has_password_auth:
+            cached = self._load_cached_token()
+            if cached is not None:
+                self._use_token(cached)
+                logger.info("使用缓存的访问令牌认证成功")
+                return
             try:
-                token = await self._login_with_password()
-                self.set_auth_token(token)
-                self._authenticated = True
+                self._use_token(await self._login_with_password())
+                self._save_cached_token()
                 logger.info("使用用户名/密码认证成功")
                 return
             except Exception as e:
@@ -52,19 +106,19 @@ class HaloClient(BaseHTTPClient):
             "未配置任何认证方式。请设置 HALO_TOKEN 或 HALO_USERNAME/HALO_PASSWORD"
         )
 
-    async def _login_with_password(self) -> str:
+    async def _login_with_password(self) -> CachedToken:
         """
         使用用户名和密码登录。
 
         返回:
-            访问令牌
+            访问令牌及其过期时间
 
         异常:
             AuthenticationError：登录失败
         """
         try:
             response = await self.post(
-                "/apis/api.console.halo.run/v1alpha1/auth/login",
+                LOGIN_PATH,
                 json={
                     "username": settings.halo_username,
                     "password": settings.halo_password,
@@ -73,12 +127,148 @@ class HaloClient(BaseHTTPClient):
             token = response.get("access_token")
             if not token:
                 raise AuthenticationError("响应中未找到访问令牌")
-            return token
+            return CachedToken(token, token_expiry(token, response, settings.token_default_ttl))
         except Exception as e:
             logger.error(f"登录失败：{e}")
             raise
 
     async def ensure_authenticated(self) -> None:
-        """确保客户端已通过认证。"""
-        if not self._authenticated:
+        """确保客户端已通过认证；失败状态下会重新尝试。"""
+        if self.auth_state is not AuthState.READY:
             await self.authenticate()
+
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """
+        发送请求；收到 401 时使认证失效，重新登录后重放一次原请求。
+
+        仅用户名/密码认证可以重新登录，固定令牌认证收到 401 时直接抛出。
+
+        异常:
+            AuthenticationError：认证失败且无法重新登录，或重放后仍为 401
+        """
+        kwargs = dict(
+            params=params, json=json, data=data, files=files, headers=headers, stream=stream
+        )
+        authorization = self._headers.get("Authorization")
+        try:
+            return await super()._send(method, path, **kwargs)
+        except AuthenticationError:
+            if path == LOGIN_PATH:
+                raise
+            # 令牌已被其他请求换新时不再标记失效
+            if self._headers.get("Authorization") == authorization:
+                self.auth_state = AuthState.UNINITIALIZED
+            if not settings.has_password_auth or settings.has_token_auth:
+                raise
+
+        await self._reauthenticate(authorization)
+        self._auth_stats["replays"] += 1
+        logger.info(f"重新认证后重放请求：{method} {path}")
+        return await super()._send(method, path, **kwargs)
+
+    async def _reauthenticate(self, failed_authorization: Optional[str]) -> None:
+        """
+        在认证锁内重新登录。
+
+        等待锁期间其他请求已换过令牌时直接复用，不再重复登录。
+
+        参数:
+            failed_authorization: 收到 401 的请求所携带的 Authorization 头
+        """
+        async with self._auth_lock:
+            if self._headers.get("Authorization") != failed_authorization:
+                return
+            if self._token_store is not None:
+                self._token_store.discard(self._cache_key())
+            # 按新令牌的有效期重新安排后台刷新
+            if self._refresh_task is not None:
+                self._refresh_task.cancel()
+                self._refresh_task = None
+            try:
+                await self.authenticate()
+            except Exception as e:
+                self._auth_stats["failures"] += 1
+                raise AuthenticationError(f"令牌失效后重新登录失败：{e}")
+            self._auth_stats["reauths"] += 1
+            logger.info("访问令牌已失效，已重新登录")
+
+    def get_auth_stats(self) -> Dict[str, int]:
+        """获取因 401 重新登录、重放请求与重新登录失败的次数。"""
+        return dict(self._auth_stats)
+
+    async def close(self) -> None:
+        """停止后台令牌刷新与进行中的认证并关闭连接。"""
+        for task in (self._refresh_task, self._auth_task):
+            if task is not None and not task.done():
+                task.cancel()
+        self._refresh_task = None
+        self._auth_task = None
+        await super().close()
+
+    # ========== 令牌缓存与刷新 ==========
+
+    def _cache_key(self) -> str:
+        return TokenStore.key_for(settings.halo_base_url, settings.halo_username or "")
+
+    def _load_cached_token(self) -> Optional[CachedToken]:
+        """读取仍在刷新窗口之外的缓存令牌。"""
+        if self._token_store is None:
+            return None
+        cached = self._token_store.load(self._cache_key())
+        if cached is None or cached.expires_in() <= settings.token_refresh_margin:
+            return None
+        return cached
+
+    def _save_cached_token(self) -> None:
+        if self._token_store is not None and self._token is not None:
+            self._token_store.save(self._cache_key(), self._token)
+
+    def _use_token(self, cached: CachedToken) -> None:
+        """应用令牌并安排过期前的后台刷新。"""
+        self._token = cached
+        self.set_auth_token(cached.token)
+        self.auth_state = AuthState.READY
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    def _refresh_delay(self) -> float:
+        """
+        距离下次刷新的秒数。
+
+        在过期前 ``token_refresh_margin`` 秒刷新；剩余有效期较短时取其一半，避免频繁登录。
+        """
+        if self._token is None:
+            return 0.0
+        remaining = self._token.expires_in()
+        return max(remaining - settings.token_refresh_margin, remaining / 2, 1.0)
+
+    async def _refresh_loop(self) -> None:
+        """在令牌过期前重新登录，工具调用无需等待登录。"""
+        while True:
+            await asyncio.sleep(self._refresh_delay())
+            async with self._auth_lock:
+                try:
+                    self._token = await self._login_with_password()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"后台刷新访问令牌失败，稍后重试：{e}")
+                    token_refreshed = False
+                else:
+                    self.set_auth_token(self._token.token)
+                    self.auth_state = AuthState.READY
+                    self._save_cached_token()
+                    logger.info("访问令牌已在后台刷新")
+                    token_refreshed = True
+            if not token_refreshed:
+                await asyncio.sleep(TOKEN_REFRESH_RETRY_DELAY)
@@ -0,0 +1,148 @@
+"""按 API 组的自适应并发限制（AIMD）"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+
+# 延迟不超过基线的该倍数时才视为稳定，允许放大窗口
+LATENCY_TOLERANCE = 2.0
+# 每个窗口的样本数，窗口结束时用窗口内最小延迟更新基线
+BASELINE_WINDOW = 100
+
+
+class Slot:
+    """一次并发占用；调用方根据响应设置 ``overloaded``。"""
+
+    overloaded = False
+
+
+class AdaptiveLimiter:
+    """
+    加性增、乘性减（AIMD）的并发窗口。
+
+    - 请求成功且延迟不超过基线的 ``LATENCY_TOLERANCE`` 倍：窗口每轮增加 1
+      （每次成功增加 ``1 / limit``）；延迟劣化时保持不变
+    - 超时、5xx 或 429：窗口乘以 ``backoff``
+    - 基线取最近一个窗口内的最小延迟，可随服务端真实容量缓慢漂移
+
+    每次收缩后，收缩前发出的请求的拥塞信号会被忽略，避免同一轮拥塞被重复惩罚。
+    """
+
+    def __init__(
+        self,
+        group: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        backoff: float = 0.5,
+    ):
+        """
+        初始化限流器。
+
+        参数:
+            group: API 组名
+            initial_limit: 初始并发上限
+            min_limit: 并发上限下界
+            max_limit: 并发上限上界
+            backoff: 拥塞时的乘性收缩系数
+        """
+        self.group = group
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.in_flight = 0
+        self.queued = 0
+        self.increases = 0
+        self.decreases = 0
+        self._baseline = float("inf")
+        self._window_min = float("inf")
+        self._window_samples = 0
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> float:
+        """
+        等待空闲并发槽位。
+
+        返回:
+            开始时间戳，需原样传给 :meth:`release`
+        """
+        async with self._cond:
+            if self.in_flight >= int(self.limit):
+                self.queued += 1
+                try:
+                    await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+                finally:
+                    self.queued -= 1
+            self.in_flight += 1
+        return time.monotonic()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Slot]:
+        """占用一个并发槽位；块内抛出超时异常时视为拥塞。"""
+        started_at = await self.acquire()
+        slot = Slot()
+        try:
+            yield slot
+        except httpx.TimeoutException:
+            slot.overloaded = True
+            raise
+        finally:
+            await self.release(started_at, slot.overloaded)
+
+    async def release(self, started_at: float, overloaded: bool) -> None:
+        """
+        归还槽位并根据本次请求结果调整窗口。
+
+        参数:
+            started_at: :meth:`acquire` 返回的时间戳
+            overloaded: 本次请求是否出现超时、5xx 或 429
+        """
+        latency = time.monotonic() - started_at
+        async with self._cond:
+            self.in_flight -= 1
+            self._adjust(started_at, latency, overloaded)
+            self._cond.notify_all()
+
+    def _adjust(self, started_at: float, latency: float, overloaded: bool) -> None:
+        if overloaded:
+            if started_at >= self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = time.monotonic()
+                self.decreases += 1
+            return
+
+        self._record_latency(latency)
+        stable = latency <= self._baseline * LATENCY_TOLERANCE
+        if stable and self.limit < self.max_limit:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self.increases += 1
+
+    def _record_latency(self, latency: float) -> None:
+        self._window_min = min(self._window_min, latency)
+        self._window_samples += 1
+        if self._baseline == float("inf"):
+            self._baseline = latency
+        if self._window_samples >= BASELINE_WINDOW:
+            self._baseline = self._window_min
+            self._window_min = float("inf")
+            self._window_samples = 0
+        else:
+            self._baseline = min(self._baseline, latency)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出当前并发上限与排队深度。"""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "baseline_latency_ms": (
+                round(self._baseline * 1000, 2) if self._baseline != float("inf") else None
+            ),
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }
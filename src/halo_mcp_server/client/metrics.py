@@ -0,0 +1,188 @@
+"""按接口路由模板统计的请求指标"""
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+# 延迟分桶上界（毫秒）
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+# 请求/响应体大小分桶上界（字节）
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+# 位于资源名位置、但实际是集合级动作的路径段
+COLLECTION_ACTIONS = frozenset({"-", "upload", "login"})
+
+
+def route_template(path: str) -> str:
+    """
+    将请求路径归一化为路由模板。
+
+    ``/apis/<group>/<version>/<plural>/<name>[/<subresource>]`` 中的资源名替换为
+    ``{name}``，例如 ``/apis/uc.api.content.halo.run/v1alpha1/posts/abc/draft``
+    归一化为 ``/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft``。
+    查询参数与绝对地址的协议、主机部分会被去除。
+
+    参数:
+        path: 请求路径或完整 URL
+
+    返回:
+        路由模板
+    """
+    path = path.split("?", 1)[0]
+    if "://" in path:
+        path = "/" + path.split("://", 1)[1].partition("/")[2]
+
+    segments = path.strip("/").split("/")
+    if len(segments) > 4 and segments[0] == "apis" and segments[4] not in COLLECTION_ACTIONS:
+        segments[4] = "{name}"
+    return "/" + "/".join(segments)
+
+
+class Histogram:
+    """固定分桶直方图，分位数在命中的桶内线性插值。"""
+
+    def __init__(self, bounds: Sequence[float]):
+        """
+        初始化直方图。
+
+        参数:
+            bounds: 递增的桶上界，最后一个桶之外的值落入溢出桶
+        """
+        self.bounds = tuple(bounds)
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """记录一个样本。"""
+        index = len(self.bounds)
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        估算分位数。
+
+        参数:
+            q: 分位点（0~1）
+
+        返回:
+            估算值；没有样本时返回 None
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = self.bounds[i - 1] if i > 0 else 0.0
+            upper = self.bounds[i] if i < len(self.bounds) else self.max
+            upper = min(upper, self.max)
+            return lower + (upper - lower) * (rank - seen) / bucket_count
+        return self.max
+
+    def snapshot(self, digits: int = 2) -> Dict[str, Any]:
+        """导出样本数、均值、最大值与 p50/p90/p99。"""
+
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean": rounded(self.total / self.count) if self.count else None,
+            "max": rounded(self.max) if self.count else None,
+            "p50": rounded(self.quantile(0.5)),
+            "p90": rounded(self.quantile(0.9)),
+            "p99": rounded(self.quantile(0.99)),
+        }
+
+
+class EndpointMetrics:
+    """单个 ``方法 + 路由模板`` 的请求指标。"""
+
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.status_counts: Dict[str, int] = {}
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.request_bytes = Histogram(SIZE_BUCKETS_BYTES)
+        self.response_bytes = Histogram(SIZE_BUCKETS_BYTES)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "status_counts": dict(self.status_counts),
+            "latency_ms": self.latency_ms.snapshot(),
+            "request_bytes": {
+                **self.request_bytes.snapshot(0),
+                "total": int(self.request_bytes.total),
+            },
+            "response_bytes": {
+                **self.response_bytes.snapshot(0),
+                "total": int(self.response_bytes.total),
+            },
+        }
+
+
+class RequestMetrics:
+    """
+    按接口聚合的请求指标。
+
+    每个逻辑请求（含其全部重试）记录一次：总耗时、请求体与响应体大小、最终状态码
+    （网络错误记为 ``error``）以及重试次数。内存占用只与接口数量有关。
+    """
+
+    def __init__(self):
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        status: Union[int, str],
+        latency: float,
+        request_bytes: int,
+        response_bytes: int,
+        retries: int = 0,
+    ) -> None:
+        """
+        记录一次请求。
+
+        参数:
+            method: HTTP 方法
+            path: 请求路径
+            status: 最终状态码，未收到响应时为 ``"error"``
+            latency: 总耗时（秒，含重试等待）
+            request_bytes: 请求体字节数
+            response_bytes: 响应体字节数
+            retries: 重试次数
+        """
+        key = f"{method.upper()} {route_template(path)}"
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = EndpointMetrics()
+
+        endpoint.requests += 1
+        endpoint.retries += retries
+        status_key = str(status)
+        endpoint.status_counts[status_key] = endpoint.status_counts.get(status_key, 0) + 1
+        endpoint.latency_ms.observe(latency * 1000)
+        endpoint.request_bytes.observe(request_bytes)
+        endpoint.response_bytes.observe(response_bytes)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """导出全部接口的指标，按请求数降序排列。"""
+        ordered = sorted(self._endpoints.items(), key=lambda item: -item[1].requests)
+        return {key: endpoint.snapshot() for key, endpoint in ordered}
+
+    def reset(self) -> None:
+        """清空全部指标。"""
+        self._endpoints.clear()
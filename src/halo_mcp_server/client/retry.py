@@ -0,0 +1,101 @@
+"""HTTP 请求重试策略：带上限的指数退避 + 全抖动，支持 Retry-After"""
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, FrozenSet, Optional
+
+import httpx
+
+from halo_mcp_server.config import settings
+
+# 可安全重试的状态码：限流与网关类错误
+RETRYABLE_STATUSES: FrozenSet[int] = frozenset({429, 502, 503, 504})
+
+# 请求确定未发出时抛出的异常，任何方法重试都是安全的
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    单个 HTTP 方法的重试策略。
+
+    第 n 次重试的等待时间在 ``[0, min(max_delay, base_delay * 2 ** (n - 1))]`` 内均匀随机
+    （full jitter），避免一批失败请求同步重试。
+    """
+
+    max_retries: int
+    base_delay: float
+    max_delay: float
+    idempotent: bool
+    retry_statuses: FrozenSet[int] = field(default=RETRYABLE_STATUSES)
+
+    def backoff(self, attempt: int) -> float:
+        """计算第 ``attempt`` 次重试（从 1 开始）的等待时间。"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def should_retry_error(self, error: Exception) -> bool:
+        """
+        判断网络异常是否可重试。
+
+        幂等方法对所有超时/网络异常重试；非幂等方法仅在请求确定未发出时重试，
+        防止读超时后重复创建资源。
+        """
+        if self.idempotent:
+            return isinstance(error, (httpx.TimeoutException, httpx.NetworkError))
+        return isinstance(error, NOT_SENT_ERRORS)
+
+    def retry_delay_for_status(self, response: httpx.Response, attempt: int) -> Optional[float]:
+        """
+        计算对错误状态码重试前的等待时间。
+
+        返回:
+            等待秒数；不应重试时返回 ``None``（非幂等方法、状态码不可重试，
+            或 ``Retry-After`` 超过 ``max_delay``）
+        """
+        if not self.idempotent or response.status_code not in self.retry_statuses:
+            return None
+        delay = self.backoff(attempt)
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 ``Retry-After`` 头（秒数或 HTTP 日期），无法解析时返回 ``None``。"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def build_retry_policies() -> Dict[str, RetryPolicy]:
+    """根据配置为各 HTTP 方法构建重试策略。"""
+    idempotent_methods = {
+        m.strip().upper() for m in settings.retry_idempotent_methods.split(",") if m.strip()
+    }
+    return {
+        method: RetryPolicy(
+            max_retries=settings.max_retries,
+            base_delay=settings.retry_delay,
+            max_delay=settings.retry_max_delay,
+            idempotent=method in idempotent_methods,
+        )
+        for method in ("GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE")
+    }
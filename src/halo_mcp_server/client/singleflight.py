@@ -0,0 +1,75 @@
+"""相同请求的 single-flight 合并"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+
+@dataclass
+class _Flight:
+    """一个正在进行中的请求及其等待者数量。"""
+
+    task: "asyncio.Future[Any]"
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    将同一时刻键相同的并发调用合并为一次执行。
+
+    第一个调用者（leader）创建后台任务，其余调用者（follower）等待同一任务的结果。
+    单个等待者被取消不会影响其他等待者；所有等待者都离开后，任务才会被取消。
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        执行或加入键为 ``key`` 的调用。
+
+        参数:
+            key: 合并键
+            factory: 无进行中任务时用于发起调用的协程工厂
+
+        返回:
+            调用结果（leader 与 follower 共享同一结果对象）
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _task: self._forget(key, flight))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def stats(self) -> Dict[str, int]:
+        """返回合并统计。"""
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
+
+    def forget_all(self) -> None:
+        """
+        让之后的调用不再加入当前进行中的任务（如写操作之后，旧请求的结果可能已过期）。
+
+        已在等待的调用方仍会得到各自任务的结果。
+        """
+        self._flights.clear()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
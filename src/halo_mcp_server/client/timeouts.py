@@ -0,0 +1,191 @@
+"""按操作类别划分的超时配置（connect/read/write/pool）与单次工具调用的截止时间"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, Optional, Union
+
+import httpx
+
+from halo_mcp_server.config import TIMEOUT_PHASES, parse_timeout_spec, settings
+
+# 操作类别：元数据读取、内容写入、附件上传、发布/取消发布
+OPERATION_CLASSES = ("metadata_read", "content_write", "upload", "publish")
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# 单次工具调用的超时覆盖，由 MCP 工具参数 ``timeout`` 设置
+_timeout_override: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "halo_mcp_timeout_override", default=None
+)
+
+# 单次工具调用的截止时间（``time.monotonic()``），由 MCP 工具参数 ``deadline_ms`` 设置
+_deadline: ContextVar[Optional[float]] = ContextVar("halo_mcp_deadline", default=None)
+
+# 截止时间到达后强制取消工具调用前的宽限时间（秒），
+# 让受截止时间约束的请求先以 DeadlineExceededError 结束，处理器得以返回部分结果
+DEADLINE_GRACE = 0.25
+
+
+@dataclass(frozen=True)
+class TimeoutProfile:
+    """一类操作的超时配置（秒）。"""
+
+    connect: float
+    read: float
+    write: float
+    pool: float
+
+    def with_overrides(self, overrides: Optional[Dict[str, float]]) -> "TimeoutProfile":
+        """返回应用了覆盖值的新配置。"""
+        if not overrides:
+            return self
+        return replace(self, **overrides)
+
+    def capped(self, seconds: Optional[float]) -> "TimeoutProfile":
+        """返回各阶段均不超过 ``seconds`` 的新配置；None 表示不限制。"""
+        if seconds is None:
+            return self
+        return TimeoutProfile(
+            **{phase: min(getattr(self, phase), seconds) for phase in TIMEOUT_PHASES}
+        )
+
+    def to_httpx(self) -> httpx.Timeout:
+        return httpx.Timeout(connect=self.connect, read=self.read, write=self.write, pool=self.pool)
+
+
+def operation_class_for(method: str, path: str) -> str:
+    """
+    判断请求所属的操作类别。
+
+    参数:
+        method: HTTP 方法
+        path: 请求路径
+
+    返回:
+        ``OPERATION_CLASSES`` 之一
+    """
+    if "/attachments/upload" in path or path.endswith("/upload-from-url"):
+        return "upload"
+    if method.upper() in READ_METHODS:
+        return "metadata_read"
+    if path.endswith("/publish") or path.endswith("/unpublish"):
+        return "publish"
+    return "content_write"
+
+
+def build_timeout_profiles() -> Dict[str, TimeoutProfile]:
+    """根据配置构建各操作类别的超时，配置中省略的阶段使用 ``MCP_TIMEOUT``。"""
+    profiles = {}
+    for operation in OPERATION_CLASSES:
+        spec = parse_timeout_spec(getattr(settings, f"timeout_{operation}"))
+        profiles[operation] = TimeoutProfile(
+            **{phase: spec.get(phase, float(settings.mcp_timeout)) for phase in TIMEOUT_PHASES}
+        )
+    return profiles
+
+
+def normalize_timeout_override(
+    value: Union[None, int, float, Dict[str, Any]],
+) -> Optional[Dict[str, float]]:
+    """
+    规范化工具参数中的超时覆盖。
+
+    数字表示读写超时（秒），连接与连接池等待保持配置值；
+    对象可分别指定 ``connect``/``read``/``write``/``pool``。
+
+    异常:
+        ValueError：格式或取值不合法
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("timeout 必须是数字或对象")
+    if isinstance(value, (int, float)):
+        overrides = {"read": float(value), "write": float(value)}
+    elif isinstance(value, dict):
+        unknown = set(value) - set(TIMEOUT_PHASES)
+        if unknown:
+            raise ValueError(f"timeout 不支持的字段：{', '.join(sorted(unknown))}")
+        overrides = {phase: float(seconds) for phase, seconds in value.items()}
+    else:
+        raise ValueError("timeout 必须是数字或对象")
+
+    if any(seconds <= 0 for seconds in overrides.values()):
+        raise ValueError("timeout 必须大于 0")
+    return overrides
+
+
+def current_timeout_override() -> Optional[Dict[str, float]]:
+    """获取当前工具调用的超时覆盖。"""
+    return _timeout_override.get()
+
+
+@contextmanager
+def override_timeouts(overrides: Optional[Dict[str, float]]) -> Iterator[None]:
+    """在当前上下文中（一次工具调用内）覆盖请求超时。"""
+    token = _timeout_override.set(overrides)
+    try:
+        yield
+    finally:
+        _timeout_override.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """当前工具调用距离截止时间的剩余秒数（可能为负）；未设置截止时间时返回 None。"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def deadline_exceeded() -> bool:
+    """当前工具调用是否已超出截止时间。"""
+    remaining = remaining_budget()
+    return remaining is not None and remaining <= 0
+
+
+def fits_deadline(delay: float) -> bool:
+    """等待 ``delay`` 秒后是否仍在截止时间之内（用于判断重试是否来得及）。"""
+    remaining = remaining_budget()
+    return remaining is None or delay < remaining
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[None]:
+    """在当前上下文中（一次工具调用内）设置从现在起 ``seconds`` 秒的截止时间。"""
+    token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+# MCP 工具通用参数 ``timeout`` 的 JSON Schema
+TIMEOUT_ARGUMENT_SCHEMA: Dict[str, Any] = {
+    "description": (
+        "可选：覆盖本次调用的 HTTP 超时（秒）。"
+        "数字表示读写超时；也可传对象分别指定 connect/read/write/pool。"
+    ),
+    "oneOf": [
+        {"type": "number", "exclusiveMinimum": 0},
+        {
+            "type": "object",
+            "properties": {
+                phase: {"type": "number", "exclusiveMinimum": 0} for phase in TIMEOUT_PHASES
+            },
+            "additionalProperties": False,
+        },
+    ],
+}
+
+# MCP 工具通用参数 ``deadline_ms`` 的 JSON Schema
+DEADLINE_ARGUMENT_SCHEMA: Dict[str, Any] = {
+    "type": "integer",
+    "minimum": 1,
+    "description": (
+        "可选：本次调用的截止时间（毫秒，从收到调用起计）。"
+        "各 HTTP 请求的超时不超过剩余时间，来不及完成的重试会被跳过，到期后中止调用。"
+    ),
+}
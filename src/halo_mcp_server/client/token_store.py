@@ -0,0 +1,163 @@
+"""访问令牌的本地缓存"""
+
+import base64
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from loguru import logger
+
+from halo_mcp_server.utils import codec
+
+DEFAULT_TOKEN_CACHE_PATH = Path.home() / ".halo-mcp-server" / "token_cache.json"
+
+# 缓存目录与文件仅当前用户可读写
+DIR_MODE = 0o700
+FILE_MODE = 0o600
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    """缓存的访问令牌。"""
+
+    token: str
+    expires_at: float
+
+    def expires_in(self, now: Optional[float] = None) -> float:
+        """距离过期的秒数。"""
+        return self.expires_at - (time.time() if now is None else now)
+
+
+def token_expiry(token: str, response: Dict[str, Any], default_ttl: float) -> float:
+    """
+    推断令牌的过期时间（Unix 时间戳）。
+
+    依次使用登录响应中的 ``expires_in``、JWT 令牌的 ``exp`` 声明，
+    都没有时按 ``default_ttl`` 计算。
+
+    参数:
+        token: 访问令牌
+        response: 登录接口的响应
+        default_ttl: 默认有效期（秒）
+
+    返回:
+        过期时间
+    """
+    now = time.time()
+    expires_in = response.get("expires_in") or response.get("expiresIn")
+    if isinstance(expires_in, (int, float)) and expires_in > 0:
+        return now + expires_in
+
+    exp = _jwt_claims(token).get("exp")
+    if isinstance(exp, (int, float)) and exp > now:
+        return float(exp)
+    return now + default_ttl
+
+
+def _jwt_claims(token: str) -> Dict[str, Any]:
+    """读取 JWT 载荷（不校验签名，仅用于获取过期时间）。"""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return {}
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = codec.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, codec.JSONDecodeError):
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def _parse_entry(entry: Any) -> Optional[CachedToken]:
+    """解析缓存记录，格式错误或已过期时返回 None。"""
+    if not isinstance(entry, dict):
+        return None
+    try:
+        cached = CachedToken(str(entry["token"]), float(entry["expires_at"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+    return cached if cached.expires_in() > 0 else None
+
+
+class TokenStore:
+    """
+    按 Halo 地址与用户名保存访问令牌的 JSON 文件。
+
+    文件以 0600 权限原子写入，所在目录为 0700，令牌不会被其他用户读取。
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        """
+        初始化令牌缓存。
+
+        参数:
+            path: 缓存文件路径，默认 ``~/.halo-mcp-server/token_cache.json``
+        """
+        self.path = Path(path).expanduser() if path else DEFAULT_TOKEN_CACHE_PATH
+
+    @staticmethod
+    def key_for(base_url: str, username: str) -> str:
+        """生成缓存键。"""
+        return f"{base_url.rstrip('/')}|{username}"
+
+    def load(self, key: str) -> Optional[CachedToken]:
+        """
+        读取缓存的令牌。
+
+        参数:
+            key: 缓存键
+
+        返回:
+            未过期的令牌；不存在、已过期或文件损坏时返回 None
+        """
+        return _parse_entry(self._read().get(key))
+
+    def save(self, key: str, cached: CachedToken) -> None:
+        """
+        保存令牌；写入失败只记录警告。
+
+        参数:
+            key: 缓存键
+            cached: 令牌与过期时间
+        """
+        # 顺便清理已过期的记录
+        entries = {k: v for k, v in self._read().items() if _parse_entry(v) is not None}
+        entries[key] = {"token": cached.token, "expires_at": cached.expires_at}
+        try:
+            self._write(entries)
+        except OSError as e:
+            logger.warning(f"写入令牌缓存失败：{e}")
+
+    def discard(self, key: str) -> None:
+        """删除缓存的令牌。"""
+        entries = self._read()
+        if entries.pop(key, None) is None:
+            return
+        try:
+            self._write(entries)
+        except OSError as e:
+            logger.warning(f"写入令牌缓存失败：{e}")
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            data = codec.loads(self.path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, codec.JSONDecodeError) as e:
+            logger.warning(f"读取令牌缓存失败，将忽略：{e}")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, entries: Dict[str, Any]) -> None:
+        self.path.parent.mkdir(mode=DIR_MODE, parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, FILE_MODE)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(codec.dumps_bytes(entries))
+            os.chmod(tmp_path, FILE_MODE)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
@@ -1,10 +1,36 @@
 """Configuration management for Halo MCP Server."""
 
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+TIMEOUT_PHASES = ("connect", "read", "write", "pool")
+
+
+def parse_timeout_spec(spec: str) -> Dict[str, float]:
+    """
+    Parse a timeout profile such as ``"connect=5,read=15,write=15,pool=10"``.
+
+    Phases that are left out are not included in the result.
+
+    Raises:
+        ValueError: Unknown phase or non-positive value
+    """
+    result: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        phase, _, value = part.partition("=")
+        phase = phase.strip().lower()
+        if phase not in TIMEOUT_PHASES:
+            raise ValueError(f"Unknown timeout phase '{phase}'. Must be one of {TIMEOUT_PHASES}")
+        seconds = float(value)
+        if seconds <= 0:
+            raise ValueError(f"Timeout for '{phase}' must be positive")
+        result[phase] = seconds
+    return result
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -98,6 +124,28 @@ class Settings(BaseSettings):
         description="HTTP connection pool size",
     )
 
+    enable_http2: bool = Field(
+        default=False,
+        description="Multiplex requests over HTTP/2 (requires the 'http2' extra)",
+    )
+
+    http2_prior_knowledge: bool = Field(
+        default=False,
+        description="Use cleartext HTTP/2 (h2c) without negotiation for http:// base URLs",
+    )
+
+    enable_warmup: bool = Field(
+        default=True,
+        description="Connect, authenticate and prefetch metadata in the background at startup",
+    )
+
+    warmup_connections: int = Field(
+        default=4,
+        ge=0,
+        le=50,
+        description="Keep-alive connections to open during startup warm-up",
+    )
+
     max_retries: int = Field(
         default=3,
         ge=0,
@@ -109,7 +157,19 @@ class Settings(BaseSettings):
         default=1.0,
         ge=0.1,
         le=10.0,
-        description="Delay between retries in seconds",
+        description="Base delay for exponential retry backoff in seconds",
+    )
+
+    retry_max_delay: float = Field(
+        default=30.0,
+        ge=0.1,
+        le=300.0,
+        description="Upper bound of a single retry backoff (and of honored Retry-After) in seconds",
+    )
+
+    retry_idempotent_methods: str = Field(
+        default="GET,HEAD,OPTIONS,PUT,DELETE",
+        description="Comma-separated HTTP methods that may be retried on 429/502/503/504 and read timeouts",
     )
 
     enable_cache: bool = Field(
@@ -124,6 +184,174 @@ class Settings(BaseSettings):
         description="Cache TTL in seconds",
     )
 
+    cache_max_entries: int = Field(
+        default=256,
+        ge=1,
+        le=10000,
+        description="Maximum number of cached GET responses",
+    )
+
+    cache_max_size_mb: int = Field(
+        default=16,
+        ge=1,
+        le=512,
+        description="Maximum total size of cached GET responses in MB",
+    )
+
+    enable_request_coalescing: bool = Field(
+        default=True,
+        description="Share one in-flight request among concurrent identical GETs",
+    )
+
+    enable_request_compression: bool = Field(
+        default=False,
+        description="Gzip JSON request bodies above the size threshold (the server must accept it)",
+    )
+
+    request_compression_min_kb: int = Field(
+        default=64,
+        ge=1,
+        le=10240,
+        description="Minimum JSON request body size in KB before it is gzip-compressed",
+    )
+
+    enable_adaptive_concurrency: bool = Field(
+        default=True,
+        description="Adapt per-API-group request concurrency to Halo latency (AIMD)",
+    )
+
+    adaptive_concurrency_min: int = Field(
+        default=1,
+        ge=1,
+        le=100,
+        description="Lower bound of the adaptive per-API-group concurrency limit",
+    )
+
+    adaptive_concurrency_max: int = Field(
+        default=64,
+        ge=1,
+        le=1000,
+        description="Upper bound of the adaptive per-API-group concurrency limit",
+    )
+
+    enable_circuit_breaker: bool = Field(
+        default=True,
+        description="Fail fast per API group after repeated server/network failures",
+    )
+
+    circuit_breaker_threshold: int = Field(
+        default=5,
+        ge=1,
+        le=100,
+        description="Consecutive failures that open an API group's circuit breaker",
+    )
+
+    circuit_breaker_recovery_timeout: float = Field(
+        default=30.0,
+        ge=1.0,
+        le=600.0,
+        description="Seconds an open circuit waits before a background half-open probe",
+    )
+
+    enable_metrics: bool = Field(
+        default=True,
+        description="Record per-endpoint latency, size, status and retry metrics",
+    )
+
+    http_cassette_mode: str = Field(
+        default="off",
+        description="Record HTTP traffic to a cassette or replay it offline: off, record, replay",
+    )
+
+    http_cassette_path: str = Field(
+        default="halo_cassette.json",
+        description="Cassette file used by the record and replay modes",
+    )
+
+    http_cassette_latency_ms: float = Field(
+        default=-1.0,
+        ge=-1.0,
+        le=60000.0,
+        description="Latency added to each replayed request in ms (-1 uses the recorded latency)",
+    )
+
+    timeout_metadata_read: str = Field(
+        default="connect=5,read=15,write=15,pool=10",
+        description="Timeouts in seconds for GET/HEAD requests; omitted phases use MCP_TIMEOUT",
+    )
+
+    timeout_content_write: str = Field(
+        default="connect=5,read=60,write=60,pool=10",
+        description="Timeouts in seconds for creating, updating and deleting resources",
+    )
+
+    timeout_upload: str = Field(
+        default="connect=5,read=120,write=300,pool=30",
+        description="Timeouts in seconds for attachment uploads",
+    )
+
+    timeout_publish: str = Field(
+        default="connect=5,read=60,write=30,pool=10",
+        description="Timeouts in seconds for publishing and unpublishing posts",
+    )
+
+    tool_concurrency_read: int = Field(
+        default=8,
+        ge=1,
+        le=100,
+        description="Maximum concurrent read tool calls (get/list); further calls queue",
+    )
+
+    tool_concurrency_write: int = Field(
+        default=4,
+        ge=1,
+        le=100,
+        description="Maximum concurrent create/update/delete tool calls",
+    )
+
+    tool_concurrency_upload: int = Field(
+        default=2,
+        ge=1,
+        le=100,
+        description="Maximum concurrent attachment upload tool calls",
+    )
+
+    tool_concurrency_publish: int = Field(
+        default=2,
+        ge=1,
+        le=100,
+        description="Maximum concurrent publish/unpublish tool calls",
+    )
+
+    tool_output_format: str = Field(
+        default="compact",
+        description="JSON layout of tool results: compact or pretty (2-space indent)",
+    )
+
+    enable_token_cache: bool = Field(
+        default=True,
+        description="Reuse the password-login access token across process starts",
+    )
+
+    token_cache_path: Optional[str] = Field(
+        default=None,
+        description="Token cache file (default: ~/.halo-mcp-server/token_cache.json)",
+    )
+
+    token_default_ttl: int = Field(
+        default=3600,
+        ge=60,
+        le=30 * 24 * 3600,
+        description="Token lifetime in seconds when the login response carries no expiry",
+    )
+
+    token_refresh_margin: int = Field(
+        default=300,
+        ge=10,
+        le=24 * 3600,
+        description="Seconds before expiry at which the token is refreshed in the background",
+    )
+
     @field_validator("halo_base_url")
     @classmethod
     def validate_base_url(cls, v: str) -> str:
@@ -133,6 +361,33 @@ class Settings(BaseSettings):
             return v.rstrip("/")
         return v
 
+    @field_validator("http_cassette_mode")
+    @classmethod
+    def validate_cassette_mode(cls, v: str) -> str:
+        """Validate HTTP cassette mode."""
+        v_lower = v.lower()
+        if v_lower not in {"off", "record", "replay"}:
+            raise ValueError("Invalid cassette mode. Must be one of off, record, replay")
+        return v_lower
+
+    @field_validator("tool_output_format")
+    @classmethod
+    def validate_output_format(cls, v: str) -> str:
+        """Validate tool output format."""
+        v_lower = v.lower()
+        if v_lower not in {"compact", "pretty"}:
+            raise ValueError("Invalid output format. Must be one of compact, pretty")
+        return v_lower
+
+    @field_validator(
+        "timeout_metadata_read", "timeout_content_write", "timeout_upload", "timeout_publish"
+    )
+    @classmethod
+    def validate_timeout_profile(cls, v: str) -> str:
+        """Validate a timeout profile."""
+        parse_timeout_spec(v)
+        return v
+
     @field_validator("mcp_log_level")
     @classmethod
     def validate_log_level(cls, v: str) -> str:
@@ -67,6 +67,12 @@ class NetworkError(HaloMCPError):
         self.status_code = status_code
 
 
+class DeadlineExceededError(HaloMCPError):
+    """超出工具调用的截止时间"""
+
+    pass
+
+
 class ConfigurationError(HaloMCPError):
     """配置错误"""
 
@@ -1,5 +1,8 @@
 """MCP 服务器实现。"""
 
+import asyncio
+import inspect
+import time
 from typing import Any, Dict, Optional
 
 from loguru import logger
@@ -8,25 +11,19 @@ from mcp.server.stdio import stdio_server
 from mcp.types import Prompt, Tool
 
 from halo_mcp_server.client import HaloClient
+from halo_mcp_server.client.timeouts import (
+    DEADLINE_GRACE,
+    deadline_scope,
+    normalize_timeout_override,
+    override_timeouts,
+)
 from halo_mcp_server.config import settings
 from halo_mcp_server.prompts import BLOG_PROMPTS
-from halo_mcp_server.tools.attachment_tools import ATTACHMENT_TOOLS
-from halo_mcp_server.tools.category_tools import CATEGORY_TOOLS
-from halo_mcp_server.tools.post_tools import (
-    create_post_tool,
-    delete_post_tool,
-    get_post_draft_tool,
-    get_post_tool,
-    list_my_posts_tool,
-    publish_post_tool,
-    unpublish_post_tool,
-    update_post_draft_tool,
-    update_post_tool,
-    POST_TOOLS,
-)
-from halo_mcp_server.tools.tag_tools import TAG_TOOLS
-from halo_mcp_server.tools.site_tools import SITE_TOOLS
 from halo_mcp_server.models.common import ToolResult
+from halo_mcp_server.tools.concurrency import TOOL_CONCURRENCY
+from halo_mcp_server.tools.output import format_tool_output, resolve_output_format
+from halo_mcp_server.tools.projection import parse_fields, projection_scope
+from halo_mcp_server.tools.registry import TOOL_REGISTRY
 
 
 # Create MCP server instance
@@ -36,15 +33,75 @@ app = Server(settings.mcp_server_name)
 halo_client: Optional[HaloClient] = None
 
 
+# 客户端初始化任务：并发的工具调用与启动预热共享同一次创建与认证
+_client_task: Optional["asyncio.Task[HaloClient]"] = None
+
+
 async def get_halo_client() -> HaloClient:
-    """获取或创建 Halo 客户端实例。"""
+    """
+    获取或创建 Halo 客户端实例。
+
+    并发调用方等待同一次初始化，不会创建多个连接池或重复登录；
+    初始化失败后由下一次调用重新尝试。
+    """
+    if halo_client is not None:
+        return halo_client
+    return await asyncio.shield(_start_client_init())
+
+
+def _start_client_init(warmup_connections: int = 0) -> "asyncio.Task[HaloClient]":
+    """返回进行中的初始化任务；尚未开始或上次失败时启动新的初始化。"""
+    global _client_task
+    task = _client_task
+    if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+        task = asyncio.create_task(_connect_halo_client(warmup_connections))
+        _client_task = task
+    return task
+
+
+async def _connect_halo_client(warmup_connections: int = 0) -> HaloClient:
+    """创建客户端，并行完成登录与 keep-alive 连接预建。"""
     global halo_client
-    if halo_client is None:
-        halo_client = HaloClient()
-        await halo_client.connect()
-        await halo_client.authenticate()
-        logger.info("Halo 客户端已初始化")
-    return halo_client
+    client = HaloClient()
+    await client.connect()
+    try:
+        _, opened = await asyncio.gather(client.authenticate(), client.warm_up(warmup_connections))
+    except BaseException:
+        await client.close()
+        raise
+
+    halo_client = client
+    if opened:
+        logger.info(f"Halo 客户端已预热：{opened} 个连接")
+    logger.info("Halo 客户端已初始化")
+    return client
+
+
+async def warm_up_halo_client() -> None:
+    """
+    启动时在后台预热 Halo 客户端。
+
+    建立连接池与登录并行进行，完成后预取分类与标签列表的首页（与工具默认参数一致，
+    可直接命中响应缓存）。预热失败只记录警告，首次工具调用会重新初始化。
+    """
+    started = time.perf_counter()
+    try:
+        client = await asyncio.shield(_start_client_init(settings.warmup_connections))
+    except Exception as e:
+        logger.warning(f"Halo 客户端预热失败，将在首次调用工具时重试：{e}")
+        return
+
+    if settings.enable_cache:
+        from .tools.category_tools import list_categories
+        from .tools.tag_tools import list_tags
+
+        results = await asyncio.gather(
+            list_categories(client=client), list_tags(client=client), return_exceptions=True
+        )
+        for error in (r for r in results if isinstance(r, Exception)):
+            logger.debug(f"预取元数据失败：{error}")
+
+    logger.info(f"Halo 客户端预热完成，耗时 {(time.perf_counter() - started) * 1000:.0f} ms")
 
 
 @app.list_prompts()
@@ -549,408 +606,105 @@ def _generate_series_planner_prompt(args: Dict[str, str]) -> str:
 async def list_tools() -> list[Tool]:
     """列出可用的 MCP 工具。"""
     logger.debug("正在列出工具...")
+    tools = [spec.tool for spec in TOOL_REGISTRY.values()]
+    logger.info(f"Registered {len(tools)} tools")
+    return tools
 
-    # Post management tools
-    post_tools = [
-        Tool(
-            name="list_my_posts",
-            description="列出当前用户的所有文章，支持按发布状态、关键词和分类筛选",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "page": {
-                        "type": "number",
-                        "description": "页码（默认：0）",
-                        "default": 0,
-                    },
-                    "size": {
-                        "type": "number",
-                        "description": "每页数量（默认：20）",
-                        "default": 20,
-                    },
-                    "publish_phase": {
-                        "type": "string",
-                        "description": "按发布状态筛选：DRAFT（草稿）、PENDING_APPROVAL（待审核）、PUBLISHED（已发布）、FAILED（失败）",
-                        "enum": ["DRAFT", "PENDING_APPROVAL", "PUBLISHED", "FAILED"],
-                    },
-                    "keyword": {
-                        "type": "string",
-                        "description": "搜索关键词",
-                    },
-                    "category": {
-                        "type": "string",
-                        "description": "按分类名称筛选（包含子分类）",
-                    },
-                },
-            },
-        ),
-        Tool(
-            name="get_post",
-            description="获取指定文章的详细信息，包括内容、元数据和设置",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="create_post",
-            description="创建一篇新的博客文章（内容推荐使用 HTML 富文本，兼容 ProseMirror + CodeMirror，也支持 Markdown），包括标题、内容、分类、标签等设置",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "文章标题（必填）",
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "文章内容，推荐使用 HTML 富文本（兼容 ProseMirror + CodeMirror），也支持 Markdown（必填）",
-                    },
-                    "excerpt": {
-                        "type": "string",
-                        "description": "文章摘要/简介",
-                    },
-                    "slug": {
-                        "type": "string",
-                        "description": "URL 别名（不提供则自动生成）",
-                    },
-                    "categories": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "分类名称列表",
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "标签名称列表",
-                    },
-                    "content_format": {
-                        "type": "string",
-                        "description": "内容格式：MARKDOWN、HTML 或 AUTO（默认：HTML）",
-                        "enum": ["MARKDOWN", "HTML", "AUTO"],
-                        "default": "HTML",
-                    },
-                    "cover": {
-                        "type": "string",
-                        "description": "封面图片 URL",
-                    },
-                    "allow_comment": {
-                        "type": "boolean",
-                        "description": "是否允许评论（默认：true）",
-                        "default": True,
-                    },
-                    "pinned": {
-                        "type": "boolean",
-                        "description": "是否置顶（默认：false）",
-                        "default": False,
-                    },
-                    "visible": {
-                        "type": "string",
-                        "description": "可见性：PUBLIC（公开）或 PRIVATE（私密），默认：PUBLIC",
-                        "enum": ["PUBLIC", "PRIVATE"],
-                        "default": "PUBLIC",
-                    },
-                    "publish_immediately": {
-                        "type": "boolean",
-                        "description": "创建后立即发布（默认：false）",
-                        "default": False,
-                    },
-                },
-                "required": ["title", "content"],
-            },
-        ),
-        Tool(
-            name="update_post",
-            description="更新现有文章（内容推荐使用 HTML 富文本，兼容 ProseMirror + CodeMirror，也支持 Markdown），包括标题、内容、分类、标签或其他设置",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                    "title": {
-                        "type": "string",
-                        "description": "新标题",
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "新内容，推荐使用 HTML 富文本（兼容 ProseMirror + CodeMirror），也支持 Markdown",
-                    },
-                    "excerpt": {
-                        "type": "string",
-                        "description": "新摘要",
-                    },
-                    "categories": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "新分类名称列表",
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "新标签列表（使用标签的内部标识符 metadata.name）",
-                    },
-                    "content_format": {
-                        "type": "string",
-                        "description": "内容格式：MARKDOWN、HTML 或 AUTO（默认：HTML）",
-                        "enum": ["MARKDOWN", "HTML", "AUTO"],
-                        "default": "HTML",
-                    },
-                    "cover": {
-                        "type": "string",
-                        "description": "新封面图片 URL",
-                    },
-                    "allow_comment": {
-                        "type": "boolean",
-                        "description": "是否允许评论",
-                    },
-                    "pinned": {
-                        "type": "boolean",
-                        "description": "是否置顶",
-                    },
-                    "visible": {
-                        "type": "string",
-                        "description": "可见性：PUBLIC（公开）或 PRIVATE（私密）",
-                        "enum": ["PUBLIC", "PRIVATE"],
-                    },
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="publish_post",
-            description="发布草稿文章，使其公开可见",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="unpublish_post",
-            description="取消发布文章，使其转换回草稿状态",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="delete_post",
-            description="删除文章（移至回收站）",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="get_post_draft",
-            description="获取文章的草稿版本及可编辑内容",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                    "patched": {
-                        "type": "boolean",
-                        "description": "是否同时返回补丁（修订/差异）后的内容与原始内容（默认：false）",
-                        "default": False,
-                    },
-                },
-                "required": ["name"],
-            },
-        ),
-        Tool(
-            name="update_post_draft",
-            description="更新文章草稿内容（推荐使用 HTML 富文本，兼容 ProseMirror + CodeMirror，也支持 Markdown），不会发布",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "文章名称/标识符（必填）",
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "草稿内容，推荐使用 HTML 富文本（兼容 ProseMirror + CodeMirror），也支持 Markdown（必填）",
-                    },
-                },
-                "required": ["name", "content"],
-            },
-        ),
-    ]
-
-    # Combine all tools
-    all_tools = POST_TOOLS + CATEGORY_TOOLS + TAG_TOOLS + ATTACHMENT_TOOLS + SITE_TOOLS
-
-    logger.info(f"Registered {len(all_tools)} tools")
-    return all_tools
-
-
-@app.call_tool()
+
+# 参数由注册表中预编译的校验器检查；关闭 MCP SDK 自带的、每次调用都重新编译 Schema 的校验
+_CALL_TOOL_OPTIONS = (
+    {"validate_input": False}
+    if "validate_input" in inspect.signature(app.call_tool).parameters
+    else {}
+)
+
+
+@app.call_tool(**_CALL_TOOL_OPTIONS)
 async def call_tool(name: str, arguments: Dict[str, Any]) -> list[Any]:
     """处理工具执行。"""
     logger.info(f"执行工具：{name}")
     logger.debug(f"参数：{arguments}")
 
+    spec = TOOL_REGISTRY.get(name)
+    if spec is None:
+        return [{"type": "text", "text": f"Unknown tool: {name}"}]
+
+    arguments = dict(arguments or {})
+    output_format = resolve_output_format(arguments.get("output_format"))
+    projection = None
+    errors = spec.validator.errors(arguments)
+    if errors:
+        logger.warning(f"Invalid arguments for {name}: {errors}")
+        details = "；".join(f"{e['path']}: {e['message']}" for e in errors)
+        error_result = ToolResult.error_result(f"参数校验失败：{details}", {"errors": errors})
+        return _text_content(error_result.model_dump_json(), output_format)
+
+    deadline_ms = arguments.pop("deadline_ms", None)
     try:
-        client = await get_halo_client()
-
-        # Route to appropriate tool handler
-        if name == "list_my_posts":
-            result = await list_my_posts_tool(client, arguments)
-        elif name == "get_post":
-            result = await get_post_tool(client, arguments)
-        elif name == "create_post":
-            result = await create_post_tool(client, arguments)
-        elif name == "update_post":
-            result = await update_post_tool(client, arguments)
-        elif name == "publish_post":
-            result = await publish_post_tool(client, arguments)
-        elif name == "unpublish_post":
-            result = await unpublish_post_tool(client, arguments)
-        elif name == "delete_post":
-            result = await delete_post_tool(client, arguments)
-        elif name == "get_post_draft":
-            result = await get_post_draft_tool(client, arguments)
-        elif name == "update_post_draft":
-            result = await update_post_draft_tool(client, arguments)
-        # Category tools
-        elif name == "list_categories":
-            from .tools.category_tools import list_categories_tool
-
-            result = await list_categories_tool(client, arguments)
-        elif name == "get_category":
-            from .tools.category_tools import get_category_tool
-
-            result = await get_category_tool(client, arguments)
-        elif name == "create_category":
-            from .tools.category_tools import create_category_tool
-
-            result = await create_category_tool(client, arguments)
-        elif name == "update_category":
-            from .tools.category_tools import update_category_tool
-
-            result = await update_category_tool(client, arguments)
-        elif name == "delete_category":
-            from .tools.category_tools import delete_category_tool
-
-            result = await delete_category_tool(client, arguments)
-        elif name == "get_category_posts":
-            from .tools.category_tools import get_posts_under_category_tool
-
-            result = await get_posts_under_category_tool(client, arguments)
-        # Tag tools
-        elif name == "list_tags":
-            from .tools.tag_tools import list_tags_tool
-
-            result = await list_tags_tool(client, arguments)
-        elif name == "get_tag":
-            from .tools.tag_tools import get_tag_tool
-
-            result = await get_tag_tool(client, arguments)
-        elif name == "create_tag":
-            from .tools.tag_tools import create_tag_tool
-
-            result = await create_tag_tool(client, arguments)
-        elif name == "update_tag":
-            from .tools.tag_tools import update_tag_tool
-
-            result = await update_tag_tool(client, arguments)
-        elif name == "delete_tag":
-            from .tools.tag_tools import delete_tag_tool
-
-            result = await delete_tag_tool(client, arguments)
-        elif name == "get_tag_posts":
-            from .tools.tag_tools import get_posts_under_tag_tool
-
-            result = await get_posts_under_tag_tool(client, arguments)
-        elif name == "list_console_tags":
-            from .tools.tag_tools import list_console_tags_tool
-
-            result = await list_console_tags_tool(client, arguments)
-        # Attachment tools
-        elif name == "list_attachments":
-            from .tools.attachment_tools import list_attachments_tool
-
-            result = await list_attachments_tool(client, arguments)
-        elif name == "get_attachment":
-            from .tools.attachment_tools import get_attachment_tool
-
-            result = await get_attachment_tool(client, arguments)
-        elif name == "upload_attachment":
-            from .tools.attachment_tools import upload_attachment_tool
-
-            result = await upload_attachment_tool(client, arguments)
-        elif name == "upload_attachment_from_url":
-            from .tools.attachment_tools import upload_attachment_from_url_tool
-
-            result = await upload_attachment_from_url_tool(client, arguments)
-        elif name == "delete_attachment":
-            from .tools.attachment_tools import delete_attachment_tool
-
-            result = await delete_attachment_tool(client, arguments)
-        elif name == "list_attachment_groups":
-            from .tools.attachment_tools import list_attachment_groups_tool
-
-            result = await list_attachment_groups_tool(client, arguments)
-        elif name == "create_attachment_group":
-            from .tools.attachment_tools import create_attachment_group_tool
-
-            result = await create_attachment_group_tool(client, arguments)
-        elif name == "get_attachment_policies":
-            from .tools.attachment_tools import list_storage_policies_tool
-
-            result = await list_storage_policies_tool(client, arguments)
-        # Site tools
-        elif name == "get_halo_base_url":
-            from .tools.site_tools import get_halo_base_url_tool
-
-            result = await get_halo_base_url_tool(client, arguments)
-        else:
-            return [{"type": "text", "text": f"Unknown tool: {name}"}]
+        arguments.pop("output_format", None)
+        timeout_overrides = normalize_timeout_override(arguments.pop("timeout", None))
+        if spec.projectable:
+            projection = parse_fields(arguments.pop("fields", None))
+
+        async def run() -> str:
+            client = await get_halo_client()
+            # 按并发类别排队，上传与写入不会挤占读取；排队时间计入截止时间
+            async with TOOL_CONCURRENCY.slot(spec.concurrency):
+                return await spec.handler(client, arguments)
+
+        deadline = None if deadline_ms is None else deadline_ms / 1000
+        with (
+            override_timeouts(timeout_overrides),
+            deadline_scope(deadline),
+            projection_scope(projection),
+        ):
+            if deadline is None:
+                result = await run()
+            else:
+                # 请求已按截止时间收紧；宽限期后仍未结束（如排队、本地处理）则强制取消
+                result = await asyncio.wait_for(run(), deadline + DEADLINE_GRACE)
 
         logger.info(f"Tool {name} executed successfully")
-        return [{"type": "text", "text": result}]
+        return _text_content(result, output_format)
+
+    except asyncio.TimeoutError:
+        logger.warning(f"Tool {name} exceeded its deadline of {deadline_ms} ms")
+        error_result = ToolResult.error_result(
+            f"错误：{name} 超出截止时间（{deadline_ms} 毫秒），已中止",
+            {"deadline_ms": deadline_ms},
+        )
+        return _text_content(error_result.model_dump_json(), output_format)
+
+    except asyncio.CancelledError:
+        # 客户端取消调用：进行中的请求与重试等待随任务一起取消
+        logger.info(f"Tool {name} was cancelled")
+        raise
 
     except Exception as e:
         logger.error(f"Error executing {name}: {e}", exc_info=True)
         error_result = ToolResult.error_result(f"Error executing {name}: {str(e)}")
-        return [{"type": "text", "text": error_result.model_dump_json()}]
+        return _text_content(error_result.model_dump_json(), output_format)
+
+
+def _text_content(text: str, output_format: str) -> list[Any]:
+    """按输出格式（compact/pretty）排版工具结果。"""
+    return [{"type": "text", "text": format_tool_output(text, output_format)}]
 
 
 async def run_server() -> None:
     """使用 stdio 传输运行 MCP 服务器。"""
     logger.info("使用 stdio 传输启动 MCP 服务器...")
 
-    async with stdio_server() as (read_stream, write_stream):
-        logger.info("服务器已就绪，正在等待请求...")
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    # 预热在后台进行，不阻塞 stdio 握手
+    warmup = asyncio.create_task(warm_up_halo_client()) if settings.enable_warmup else None
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            logger.info("服务器已就绪，正在等待请求...")
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        if warmup is not None and not warmup.done():
+            warmup.cancel()
 
 
 # 导出 server 实例供测试使用
@@ -958,6 +712,4 @@ server = app
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(run_server())
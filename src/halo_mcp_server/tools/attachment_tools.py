@@ -1,33 +1,26 @@
 """Halo MCP 附件管理工具"""
 
-import asyncio
 import mimetypes
 
-from halo_mcp_server.config import settings
-
 """Attachment management tools for Halo MCP."""
 
 import base64
-import json
 import os
 from typing import Any, Dict, List, Optional, Union, Tuple
 
 from loguru import logger
 from mcp.types import Tool
-import httpx
 
 # 从 exceptions 导入所有需要的错误类型
 from halo_mcp_server.exceptions import (
     AuthenticationError,
-    AuthorizationError,
     HaloMCPError,
-    NetworkError,
-    ResourceNotFoundError,
 )
 
 from halo_mcp_server.client.halo_client import HaloClient
 from halo_mcp_server.exceptions import HaloMCPError
 from halo_mcp_server.models.common import ToolResult
+from halo_mcp_server.tools.projection import render_body
 
 
 async def list_attachments(
@@ -38,7 +31,9 @@ async def list_attachments(
     group_name: Optional[str] = None,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     搜索和列出附件。
 
@@ -49,6 +44,7 @@ async def list_attachments(
         accepts: 接受的文件类型，如 ["image/*", "video/*"]
         group_name: 附件分组名称
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         附件列表数据
@@ -70,21 +66,23 @@ async def list_attachments(
         if sort:
             params["sort"] = sort
 
-        response = await client.get(
-            "/apis/api.console.halo.run/v1alpha1/attachments", params=params
-        )
+        fetch = client.get_raw if raw else client.get
+        response = await fetch("/apis/api.console.halo.run/v1alpha1/attachments", params=params)
         return response
 
     except Exception as e:
         raise HaloMCPError(f"获取附件列表失败：{e}")
 
 
-async def get_attachment(name: str, client: Optional[HaloClient] = None) -> Dict[str, Any]:
+async def get_attachment(
+    name: str, client: Optional[HaloClient] = None, *, raw: bool = False
+) -> Union[Dict[str, Any], bytes]:
     """
     获取指定附件的详细信息。
 
     Args:
         name: 附件名称/标识符
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         附件详细信息
@@ -96,7 +94,8 @@ async def get_attachment(name: str, client: Optional[HaloClient] = None) -> Dict
         client = client or HaloClient()
         await client.ensure_authenticated()
 
-        response = await client.get(f"/apis/storage.halo.run/v1alpha1/attachments/{name}")
+        fetch = client.get_raw if raw else client.get
+        response = await fetch(f"/apis/storage.halo.run/v1alpha1/attachments/{name}")
         return response
 
     except Exception as e:
@@ -107,24 +106,24 @@ async def upload_attachment(
     file_path: str,
     policy_name: str = "default-policy",
     group_name: Optional[str] = None,
-    client: Optional[HaloClient] = None,  # 仍然接收 client 以获取 base_url 和认证信息
+    client: Optional[HaloClient] = None,
 ) -> Dict[str, Any]:
     """
     上传本地文件作为附件（参考 Console API 多表单上传）。
-    使用独立的 httpx.AsyncClient 并包含完整的状态校验。
 
     Args:
         file_path: 本地文件路径
         policy_name: 存储策略名称，默认为 "default-policy"
         group_name: 附件分组名称（允许传空字符串）
-        client: Halo API 客户端实例 (用于获取配置和认证)
+        client: Halo API 客户端实例
 
     Returns:
         上传后的附件信息 (JSON 字典)
 
     Raises:
-        HaloMCPError: 文件不存在或上传失败 (包装了底层错误)
+        HaloMCPError: 文件不存在或无法读取
         AuthenticationError / AuthorizationError / ResourceNotFoundError / NetworkError: API 调用特定错误
+        DeadlineExceededError: 超出工具调用的截止时间
     """
     if not os.path.exists(file_path):
         logger.error(f"Upload attachment failed: File not found at {file_path}")
@@ -163,137 +162,14 @@ async def upload_attachment(
         "groupName": (None, group_name if group_name is not None else ""),
     }
 
-    # 准备 headers (仅包含认证)
-    auth_token = _client_instance._headers.get("Authorization")  # 从内部获取认证头
-    if not auth_token:
-        # 理论上 ensure_authenticated 会处理，但作为保险
-        raise AuthenticationError("无法获取认证令牌，请重新认证。")
-
-    headers = {
-        "Authorization": auth_token,
-        # 不需要 Content-Type，httpx 会自动生成
-    }
-
-    # 构造完整 URL
     upload_path = "/apis/api.console.halo.run/v1alpha1/attachments/upload"
-    url = f"{_client_instance.base_url}{upload_path}"
-
-    logger.debug(f"Attempting direct httpx POST to {url} for file {filename}")
-    logger.debug(f"Headers (excluding auto Content-Type): {headers}")
-
-    # 使用独立的 httpx 客户端进行请求，并加入重试逻辑
-    retry_count = 0
-    # 从 settings 获取重试配置，如果 client 未初始化 settings，则使用默认值
-    max_retries = getattr(settings, "max_retries", 3)
-    retry_delay = getattr(settings, "retry_delay", 1.0)
-
-    async with httpx.AsyncClient(timeout=_client_instance.timeout) as http_client:
-        while retry_count <= max_retries:
-            try:
-                response = await http_client.post(
-                    url,
-                    files=files_data,
-                    headers=headers,
-                    follow_redirects=True,  # 保持与 BaseHTTPClient 一致
-                )
-
-                # --- 状态码校验 ---
-                if 200 <= response.status_code < 300:
-                    # 成功
-                    logger.info(
-                        f"Successfully uploaded {filename} via Console API (status: {response.status_code})"
-                    )
-                    try:
-                        return response.json()
-                    except json.JSONDecodeError as json_err:
-                        logger.warning(
-                            f"Failed to decode JSON response from successful upload: {json_err}. Response text: {response.text[:200]}"
-                        )
-                        # 即使 JSON 解析失败，也认为上传操作本身成功了，返回文本内容
-                        return {"status": "success_but_no_json", "text": response.text}
-                    except Exception as parse_err:  # 捕获其他可能的解析错误
-                        logger.error(f"Unexpected error parsing response: {parse_err}")
-                        raise HaloMCPError(f"上传成功但解析响应失败: {parse_err}") from parse_err
-
-                elif response.status_code == 401:
-                    logger.error(f"Authentication failed (401) during upload to {url}")
-                    raise AuthenticationError("认证失败。请检查令牌或凭据。")
-                elif response.status_code == 403:
-                    logger.error(f"Authorization failed (403) during upload to {url}")
-                    raise AuthorizationError("权限不足。访问受限。")
-                elif response.status_code == 404:
-                    logger.error(f"Resource not found (404) during upload: {url}")
-                    raise ResourceNotFoundError("上传接口", upload_path)  # 使用 path
-                elif response.status_code >= 400:  # 其他客户端或服务器错误
-                    error_detail = response.text
-                    try:
-                        error_json = response.json()
-                        error_detail = (
-                            error_json.get("detail") or error_json.get("message") or error_detail
-                        )
-                    except Exception:
-                        pass
-                    logger.error(
-                        f"HTTP {response.status_code} error during upload to {url}: {error_detail}"
-                    )
-                    # 对于可重试的服务器错误 (5xx)，允许重试；客户端错误 (4xx，非 401/403/404) 不重试
-                    if response.status_code >= 500 and retry_count < max_retries:
-                        last_error = NetworkError(
-                            f"HTTP {response.status_code} 错误：{error_detail}",
-                            status_code=response.status_code,
-                        )
-                        # 进入重试逻辑
-                    else:
-                        raise NetworkError(
-                            f"HTTP {response.status_code} 错误：{error_detail}",
-                            status_code=response.status_code,
-                        )
-                else:
-                    # 未知状态码？理论上不应发生
-                    logger.warning(
-                        f"Unexpected status code {response.status_code} during upload to {url}"
-                    )
-                    last_error = NetworkError(
-                        f"未预期的状态码: {response.status_code}", status_code=response.status_code
-                    )
-                    # 进入重试逻辑
-
-            except (httpx.TimeoutException, httpx.ConnectError, httpx.NetworkError) as e:
-                last_error = e
-                logger.warning(f"Upload attempt {retry_count + 1} failed due to network issue: {e}")
-                # 进入重试逻辑
-
-            except (AuthenticationError, AuthorizationError, ResourceNotFoundError, NetworkError):
-                raise  # 这些是明确的错误，不需要重试，直接抛出
-
-            except Exception as e:
-                # 捕获 httpx.post 可能抛出的其他异常
-                last_error = e
-                logger.error(f"Unexpected error during httpx.post for upload: {e}", exc_info=True)
-                # 进入重试逻辑
-
-            # 重试逻辑
-            retry_count += 1
-            if retry_count <= max_retries:
-                logger.warning(
-                    f"Retrying upload ({retry_count}/{max_retries})... Last error: {last_error}"
-                )
-                await asyncio.sleep(retry_delay * (2 ** (retry_count - 1)))  # 指数退避
-            else:
-                logger.error(
-                    f"Upload failed after {max_retries} retries for {url}. Last error: {last_error}"
-                )
-                # 将最后一次的错误包装成 HaloMCPError 抛出
-                error_message = f"上传附件失败 (重试次数耗尽): {last_error}"
-                if isinstance(last_error, NetworkError):  # 如果最后是网络错误，保留状态码
-                    raise HaloMCPError(
-                        error_message, details={"status_code": last_error.status_code}
-                    ) from last_error
-                raise HaloMCPError(error_message) from last_error
-
-    # 如果所有重试都失败，上面的循环会抛出异常
-    # 理论上不会执行到这里
-    raise HaloMCPError(f"上传附件 {filename} 失败，未知原因。")
+    logger.debug(f"Uploading {filename} to {upload_path}")
+
+    # 与其他写操作一样经 client.post 发送：由 httpx 生成 multipart 请求头，
+    # 并沿用 POST 的重试策略、熔断、指标、401 重新认证与缓存失效
+    response = await _client_instance.post(upload_path, files=files_data)
+    logger.info(f"Successfully uploaded {filename} via Console API")
+    return response
 
 
 async def upload_attachment_from_url(
@@ -392,7 +268,9 @@ async def list_attachment_groups(
     size: int = 100,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     列出附件分组。
 
@@ -400,6 +278,7 @@ async def list_attachment_groups(
         page: 页码，默认为 0
         size: 每页大小，默认为 100
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         附件分组列表
@@ -415,7 +294,8 @@ async def list_attachment_groups(
         if sort:
             params["sort"] = sort
 
-        response = await client.get("/apis/storage.halo.run/v1alpha1/groups", params=params)
+        fetch = client.get_raw if raw else client.get
+        response = await fetch("/apis/storage.halo.run/v1alpha1/groups", params=params)
         return response
 
     except Exception as e:
@@ -460,10 +340,15 @@ async def create_attachment_group(
         raise HaloMCPError(f"创建附件分组失败：{e}")
 
 
-async def get_attachment_policies(client: Optional[HaloClient] = None) -> Dict[str, Any]:
+async def get_attachment_policies(
+    client: Optional[HaloClient] = None, *, raw: bool = False
+) -> Union[Dict[str, Any], bytes]:
     """
     获取存储策略列表。
 
+    Args:
+        raw: 为 True 时返回未解析的原始响应体字节
+
     Returns:
         存储策略列表
 
@@ -474,7 +359,8 @@ async def get_attachment_policies(client: Optional[HaloClient] = None) -> Dict[s
         client = client or HaloClient()
         await client.ensure_authenticated()
 
-        response = await client.get("/apis/storage.halo.run/v1alpha1/policies")
+        fetch = client.get_raw if raw else client.get
+        response = await fetch("/apis/storage.halo.run/v1alpha1/policies")
         return response
 
     except Exception as e:
@@ -676,9 +562,10 @@ async def list_attachments_tool(client: HaloClient, args: Dict[str, Any]) -> str
             accepts=accepts,
             group_name=group_name,
             sort=sort,
+            raw=True,
             client=client,
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"列出附件出错：{e}", exc_info=True)
@@ -705,8 +592,8 @@ async def get_attachment_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
         logger.debug(f"正在获取附件：{name}")
 
-        result = await get_attachment(name, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await get_attachment(name, raw=True, client=client)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"获取附件出错：{e}", exc_info=True)
@@ -847,8 +734,10 @@ async def list_attachment_groups_tool(client: HaloClient, args: Dict[str, Any])
 
         logger.debug(f"正在列出附件分组：page={page}, size={size}")
 
-        result = await list_attachment_groups(page=page, size=size, sort=sort, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await list_attachment_groups(
+            page=page, size=size, sort=sort, raw=True, client=client
+        )
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"列出附件分组出错：{e}", exc_info=True)
@@ -902,8 +791,8 @@ async def list_storage_policies_tool(client: HaloClient, args: Dict[str, Any]) -
     """
     try:
         logger.debug("正在列出存储策略")
-        result = await get_attachment_policies(client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await get_attachment_policies(raw=True, client=client)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"列出存储策略出错：{e}", exc_info=True)
@@ -1,7 +1,6 @@
 """Halo MCP 分类管理工具"""
 
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from loguru import logger
 from mcp.types import Tool
@@ -9,7 +8,7 @@ from mcp.types import Tool
 from halo_mcp_server.client.halo_client import HaloClient
 from halo_mcp_server.exceptions import HaloMCPError
 from halo_mcp_server.models.common import ToolResult
-from slugify import slugify
+from halo_mcp_server.tools.projection import render_body
 
 
 async def list_categories(
@@ -18,7 +17,9 @@ async def list_categories(
     keyword: Optional[str] = None,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     列出所有分类。
 
@@ -27,6 +28,7 @@ async def list_categories(
         size: 每页大小，默认为 50
         keyword: 搜索关键词
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         分类列表数据
@@ -45,19 +47,23 @@ async def list_categories(
             params["sort"] = sort
 
         # 使用 Extension API 获取完整的分类信息
-        response = await client.get("/apis/content.halo.run/v1alpha1/categories", params=params)
+        fetch = client.get_raw if raw else client.get
+        response = await fetch("/apis/content.halo.run/v1alpha1/categories", params=params)
         return response
 
     except Exception as e:
         raise HaloMCPError(f"获取分类列表失败：{e}")
 
 
-async def get_category(name: str, client: Optional[HaloClient] = None) -> Dict[str, Any]:
+async def get_category(
+    name: str, client: Optional[HaloClient] = None, *, raw: bool = False
+) -> Union[Dict[str, Any], bytes]:
     """
     获取指定分类的详细信息。
 
     Args:
         name: 分类名称/标识符
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         分类详细信息
@@ -69,7 +75,8 @@ async def get_category(name: str, client: Optional[HaloClient] = None) -> Dict[s
         client = client or HaloClient()
         await client.ensure_authenticated()
 
-        response = await client.get(f"/apis/content.halo.run/v1alpha1/categories/{name}")
+        fetch = client.get_raw if raw else client.get
+        response = await fetch(f"/apis/content.halo.run/v1alpha1/categories/{name}")
         return response
 
     except Exception as e:
@@ -187,7 +194,9 @@ async def update_category(
         await client.ensure_authenticated()
 
         # 先获取现有分类信息
-        existing_category = await client.get(f"/apis/content.halo.run/v1alpha1/categories/{name}")
+        existing_category = await client.get(
+            f"/apis/content.halo.run/v1alpha1/categories/{name}", use_cache=False
+        )
 
         # 更新指定字段
         if display_name is not None:
@@ -251,7 +260,9 @@ async def get_category_posts(
     size: int = 20,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     获取指定分类下的文章列表。
 
@@ -260,6 +271,7 @@ async def get_category_posts(
         page: 页码，默认为 0
         size: 每页大小，默认为 20
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         分类下的文章列表
@@ -275,7 +287,8 @@ async def get_category_posts(
             params["sort"] = sort
 
         # 使用 Public API 获取分类下的文章
-        response = await client.get(
+        fetch = client.get_raw if raw else client.get
+        response = await fetch(
             f"/apis/api.content.halo.run/v1alpha1/categories/{name}/posts",
             params=params,
         )
@@ -499,9 +512,9 @@ async def list_categories_tool(client: HaloClient, args: Dict[str, Any]) -> str:
         logger.debug(f"正在列出分类：page={page}, size={size}, keyword={keyword}")
 
         result = await list_categories(
-            page=page, size=size, keyword=keyword, sort=sort, client=client
+            page=page, size=size, keyword=keyword, sort=sort, raw=True, client=client
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"列出分类出错：{e}", exc_info=True)
@@ -528,8 +541,8 @@ async def get_category_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
         logger.debug(f"正在获取分类：{name}")
 
-        result = await get_category(name, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await get_category(name, raw=True, client=client)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"获取分类出错：{e}", exc_info=True)
@@ -558,6 +571,8 @@ async def create_category_tool(client: HaloClient, args: Dict[str, Any]) -> str:
             error_result = ToolResult.error_result("错误：显示名称过长（最大 100 字符）")
             return error_result.model_dump_json()
 
+        from slugify import slugify
+
         slug = args.get("slug") or slugify(display_name)
         description = args.get("description")
         cover = args.get("cover")
@@ -732,8 +747,10 @@ async def get_posts_under_category_tool(client: HaloClient, args: Dict[str, Any]
 
         logger.debug(f"正在获取分类下的文章：{name}, page={page}, size={size}")
 
-        result = await get_category_posts(name=name, page=page, size=size, sort=sort, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await get_category_posts(
+            name=name, page=page, size=size, sort=sort, raw=True, client=client
+        )
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"获取分类下文章出错：{e}", exc_info=True)
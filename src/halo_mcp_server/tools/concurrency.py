@@ -0,0 +1,109 @@
+"""按工具并发类别（读取/写入/上传/发布）限制同时执行的工具调用"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Dict
+
+from halo_mcp_server.client.metrics import LATENCY_BUCKETS_MS, Histogram
+from halo_mcp_server.config import settings
+
+# 并发类别：读取、内容写入、附件上传、发布/取消发布
+CONCURRENCY_CLASSES = ("read", "write", "upload", "publish")
+
+
+class ClassLimiter:
+    """单个并发类别的信号量与排队指标。"""
+
+    def __init__(self, name: str, limit: int):
+        """
+        初始化并发类别。
+
+        参数:
+            name: 并发类别名
+            limit: 同时执行的工具调用上限
+        """
+        self.name = name
+        self.limit = limit
+        self.in_flight = 0
+        self.queued = 0
+        self.calls = 0
+        self.waited = 0
+        self.queue_ms = Histogram(LATENCY_BUCKETS_MS)
+        self._semaphore = asyncio.BoundedSemaphore(limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """占用一个槽位，已满时排队等待；记录排队耗时。"""
+        started_at = time.monotonic()
+        if self._semaphore.locked():
+            self.waited += 1
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.calls += 1
+        self.queue_ms.observe((time.monotonic() - started_at) * 1000)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """导出上限、占用、排队深度与排队耗时分布。"""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "calls": self.calls,
+            "waited": self.waited,
+            "queue_ms": self.queue_ms.snapshot(),
+        }
+
+
+class ToolConcurrency:
+    """
+    工具调度器的分类并发限制。
+
+    每个并发类别有独立的信号量：批量上传或写入占满自己的槽位后只会在本类别内排队，
+    不会挤占交互式读取的并发与连接池。
+    """
+
+    def __init__(self, limits: Dict[str, int]):
+        """
+        初始化并发限制。
+
+        参数:
+            limits: 并发类别 -> 上限，需覆盖 ``CONCURRENCY_CLASSES`` 中的全部类别
+        """
+        self._classes = {name: ClassLimiter(name, limits[name]) for name in CONCURRENCY_CLASSES}
+
+    @classmethod
+    def from_settings(cls) -> "ToolConcurrency":
+        """按 ``TOOL_CONCURRENCY_*`` 配置创建。"""
+        return cls(
+            {name: getattr(settings, f"tool_concurrency_{name}") for name in CONCURRENCY_CLASSES}
+        )
+
+    def slot(self, concurrency: str) -> AsyncContextManager[None]:
+        """
+        占用指定类别的一个槽位。
+
+        参数:
+            concurrency: ``CONCURRENCY_CLASSES`` 之一
+
+        返回:
+            异步上下文管理器
+        """
+        return self._classes[concurrency].slot()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """导出各并发类别的指标。"""
+        return {name: limiter.snapshot() for name, limiter in self._classes.items()}
+
+
+TOOL_CONCURRENCY = ToolConcurrency.from_settings()
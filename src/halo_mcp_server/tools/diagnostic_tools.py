@@ -0,0 +1,93 @@
+"""Halo MCP 客户端诊断工具"""
+
+from typing import Any, Dict
+
+from loguru import logger
+from mcp.types import Tool
+
+from halo_mcp_server.client.halo_client import HaloClient
+from halo_mcp_server.models.common import ToolResult
+from halo_mcp_server.tools.concurrency import TOOL_CONCURRENCY
+
+
+async def get_client_diagnostics_tool(client: HaloClient, args: Dict[str, Any]) -> str:
+    """
+    工具处理器：获取 HTTP 客户端诊断信息。
+
+    参数:
+        client: Halo API 客户端
+        args: 工具参数
+
+    返回:
+        诊断信息的 JSON 字符串
+    """
+    try:
+        data = {
+            "circuit_breakers": client.get_circuit_breakers(),
+            "concurrency": client.get_concurrency_limits(),
+            "cache": client.get_cache_stats(),
+            "coalescing": client.get_coalescing_stats(),
+            "retries": client.get_retry_stats(),
+            "auth": {"state": client.auth_state.value, **client.get_auth_stats()},
+            "tool_concurrency": TOOL_CONCURRENCY.snapshot(),
+        }
+        result = ToolResult.success_result("已获取 HTTP 客户端诊断信息", data)
+        return result.model_dump_json()
+
+    except Exception as e:
+        logger.error(f"获取客户端诊断信息出错：{e}", exc_info=True)
+        error_result = ToolResult.error_result(f"错误：{str(e)}")
+        return error_result.model_dump_json()
+
+
+async def get_client_metrics_tool(client: HaloClient, args: Dict[str, Any]) -> str:
+    """
+    工具处理器：获取按接口统计的请求指标。
+
+    参数:
+        client: Halo API 客户端
+        args: 工具参数
+
+    返回:
+        指标快照的 JSON 字符串
+    """
+    try:
+        reset = bool(args.get("reset", False))
+        metrics = client.get_metrics(reset=reset)
+        message = f"已获取 {len(metrics)} 个接口的请求指标"
+        if reset:
+            message += "，指标已重置"
+        result = ToolResult.success_result(message, {"endpoints": metrics})
+        return result.model_dump_json()
+
+    except Exception as e:
+        logger.error(f"获取客户端请求指标出错：{e}", exc_info=True)
+        error_result = ToolResult.error_result(f"错误：{str(e)}")
+        return error_result.model_dump_json()
+
+
+# MCP Tool 定义
+DIAGNOSTIC_TOOLS = [
+    Tool(
+        name="get_client_diagnostics",
+        description="获取 MCP 服务与 Halo 之间 HTTP 客户端的诊断信息：各 API 组熔断器状态与自适应并发上限、响应缓存命中率、请求合并与重试统计、令牌失效后的重新登录与请求重放次数、各类工具调用（读取/写入/上传/发布）的并发占用与排队耗时。推荐用法：工具调用频繁失败或变慢时排查 Halo 是否降级。",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+        },
+    ),
+    Tool(
+        name="get_client_metrics",
+        description="获取按 Halo 接口路由模板（如 /apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft）统计的请求指标：延迟 p50/p90/p99、请求与响应体大小、状态码分布与重试次数。推荐用法：定位慢接口；传入 reset=true 可在导出后清零，用于分段观测。",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "reset": {
+                    "type": "boolean",
+                    "description": "导出快照后是否清空指标，默认 false",
+                    "default": False,
+                },
+            },
+        },
+    ),
+]
@@ -0,0 +1,47 @@
+"""工具输出格式（紧凑/缩进）"""
+
+from typing import Any, Dict, Optional
+
+from halo_mcp_server.config import settings
+from halo_mcp_server.utils import codec
+
+OUTPUT_FORMATS = ("compact", "pretty")
+
+# MCP 工具通用参数 ``output_format`` 的 JSON Schema
+OUTPUT_FORMAT_ARGUMENT_SCHEMA: Dict[str, Any] = {
+    "type": "string",
+    "enum": list(OUTPUT_FORMATS),
+    "description": "可选：本次调用结果的 JSON 格式，compact 为紧凑输出，pretty 为缩进输出",
+}
+
+
+def resolve_output_format(value: Optional[Any]) -> str:
+    """取工具参数中的输出格式，未指定或不合法时使用 ``TOOL_OUTPUT_FORMAT`` 配置。"""
+    if value in OUTPUT_FORMATS:
+        return value
+    return settings.tool_output_format
+
+
+def format_tool_output(text: str, output_format: str) -> str:
+    """
+    按输出格式重新排版工具结果。
+
+    处理器返回紧凑 JSON 或 Halo 的原始响应体（字段投影已在处理器中完成）。紧凑 JSON
+    中不会出现换行符（字符串中的换行已转义），因此紧凑模式下不含换行的结果直接返回，
+    不必重新解析；否则解析一次后按格式序列化。非 JSON 文本原样返回。
+
+    参数:
+        text: 工具处理器返回的文本
+        output_format: ``OUTPUT_FORMATS`` 之一
+
+    返回:
+        排版后的文本
+    """
+    pretty = output_format == "pretty"
+    if not pretty and "\n" not in text:
+        return text
+    try:
+        data = codec.loads(text)
+    except codec.JSONDecodeError:
+        return text
+    return codec.dumps(data, pretty=pretty)
@@ -1,17 +1,17 @@
 # -*- coding: utf-8 -*-
 """Halo MCP Server 的文章管理工具。"""
 
-import json
 import re
 from datetime import datetime
 from typing import Any, Dict
 
-import markdown
 from loguru import logger
-from slugify import slugify
 
 from halo_mcp_server.client.halo_client import HaloClient
+from halo_mcp_server.exceptions import DeadlineExceededError
 from halo_mcp_server.models.common import ToolResult
+from halo_mcp_server.tools.projection import render, render_body
+from halo_mcp_server.utils import codec
 
 
 def markdown_to_html(md_text: str) -> str:
@@ -42,6 +42,8 @@ def markdown_to_html(md_text: str) -> str:
     except Exception as e:
         logger.warning(f"markdown-it-py 渲染失败，回退到 Python-Markdown：{e}")
         try:
+            import markdown
+
             # 采用用户指定的 Python-Markdown 扩展组合作为兜底
             return markdown.markdown(
                 md_text,
@@ -117,6 +119,49 @@ def _validate_post_params(args: Dict[str, Any], required_fields: list = None) ->
     return ToolResult.success_result("验证通过")
 
 
+def _format_post_list_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """将文章列表中的单个条目精简为便于阅读的摘要。"""
+    # 实际的文章数据嵌套在 'post' 字段中
+    post_data = item.get("post", {})
+    spec = post_data.get("spec", {})
+    status = post_data.get("status", {})
+    metadata = post_data.get("metadata", {})
+
+    # 来自 item 层的附加字段
+    categories = item.get("categories", [])
+    tags = item.get("tags", [])
+    owner = item.get("owner", {})
+    stats = item.get("stats", {})
+
+    return {
+        "name": metadata.get("name", ""),
+        "title": spec.get("title", ""),
+        "slug": spec.get("slug", ""),
+        "excerpt": (
+            spec.get("excerpt", {}).get("raw", "")
+            if isinstance(spec.get("excerpt"), dict)
+            else spec.get("excerpt", "")
+        ),
+        "cover": spec.get("cover", ""),
+        "visible": spec.get("visible", "PUBLIC"),
+        "pinned": spec.get("pinned", False),
+        "allowComment": spec.get("allowComment", True),
+        "categories": [cat.get("displayName", cat.get("name", "")) for cat in categories],
+        "tags": [tag.get("displayName", tag.get("name", "")) for tag in tags],
+        "publishTime": spec.get("publishTime"),
+        "phase": status.get("phase", "DRAFT"),
+        "permalink": status.get("permalink", ""),
+        "creationTimestamp": metadata.get("creationTimestamp", ""),
+        "version": metadata.get("version", 0),
+        "owner": owner.get("displayName", owner.get("name", "")),
+        "stats": stats,
+        # 额外的筛选用元数据
+        "labels": metadata.get("labels", {}),
+        "is_deleted": metadata.get("labels", {}).get("content.halo.run/deleted") == "true",
+        "is_published": metadata.get("labels", {}).get("content.halo.run/published") == "true",
+    }
+
+
 async def list_my_posts_tool(client: HaloClient, args: Dict[str, Any]) -> str:
     """
     列出用户的文章。
@@ -126,7 +171,7 @@ async def list_my_posts_tool(client: HaloClient, args: Dict[str, Any]) -> str:
         args: 工具参数
 
     返回:
-        文章列表的 JSON 字符串
+        文章列表的 JSON 字符串；读取中途超出截止时间时返回已解析的部分条目（``partial`` 为 true）
     """
     try:
         page = args.get("page", 0)
@@ -146,58 +191,25 @@ async def list_my_posts_tool(client: HaloClient, args: Dict[str, Any]) -> str:
             params["categoryWithChildren"] = category
 
         await client.ensure_authenticated()
-        result = await client.get("/apis/uc.api.content.halo.run/v1alpha1/posts", params=params)
 
-        # 为了更好地可读性，对结果进行格式化
-        posts = result.get("items", [])
+        # 流式解析列表响应，逐条格式化，内存中只保留精简后的结果
+        meta: Dict[str, Any] = {}
         formatted_posts = []
+        try:
+            async for item in client.stream_items(
+                "/apis/uc.api.content.halo.run/v1alpha1/posts", params=params, meta=meta
+            ):
+                formatted_posts.append(_format_post_list_item(item))
+        except DeadlineExceededError as e:
+            if not formatted_posts:
+                raise
+            logger.warning(f"列出文章超出截止时间，返回已读取的 {len(formatted_posts)} 篇")
+            return render(
+                {"items": formatted_posts, "partial": True, "message": f"错误：{e.message}"}
+            )
+        result = {**meta, "items": formatted_posts}
 
-        for item in posts:
-            # 实际的文章数据嵌套在 'post' 字段中
-            post_data = item.get("post", {})
-            spec = post_data.get("spec", {})
-            status = post_data.get("status", {})
-            metadata = post_data.get("metadata", {})
-
-            # 来自 item 层的附加字段
-            categories = item.get("categories", [])
-            tags = item.get("tags", [])
-            owner = item.get("owner", {})
-            stats = item.get("stats", {})
-
-            formatted_post = {
-                "name": metadata.get("name", ""),
-                "title": spec.get("title", ""),
-                "slug": spec.get("slug", ""),
-                "excerpt": (
-                    spec.get("excerpt", {}).get("raw", "")
-                    if isinstance(spec.get("excerpt"), dict)
-                    else spec.get("excerpt", "")
-                ),
-                "cover": spec.get("cover", ""),
-                "visible": spec.get("visible", "PUBLIC"),
-                "pinned": spec.get("pinned", False),
-                "allowComment": spec.get("allowComment", True),
-                "categories": [cat.get("displayName", cat.get("name", "")) for cat in categories],
-                "tags": [tag.get("displayName", tag.get("name", "")) for tag in tags],
-                "publishTime": spec.get("publishTime"),
-                "phase": status.get("phase", "DRAFT"),
-                "permalink": status.get("permalink", ""),
-                "creationTimestamp": metadata.get("creationTimestamp", ""),
-                "version": metadata.get("version", 0),
-                "owner": owner.get("displayName", owner.get("name", "")),
-                "stats": stats,
-                # 额外的筛选用元数据
-                "labels": metadata.get("labels", {}),
-                "is_deleted": metadata.get("labels", {}).get("content.halo.run/deleted") == "true",
-                "is_published": metadata.get("labels", {}).get("content.halo.run/published")
-                == "true",
-            }
-            formatted_posts.append(formatted_post)
-
-        result["items"] = formatted_posts
-
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
 
     except Exception as e:
         logger.error(f"列出文章时发生错误：{e}", exc_info=True)
@@ -217,8 +229,9 @@ async def get_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
         logger.debug(f"获取文章：{name}")
 
         await client.ensure_authenticated()
-        result = await client.get(f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}")
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        path = f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}"
+        result = await client.get_raw(path)
+        return render_body(result, lambda body: client.decode_raw(body, path))
 
     except Exception as e:
         logger.error(f"获取文章出错：{e}", exc_info=True)
@@ -246,6 +259,8 @@ async def create_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
         title = args.get("title")
         content = args.get("content")
 
+        from slugify import slugify
+
         # 若未提供则自动生成 slug
         slug = args.get("slug") or slugify(title)
 
@@ -349,6 +364,8 @@ async def create_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
 async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
     """更新现有文章。"""
+    # 已完成的写入步骤，中途失败（如超出截止时间）时随错误一并返回
+    completed_steps = []
     try:
         # 参数校验
         validation = _validate_post_params(args, required_fields=["name"])
@@ -360,7 +377,9 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
         # 获取当前文章
         await client.ensure_authenticated()
-        post = await client.get(f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}")
+        post = await client.get(
+            f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}", use_cache=False
+        )
 
         # 更新元数据字段
         spec = post.get("spec", {})
@@ -397,6 +416,7 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
         if metadata_updated:
             logger.debug(f"更新文章元数据：{name}")
             await client.put(f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}", json=post)
+            completed_steps.append("metadata")
 
         # 如提供内容则更新（需使用草稿 API）
         if has_content_update:
@@ -406,6 +426,7 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
             current_draft = await client.get(
                 f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft",
                 params={"patched": "false"},
+                use_cache=False,
             )
 
             # 判定内容格式并渲染
@@ -439,9 +460,7 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
                 metadata["annotations"] = {}
 
             # 设置 content-json 注解（必须是 JSON 字符串）
-            metadata["annotations"]["content.halo.run/content-json"] = json.dumps(
-                content_obj, ensure_ascii=False
-            )
+            metadata["annotations"]["content.halo.run/content-json"] = codec.dumps(content_obj)
 
             logger.debug(f"设置 content-json 注解，原始内容长度 {len(content)} 字符")
 
@@ -464,6 +483,7 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
                 f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft",
                 json=draft_data,
             )
+            completed_steps.append("draft")
 
             # 重新发布以应用新内容
             logger.debug(f"重新发布文章以应用内容变更：{name}")
@@ -471,6 +491,7 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
                 f"/apis/api.console.halo.run/v1alpha1/posts/{name}/publish",
                 params={"async": "true"},
             )
+            completed_steps.append("publish")
 
         success_result = ToolResult.success_result(
             f"✓ 文章『{name}』更新成功！"
@@ -481,7 +502,12 @@ async def update_post_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
     except Exception as e:
         logger.error(f"更新文章出错：{e}", exc_info=True)
-        error_result = ToolResult.error_result(f"错误：{str(e)}")
+        data = (
+            {"post_name": args.get("name"), "completed_steps": completed_steps}
+            if completed_steps
+            else None
+        )
+        error_result = ToolResult.error_result(f"错误：{str(e)}", data)
         return error_result.model_dump_json()
 
 
@@ -578,11 +604,10 @@ async def get_post_draft_tool(client: HaloClient, args: Dict[str, Any]) -> str:
         logger.debug(f"获取文章草稿：{name}")
 
         await client.ensure_authenticated()
-        result = await client.get(
-            f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft",
-            params={"patched": str(patched).lower()},
-        )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        path = f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft"
+        params = {"patched": str(patched).lower()}
+        result = await client.get_raw(path, params=params)
+        return render_body(result, lambda body: client.decode_raw(body, path, params))
 
     except Exception as e:
         logger.error(f"获取文章草稿出错：{e}", exc_info=True)
@@ -608,6 +633,7 @@ async def update_post_draft_tool(client: HaloClient, args: Dict[str, Any]) -> st
         current_draft = await client.get(
             f"/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft",
             params={"patched": "false"},
+            use_cache=False,
         )
 
         # 判定内容格式并渲染
@@ -638,10 +664,7 @@ async def update_post_draft_tool(client: HaloClient, args: Dict[str, Any]) -> st
         metadata = current_draft.get("metadata", {})
         if "annotations" not in metadata:
             metadata["annotations"] = {}
-        metadata["annotations"]["content.halo.run/content-json"] = json.dumps(
-            content_obj,
-            ensure_ascii=False,
-        )
+        metadata["annotations"]["content.halo.run/content-json"] = codec.dumps(content_obj)
 
         # 构造正确的 Snapshot 数据结构（保留并补充 patch 字段）
         draft_data = {
@@ -894,7 +917,7 @@ POST_TOOLS = [
     ),
     Tool(
         name="get_post_draft",
-        description="获取文章的草稿版本及可编辑内容。推荐用法：拉取草稿编辑态；必要时 `patched=true` 查看补丁（修订/差异）信息。",
+        description="获取文章的草稿版本及可编辑内容。推荐用法：拉取草稿编辑态；需要正文时设 `patched=true`（正文位于 patched-content/patched-raw 注解）。默认省略与正文重复的 content-json 注解和 rawPatch/contentPatch 补丁，需要时传 `fields=full`。",
         inputSchema={
             "type": "object",
             "properties": {
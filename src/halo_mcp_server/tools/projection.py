@@ -0,0 +1,290 @@
+"""读取类工具结果的字段投影（``fields`` 参数）与重复大字段的剔除"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from halo_mcp_server.utils import codec
+
+# 与正文重复的大字段：content-json 注解保存了完整正文，rawPatch/contentPatch 为快照补丁
+HEAVY_KEYS = frozenset({"content.halo.run/content-json", "rawPatch", "contentPatch"})
+_HEAVY_KEY_BYTES = tuple(key.encode() for key in HEAVY_KEYS)
+
+Path = Tuple[str, ...]
+
+# 预设字段集。路径相对于单个资源（列表结果中为每个条目），不存在的路径会被忽略，
+# 因此同一预设可同时覆盖 Halo 扩展资源、列表中的文章（ListedPost）与 list_my_posts 的精简条目
+_SUMMARY_FIELDS = (
+    "metadata.name",
+    "metadata.creationTimestamp",
+    "spec.title",
+    "spec.displayName",
+    "spec.slug",
+    "spec.excerpt.raw",
+    "spec.description",
+    "spec.cover",
+    "spec.visible",
+    "spec.publish",
+    "spec.publishTime",
+    "spec.categories",
+    "spec.tags",
+    "spec.mediaType",
+    "spec.size",
+    "status.phase",
+    "status.permalink",
+    "status.postCount",
+    "post.metadata.name",
+    "post.spec.title",
+    "post.spec.slug",
+    "post.spec.excerpt.raw",
+    "post.spec.publishTime",
+    "post.status.phase",
+    "post.status.permalink",
+    "categories.spec.displayName",
+    "tags.spec.displayName",
+    "name",
+    "title",
+    "slug",
+    "excerpt",
+    "visible",
+    "publishTime",
+    "phase",
+    "permalink",
+)
+
+_META_FIELDS = (
+    "metadata",
+    "status",
+    "post.metadata",
+    "post.status",
+    "name",
+    "labels",
+    "version",
+    "creationTimestamp",
+    "phase",
+    "is_deleted",
+    "is_published",
+)
+
+# 预设名 -> 字段路径；``full`` 返回完整结果，不剔除任何字段
+FIELD_PRESETS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "summary": _SUMMARY_FIELDS,
+    "meta": _META_FIELDS,
+    "full": None,
+}
+
+# MCP 工具通用参数 ``fields`` 的 JSON Schema
+FIELDS_ARGUMENT_SCHEMA: Dict[str, Any] = {
+    "description": (
+        "可选：只返回指定字段。可传预设 summary（标识与标题等摘要）、meta（metadata 与 status）、"
+        "full（完整结果），或点分路径（逗号分隔的字符串或数组，如 "
+        "'metadata.name,spec.title'）；列表结果按条目投影。"
+        "默认返回除重复大字段（content-json 注解、rawPatch、contentPatch）外的完整结果。"
+    ),
+    "anyOf": [
+        {"type": "string", "minLength": 1},
+        {"type": "array", "items": {"type": "string", "minLength": 1}, "minItems": 1},
+    ],
+}
+
+
+@dataclass(frozen=True)
+class Projection:
+    """
+    一次工具调用的字段投影。
+
+    属性:
+        paths: 保留的字段路径；None 表示保留全部字段
+        strip_heavy: 是否剔除 ``HEAVY_KEYS`` 中的重复大字段
+    """
+
+    paths: Optional[Tuple[Path, ...]]
+    strip_heavy: bool
+
+    def applies_to(self, body: bytes) -> bool:
+        """响应体是否需要投影；仅剔除大字段且响应体中不含这些字段时可跳过解析。"""
+        if self.paths is not None:
+            return True
+        return self.strip_heavy and any(key in body for key in _HEAVY_KEY_BYTES)
+
+    def apply(self, data: Any) -> Any:
+        """
+        投影已解析的结果。不修改 ``data``，未改动的部分与之共享，因此可直接用于缓存的响应。
+
+        参数:
+            data: 工具结果；``ToolResult`` 形式的结果（如错误信息）原样返回
+
+        返回:
+            投影后的结果
+        """
+        if _is_tool_result(data):
+            return data
+        if self.paths is not None:
+            if isinstance(data, dict) and isinstance(data.get("items"), list):
+                data = {**data, "items": [self._select(item) for item in data["items"]]}
+            else:
+                data = self._select(data)
+        if self.strip_heavy:
+            data = _strip_heavy(data)
+        return data
+
+    def _select(self, item: Any) -> Any:
+        if not isinstance(item, dict):
+            return item
+        selected: Dict[str, Any] = {}
+        for path in self.paths:
+            _copy_path(item, path, selected)
+        return selected
+
+
+DEFAULT_PROJECTION = Projection(None, True)
+
+# 当前工具调用的字段投影，由工具调度器按 ``fields`` 参数设置；None 表示不投影
+_projection: ContextVar[Optional[Projection]] = ContextVar("halo_mcp_projection", default=None)
+
+
+def current_projection() -> Optional[Projection]:
+    """获取当前工具调用的字段投影。"""
+    return _projection.get()
+
+
+@contextmanager
+def projection_scope(projection: Optional[Projection]) -> Iterator[None]:
+    """在当前上下文中（一次工具调用内）设置字段投影。"""
+    token = _projection.set(projection)
+    try:
+        yield
+    finally:
+        _projection.reset(token)
+
+
+def render(data: Any) -> str:
+    """按当前工具调用的字段投影序列化工具结果。"""
+    projection = current_projection()
+    if projection is not None:
+        data = projection.apply(data)
+    return codec.dumps(data)
+
+
+def render_body(body: bytes, decode: Callable[[bytes], Any] = codec.loads) -> str:
+    """
+    输出读取类工具的原始响应体，需要时在序列化前完成字段投影。
+
+    当前投影不会改动结果时直接返回响应体文本，不解析；否则解码、投影后只序列化一次。
+
+    参数:
+        body: 响应体字节（204 为空字节串，输出 ``{}``）
+        decode: 解码函数；传入 ``client.decode_raw`` 可复用缓存条目已解码的对象
+
+    返回:
+        JSON 文本；响应体不是合法 JSON 时原样返回
+    """
+    projection = current_projection()
+    if not body or projection is None or not projection.applies_to(body):
+        return body.decode("utf-8") or "{}"
+    try:
+        data = decode(body)
+    except codec.JSONDecodeError:
+        return body.decode("utf-8")
+    return codec.dumps(projection.apply(data))
+
+
+def parse_fields(value: Union[None, str, List[str]]) -> Projection:
+    """
+    解析工具参数 ``fields``。
+
+    参数:
+        value: 预设名、逗号分隔的点分路径或路径数组；None 表示默认投影
+
+    返回:
+        字段投影
+
+    异常:
+        ValueError：路径为空或包含空段
+    """
+    if value is None:
+        return DEFAULT_PROJECTION
+    if isinstance(value, str):
+        value = value.strip()
+        if value in FIELD_PRESETS:
+            preset = FIELD_PRESETS[value]
+            if preset is None:
+                return Projection(None, False)
+            return Projection(tuple(tuple(p.split(".")) for p in preset), True)
+        value = value.split(",")
+
+    paths = []
+    for raw in value:
+        raw = raw.strip()
+        segments = tuple(raw.split("."))
+        if not raw or not all(segments):
+            raise ValueError(f"fields 中的字段路径不合法：'{raw}'")
+        paths.append(segments)
+    # 明确请求的大字段不剔除
+    explicit_heavy = any(".".join(p).endswith(key) for p in paths for key in HEAVY_KEYS)
+    return Projection(tuple(paths), not explicit_heavy)
+
+
+def _is_tool_result(data: Any) -> bool:
+    return isinstance(data, dict) and isinstance(data.get("success"), bool) and "message" in data
+
+
+def _copy_path(source: Dict[str, Any], path: Path, target: Dict[str, Any]) -> None:
+    """将 ``source`` 中 ``path`` 处的值复制到 ``target`` 的相同位置。"""
+    # 键本身可能含点（如注解 content.halo.run/published），优先匹配最长的键
+    for i in range(len(path), 0, -1):
+        key = ".".join(path[:i])
+        if key in source:
+            break
+    else:
+        return
+
+    value, rest = source[key], path[i:]
+    if not rest:
+        target[key] = value
+        return
+
+    existing = target.get(key)
+    if existing is value:
+        # 已由更短的路径整体选中
+        return
+    if isinstance(value, dict):
+        if not isinstance(existing, dict):
+            existing = target[key] = {}
+        _copy_path(value, rest, existing)
+    elif isinstance(value, list):
+        if not isinstance(existing, list) or len(existing) != len(value):
+            existing = target[key] = [{} if isinstance(e, dict) else e for e in value]
+        for element, out in zip(value, existing):
+            if isinstance(element, dict) and isinstance(out, dict):
+                _copy_path(element, rest, out)
+
+
+def _strip_heavy(data: Any) -> Any:
+    """
+    删除任意层级中的重复大字段。
+
+    写时复制：只复制通往大字段的容器，其余部分与 ``data`` 共享；不含大字段时返回 ``data`` 本身。
+    """
+    if isinstance(data, dict):
+        stripped = None
+        for key, value in data.items():
+            if key in HEAVY_KEYS:
+                stripped = dict(data) if stripped is None else stripped
+                del stripped[key]
+                continue
+            new = _strip_heavy(value)
+            if new is not value:
+                stripped = dict(data) if stripped is None else stripped
+                stripped[key] = new
+        return data if stripped is None else stripped
+    if isinstance(data, list):
+        stripped = None
+        for i, value in enumerate(data):
+            new = _strip_heavy(value)
+            if new is not value:
+                stripped = list(data) if stripped is None else stripped
+                stripped[i] = new
+        return data if stripped is None else stripped
+    return data
@@ -0,0 +1,161 @@
+"""MCP 工具注册表：工具名到处理器与元数据的映射"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from mcp.types import Tool
+
+from halo_mcp_server.client.halo_client import HaloClient
+from halo_mcp_server.client.timeouts import DEADLINE_ARGUMENT_SCHEMA, TIMEOUT_ARGUMENT_SCHEMA
+from halo_mcp_server.tools import (
+    attachment_tools,
+    category_tools,
+    diagnostic_tools,
+    post_tools,
+    site_tools,
+    tag_tools,
+)
+from halo_mcp_server.tools.concurrency import CONCURRENCY_CLASSES
+from halo_mcp_server.tools.output import OUTPUT_FORMAT_ARGUMENT_SCHEMA
+from halo_mcp_server.tools.projection import FIELDS_ARGUMENT_SCHEMA
+from halo_mcp_server.tools.validation import ArgumentValidator
+
+ToolHandler = Callable[[HaloClient, Dict[str, Any]], Awaitable[str]]
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """
+    已注册的工具。
+
+    属性:
+        tool: MCP 工具定义（名称、描述与参数 Schema）
+        handler: 工具处理器，返回 JSON 字符串
+        concurrency: 并发类别，``CONCURRENCY_CLASSES`` 之一
+        read_only: 是否只读取数据、不修改 Halo 中的内容
+        cacheable: 相同参数的结果是否可以复用（诊断类工具每次都应重新计算）
+        projectable: 是否返回 Halo 资源并支持 ``fields`` 字段投影
+        validator: 由 ``inputSchema`` 预编译的参数校验器
+    """
+
+    tool: Tool
+    handler: ToolHandler
+    concurrency: str
+    read_only: bool
+    cacheable: bool
+    projectable: bool
+    validator: ArgumentValidator
+
+    @property
+    def name(self) -> str:
+        return self.tool.name
+
+
+READ = ("read", True, True, True)
+READ_INFO = ("read", True, True, False)
+READ_UNCACHED = ("read", True, False, False)
+WRITE = ("write", False, False, False)
+UPLOAD = ("upload", False, False, False)
+PUBLISH = ("publish", False, False, False)
+
+# 工具名 -> (处理器, (并发类别, 只读, 可缓存, 可投影))
+_HANDLERS: Dict[str, Tuple[ToolHandler, Tuple[str, bool, bool, bool]]] = {
+    # 文章
+    "list_my_posts": (post_tools.list_my_posts_tool, READ),
+    "get_post": (post_tools.get_post_tool, READ),
+    "create_post": (post_tools.create_post_tool, WRITE),
+    "update_post": (post_tools.update_post_tool, WRITE),
+    "publish_post": (post_tools.publish_post_tool, PUBLISH),
+    "unpublish_post": (post_tools.unpublish_post_tool, PUBLISH),
+    "delete_post": (post_tools.delete_post_tool, WRITE),
+    "get_post_draft": (post_tools.get_post_draft_tool, READ),
+    "update_post_draft": (post_tools.update_post_draft_tool, WRITE),
+    # 分类
+    "list_categories": (category_tools.list_categories_tool, READ),
+    "get_category": (category_tools.get_category_tool, READ),
+    "create_category": (category_tools.create_category_tool, WRITE),
+    "update_category": (category_tools.update_category_tool, WRITE),
+    "delete_category": (category_tools.delete_category_tool, WRITE),
+    "get_category_posts": (category_tools.get_posts_under_category_tool, READ),
+    # 标签
+    "list_tags": (tag_tools.list_tags_tool, READ),
+    "get_tag": (tag_tools.get_tag_tool, READ),
+    "create_tag": (tag_tools.create_tag_tool, WRITE),
+    "update_tag": (tag_tools.update_tag_tool, WRITE),
+    "delete_tag": (tag_tools.delete_tag_tool, WRITE),
+    "get_tag_posts": (tag_tools.get_posts_under_tag_tool, READ),
+    "list_console_tags": (tag_tools.list_console_tags_tool, READ),
+    # 附件
+    "list_attachments": (attachment_tools.list_attachments_tool, READ),
+    "get_attachment": (attachment_tools.get_attachment_tool, READ),
+    "upload_attachment": (attachment_tools.upload_attachment_tool, UPLOAD),
+    "upload_attachment_from_url": (attachment_tools.upload_attachment_from_url_tool, UPLOAD),
+    "delete_attachment": (attachment_tools.delete_attachment_tool, WRITE),
+    "list_attachment_groups": (attachment_tools.list_attachment_groups_tool, READ),
+    "create_attachment_group": (attachment_tools.create_attachment_group_tool, WRITE),
+    "get_attachment_policies": (attachment_tools.list_storage_policies_tool, READ),
+    # 站点与诊断
+    "get_halo_base_url": (site_tools.get_halo_base_url_tool, READ_INFO),
+    "get_client_diagnostics": (diagnostic_tools.get_client_diagnostics_tool, READ_UNCACHED),
+    "get_client_metrics": (diagnostic_tools.get_client_metrics_tool, READ_UNCACHED),
+}
+
+ALL_TOOLS: List[Tool] = (
+    post_tools.POST_TOOLS
+    + category_tools.CATEGORY_TOOLS
+    + tag_tools.TAG_TOOLS
+    + attachment_tools.ATTACHMENT_TOOLS
+    + site_tools.SITE_TOOLS
+    + diagnostic_tools.DIAGNOSTIC_TOOLS
+)
+
+
+def build_registry(tools: List[Tool]) -> Dict[str, ToolSpec]:
+    """
+    构建工具注册表。
+
+    所有工具都会加入通用的 ``timeout`` 参数（按次覆盖 HTTP 超时）、``deadline_ms`` 参数
+    （整次调用的截止时间）与 ``output_format`` 参数（按次选择结果格式），返回 Halo 资源的
+    读取类工具另加 ``fields`` 参数（字段投影），并将最终的 ``inputSchema`` 编译为参数校验器。
+
+    参数:
+        tools: MCP 工具定义
+
+    返回:
+        按工具名索引的注册表，顺序与 ``tools`` 一致
+
+    异常:
+        ValueError：工具缺少处理器、处理器没有对应工具、工具名重复或并发类别无效
+    """
+    registry: Dict[str, ToolSpec] = {}
+    for tool in tools:
+        if tool.name in registry:
+            raise ValueError(f"工具重复注册：{tool.name}")
+        if tool.name not in _HANDLERS:
+            raise ValueError(f"工具缺少处理器：{tool.name}")
+        handler, (concurrency, read_only, cacheable, projectable) = _HANDLERS[tool.name]
+        if concurrency not in CONCURRENCY_CLASSES:
+            raise ValueError(f"工具并发类别无效：{tool.name}（{concurrency}）")
+        properties = tool.inputSchema.setdefault("properties", {})
+        properties.setdefault("timeout", TIMEOUT_ARGUMENT_SCHEMA)
+        properties.setdefault("deadline_ms", DEADLINE_ARGUMENT_SCHEMA)
+        properties.setdefault("output_format", OUTPUT_FORMAT_ARGUMENT_SCHEMA)
+        if projectable:
+            properties.setdefault("fields", FIELDS_ARGUMENT_SCHEMA)
+        registry[tool.name] = ToolSpec(
+            tool,
+            handler,
+            concurrency,
+            read_only,
+            cacheable,
+            projectable,
+            ArgumentValidator(tool.inputSchema),
+        )
+
+    orphans = set(_HANDLERS) - set(registry)
+    if orphans:
+        raise ValueError(f"处理器没有对应的工具定义：{', '.join(sorted(orphans))}")
+    return registry
+
+
+TOOL_REGISTRY: Dict[str, ToolSpec] = build_registry(ALL_TOOLS)
@@ -2,8 +2,7 @@
 
 """Halo MCP 标签管理工具"""
 
-import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from loguru import logger
 from mcp.types import Tool
@@ -11,8 +10,8 @@ from mcp.types import Tool
 from halo_mcp_server.client.halo_client import HaloClient
 from halo_mcp_server.exceptions import HaloMCPError
 from halo_mcp_server.models.common import ToolResult
+from halo_mcp_server.tools.projection import render_body
 import re
-from slugify import slugify
 
 
 async def list_tags(
@@ -21,7 +20,9 @@ async def list_tags(
     keyword: Optional[str] = None,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     列出所有标签。
 
@@ -30,6 +31,7 @@ async def list_tags(
         size: 每页大小，默认为 100
         keyword: 搜索关键词
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         标签列表数据
@@ -48,19 +50,23 @@ async def list_tags(
             params["sort"] = sort
 
         # 使用 Extension API 获取完整的标签信息
-        response = await client.get("/apis/content.halo.run/v1alpha1/tags", params=params)
+        fetch = client.get_raw if raw else client.get
+        response = await fetch("/apis/content.halo.run/v1alpha1/tags", params=params)
         return response
 
     except Exception as e:
         raise HaloMCPError(f"获取标签列表失败：{e}")
 
 
-async def get_tag(name: str, client: Optional[HaloClient] = None) -> Dict[str, Any]:
+async def get_tag(
+    name: str, client: Optional[HaloClient] = None, *, raw: bool = False
+) -> Union[Dict[str, Any], bytes]:
     """
     获取指定标签的详细信息。
 
     Args:
         name: 标签名称/标识符
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         标签详细信息
@@ -72,7 +78,8 @@ async def get_tag(name: str, client: Optional[HaloClient] = None) -> Dict[str, A
         client = client or HaloClient()
         await client.ensure_authenticated()
 
-        response = await client.get(f"/apis/content.halo.run/v1alpha1/tags/{name}")
+        fetch = client.get_raw if raw else client.get
+        response = await fetch(f"/apis/content.halo.run/v1alpha1/tags/{name}")
         return response
 
     except Exception as e:
@@ -161,7 +168,9 @@ async def update_tag(
         await client.ensure_authenticated()
 
         # 先获取现有标签信息
-        existing_tag = await client.get(f"/apis/content.halo.run/v1alpha1/tags/{name}")
+        existing_tag = await client.get(
+            f"/apis/content.halo.run/v1alpha1/tags/{name}", use_cache=False
+        )
 
         # 更新指定字段
         if display_name is not None:
@@ -213,7 +222,9 @@ async def get_tag_posts(
     size: int = 20,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     获取指定标签下的文章列表。
 
@@ -222,6 +233,7 @@ async def get_tag_posts(
         page: 页码，默认为 0
         size: 每页大小，默认为 20
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         标签下的文章列表
@@ -238,7 +250,8 @@ async def get_tag_posts(
             params["sort"] = sort
 
         # 使用 Public API 获取标签下的文章
-        response = await client.get(
+        fetch = client.get_raw if raw else client.get
+        response = await fetch(
             f"/apis/api.content.halo.run/v1alpha1/tags/{name}/posts",
             params=params,
         )
@@ -254,7 +267,9 @@ async def list_console_tags(
     keyword: Optional[str] = None,
     sort: Optional[List[str]] = None,
     client: Optional[HaloClient] = None,
-) -> Dict[str, Any]:
+    *,
+    raw: bool = False,
+) -> Union[Dict[str, Any], bytes]:
     """
     列出控制台标签（用于后台管理）。
 
@@ -263,6 +278,7 @@ async def list_console_tags(
         size: 每页大小，默认为 100
         keyword: 搜索关键词
         sort: 排序条件，格式: ["property,(asc|desc)"]
+        raw: 为 True 时返回未解析的原始响应体字节
 
     Returns:
         控制台标签列表数据
@@ -281,7 +297,8 @@ async def list_console_tags(
             params["sort"] = sort
 
         # 使用 Console API 获取标签信息
-        response = await client.get("/apis/api.console.halo.run/v1alpha1/tags", params=params)
+        fetch = client.get_raw if raw else client.get
+        response = await fetch("/apis/api.console.halo.run/v1alpha1/tags", params=params)
         return response
 
     except Exception as e:
@@ -484,8 +501,10 @@ async def list_tags_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
         logger.debug(f"正在列出标签：page={page}, size={size}, keyword={keyword}")
 
-        result = await list_tags(page=page, size=size, keyword=keyword, sort=sort, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await list_tags(
+            page=page, size=size, keyword=keyword, sort=sort, raw=True, client=client
+        )
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"列出标签出错：{e}", exc_info=True)
@@ -512,8 +531,8 @@ async def get_tag_tool(client: HaloClient, args: Dict[str, Any]) -> str:
 
         logger.debug(f"正在获取标签：{name}")
 
-        result = await get_tag(name, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await get_tag(name, raw=True, client=client)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"获取标签出错：{e}", exc_info=True)
@@ -542,6 +561,8 @@ async def create_tag_tool(client: HaloClient, args: Dict[str, Any]) -> str:
             error_result = ToolResult.error_result("错误：显示名称过长（最大 100 字符）")
             return error_result.model_dump_json()
 
+        from slugify import slugify
+
         slug = args.get("slug") or slugify(display_name)
         color = args.get("color")
         cover = args.get("cover")
@@ -678,8 +699,10 @@ async def get_posts_under_tag_tool(client: HaloClient, args: Dict[str, Any]) ->
 
         logger.debug(f"正在获取标签下的文章：{name}, page={page}, size={size}")
 
-        result = await get_tag_posts(name=name, page=page, size=size, sort=sort, client=client)
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        result = await get_tag_posts(
+            name=name, page=page, size=size, sort=sort, raw=True, client=client
+        )
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"获取标签下文章出错：{e}", exc_info=True)
@@ -707,9 +730,9 @@ async def list_console_tags_tool(client: HaloClient, args: Dict[str, Any]) -> st
         logger.debug(f"正在列出控制台标签：page={page}, size={size}, keyword={keyword}")
 
         result = await list_console_tags(
-            page=page, size=size, keyword=keyword, sort=sort, client=client
+            page=page, size=size, keyword=keyword, sort=sort, raw=True, client=client
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render_body(result)
 
     except Exception as e:
         logger.error(f"列出控制台标签出错：{e}", exc_info=True)
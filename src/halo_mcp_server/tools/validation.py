@@ -0,0 +1,67 @@
+"""工具参数的 JSON Schema 校验"""
+
+from typing import Any, Dict, List
+
+from jsonschema.validators import validator_for
+
+# 单次校验最多返回的错误数
+MAX_ERRORS = 10
+
+
+def _format_path(path: Any) -> str:
+    """将 jsonschema 的错误路径格式化为 ``tags[0]``、``spec.title`` 形式。"""
+    result = ""
+    for part in path:
+        if isinstance(part, int):
+            result += f"[{part}]"
+        else:
+            result += f".{part}" if result else str(part)
+    return result or "(root)"
+
+
+class ArgumentValidator:
+    """
+    预编译的工具参数校验器。
+
+    Schema 只在构造时编译一次，每次调用只做校验，
+    参数合法时走 ``is_valid`` 快速路径，不收集错误详情。
+    """
+
+    def __init__(self, schema: Dict[str, Any], check_schema: bool = False):
+        """
+        编译工具的 ``inputSchema``。
+
+        对照元 Schema 检查 Schema 本身的开销远大于编译（全部工具约 200 ms），
+        工具 Schema 是静态定义，因此默认只在单元测试中检查。
+
+        参数:
+            schema: JSON Schema
+            check_schema: 是否先检查 Schema 本身是否合法
+
+        异常:
+            jsonschema.SchemaError：``check_schema`` 为 True 且 Schema 不合法
+        """
+        cls = validator_for(schema)
+        if check_schema:
+            cls.check_schema(schema)
+        self._validator = cls(schema)
+
+    def errors(self, arguments: Dict[str, Any]) -> List[Dict[str, str]]:
+        """
+        校验参数。
+
+        参数:
+            arguments: 工具参数
+
+        返回:
+            错误列表（``path`` 与 ``message``），参数合法时为空
+        """
+        if self._validator.is_valid(arguments):
+            return []
+        errors = sorted(
+            self._validator.iter_errors(arguments), key=lambda e: _format_path(e.absolute_path)
+        )
+        return [
+            {"path": _format_path(error.absolute_path), "message": error.message}
+            for error in errors[:MAX_ERRORS]
+        ]
@@ -1,5 +1,15 @@
 """Utility modules."""
 
-from halo_mcp_server.utils.logger import get_logger, setup_logger
+from typing import Any
 
 __all__ = ["get_logger", "setup_logger"]
+
+
+def __getattr__(name: str) -> Any:
+    # The logger module loads the settings; only import it on demand so that
+    # light utilities such as utils.codec stay cheap to import.
+    if name in __all__:
+        from halo_mcp_server.utils import logger
+
+        return getattr(logger, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
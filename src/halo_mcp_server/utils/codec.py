@@ -0,0 +1,71 @@
+"""JSON codec with an optional orjson fast path.
+
+orjson is used when installed (``pip install "halo-mcp-server[fast]"``); otherwise the
+standard library ``json`` module is used. Output is always UTF-8 without ASCII escaping,
+matching ``json.dumps(..., ensure_ascii=False)``.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Decode JSON from bytes or str.
+
+    Raises:
+        JSONDecodeError: Invalid JSON (orjson's error is a subclass of it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Encode an object to UTF-8 JSON bytes.
+
+    Args:
+        obj: Object to encode
+        pretty: Indent with two spaces
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_PRETTY if pretty else _ORJSON_COMPACT)
+        except TypeError:
+            # Integers beyond 64 bits and other edge cases the stdlib still handles
+            pass
+    return _std_dumps(obj, pretty).encode("utf-8")
+
+
+def dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Encode an object to a JSON string.
+
+    Args:
+        obj: Object to encode
+        pretty: Indent with two spaces
+    """
+    if orjson is not None:
+        return dumps_bytes(obj, pretty).decode("utf-8")
+    return _std_dumps(obj, pretty)
+
+
+def _std_dumps(obj: Any, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+if orjson is not None:
+    _ORJSON_COMPACT = orjson.OPT_NON_STR_KEYS
+    _ORJSON_PRETTY = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
@@ -0,0 +1,179 @@
+"""Incremental parser that yields the elements of a JSON list response.
+
+Halo list endpoints return ``{"page": 0, "size": 20, "total": 3, "items": [...], ...}``.
+:class:`ItemStreamParser` is fed the body chunk by chunk and returns every element of
+the ``items`` array as soon as it is complete, so only one element is buffered at a
+time. Scalar top-level fields (``total``, ``hasNext``...) are collected in ``meta``.
+A top-level array is treated as the item list itself.
+
+The parser only splits the document on structural characters; each element is decoded
+with :func:`halo_mcp_server.utils.codec.loads`. Multi-byte UTF-8 sequences never
+contain ASCII bytes, so scanning raw bytes is safe.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from halo_mcp_server.utils import codec
+
+_TOKEN_RE = re.compile(rb'["{}\[\],:]')
+_STRING_RE = re.compile(rb'["\\]')
+
+# Top-level keys and scalar values longer than this are not worth keeping in ``meta``
+_MAX_META_BYTES = 4096
+
+
+class ItemStreamParser:
+    """Split a streamed JSON list response into its items."""
+
+    def __init__(self, key: str = "items"):
+        """
+        Args:
+            key: Top-level field holding the array to stream
+        """
+        self.key = key
+        self.meta: Dict[str, Any] = {}
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._current_key: Optional[str] = None
+        self._items_depth: Optional[int] = None
+        self._capture: Optional[bytearray] = None
+        self._capture_kind: Optional[str] = None
+        self._capture_start = 0
+        self._consumed = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Consume the next chunk of the body.
+
+        Args:
+            chunk: Raw response bytes
+
+        Returns:
+            Items completed within this chunk, in document order
+
+        Raises:
+            JSONDecodeError: An item or meta value is not valid JSON
+        """
+        items: List[Any] = []
+        self._capture_start = 0
+        i = 0
+        end = len(chunk)
+
+        while i < end:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                match = _STRING_RE.search(chunk, i)
+                if match is None:
+                    break
+                i = match.end()
+                if chunk[match.start()] == 0x5C:  # backslash escapes the next byte
+                    self._escape = True
+                    continue
+                self._in_string = False
+                if self._capture_kind == "key":
+                    self._current_key = self._finish_capture(chunk, match.start(), quoted=True)
+                continue
+
+            match = _TOKEN_RE.search(chunk, i)
+            if match is None:
+                break
+            pos = match.start()
+            i = match.end()
+            self._handle_token(chunk, pos, chunk[pos : pos + 1], items)
+
+        if self._capture is not None:
+            self._capture += chunk[self._capture_start :]
+            if self._capture_kind != "item" and len(self._capture) > _MAX_META_BYTES:
+                self._capture = None
+                self._capture_kind = None
+        self._consumed += end
+        return items
+
+    def close(self) -> None:
+        """
+        Check that the whole document was consumed.
+
+        Raises:
+            JSONDecodeError: The stream ended inside the document
+        """
+        if self._depth or self._in_string:
+            raise codec.JSONDecodeError("Unexpected end of JSON stream", "", self._consumed)
+
+    def _handle_token(self, chunk: bytes, pos: int, token: bytes, items: List[Any]) -> None:
+        depth = self._depth
+
+        if token == b'"':
+            self._in_string = True
+            if depth == 1 and self._expect_key:
+                self._current_key = None
+                self._begin_capture("key", pos + 1)
+            return
+
+        if token in (b"{", b"["):
+            if self._capture_kind == "meta" and depth == 1:
+                # Nested values are not kept in meta
+                self._capture = None
+                self._capture_kind = None
+            if token == b"[" and self._items_depth is None:
+                if depth == 0 or (depth == 1 and self._current_key == self.key):
+                    self._items_depth = depth + 1
+                    self._begin_capture("item", pos + 1)
+            self._depth += 1
+            if token == b"{" and self._depth == 1:
+                self._expect_key = True
+            return
+
+        if token in (b"}", b"]"):
+            if depth == self._items_depth and token == b"]":
+                self._emit_item(chunk, pos, items)
+                self._items_depth = -1
+            elif depth == 1 and self._capture_kind == "meta":
+                self._store_meta(chunk, pos)
+            self._depth -= 1
+            return
+
+        if token == b",":
+            if depth == self._items_depth:
+                self._emit_item(chunk, pos, items)
+                self._begin_capture("item", pos + 1)
+            elif depth == 1:
+                if self._capture_kind == "meta":
+                    self._store_meta(chunk, pos)
+                self._expect_key = True
+            return
+
+        # ":"
+        if depth == 1 and self._items_depth != 1:
+            self._expect_key = False
+            self._begin_capture("meta", pos + 1)
+
+    def _begin_capture(self, kind: str, start: int) -> None:
+        self._capture = bytearray()
+        self._capture_kind = kind
+        self._capture_start = start
+
+    def _finish_capture(self, chunk: bytes, end: int, quoted: bool = False) -> Any:
+        data = bytes(self._capture or b"") + chunk[self._capture_start : end]
+        self._capture = None
+        self._capture_kind = None
+        if quoted:
+            return codec.loads(b'"' + data + b'"')
+        return data
+
+    def _emit_item(self, chunk: bytes, end: int, items: List[Any]) -> None:
+        if self._capture_kind != "item":
+            return
+        data = self._finish_capture(chunk, end)
+        if data.strip():
+            items.append(codec.loads(data))
+
+    def _store_meta(self, chunk: bytes, end: int) -> None:
+        data = self._finish_capture(chunk, end)
+        if self._current_key is not None and self._current_key != self.key:
+            self.meta[self._current_key] = codec.loads(data)
@@ -8,19 +8,25 @@ from loguru import logger
 
 from halo_mcp_server.config import settings
 
-# Remove default handler
-logger.remove()
+_configured = False
 
 
 def setup_logger(log_level: Optional[str] = None) -> None:
     """
     Setup logger with configured level and format.
 
+    Replaces loguru's default handler. The log files are only opened when the
+    first record is written to them.
+
     Args:
         log_level: Override log level from settings
     """
+    global _configured
+    _configured = True
     level = log_level or settings.mcp_log_level
 
+    logger.remove()
+
     # Console handler with color
     logger.add(
         sys.stderr,
@@ -46,6 +52,7 @@ def setup_logger(log_level: Optional[str] = None) -> None:
         retention="7 days",
         compression="zip",
         encoding="utf-8",
+        delay=True,
     )
 
     logger.add(
@@ -56,6 +63,7 @@ def setup_logger(log_level: Optional[str] = None) -> None:
         retention="30 days",
         compression="zip",
         encoding="utf-8",
+        delay=True,
         backtrace=True,
         diagnose=True,
     )
@@ -74,8 +82,6 @@ def get_logger(name: str):
     Returns:
         Logger instance
     """
+    if not _configured:
+        setup_logger()
     return logger.bind(name=name)
-
-
-# Initialize logger on module import
-setup_logger()
@@ -0,0 +1,93 @@
+"""JSON 编解码基准测试
+
+对比标准库 json 与 orjson（经 halo_mcp_server.utils.codec）在 500 篇文章列表上的
+解码 + 重新编码耗时，模拟 list_my_posts 的 "response.json() → json.dumps(indent=2)" 流程。
+
+使用方法：
+    pip install "halo-mcp-server[fast]"
+    python bench_codec.py [--items 500] [--rounds 50]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from halo_mcp_server.utils import codec
+
+
+def make_post_list(count: int) -> bytes:
+    """构造与 uc posts 列表接口结构一致的响应体。"""
+    items = []
+    for i in range(count):
+        items.append(
+            {
+                "post": {
+                    "metadata": {
+                        "name": f"post-{i:05d}",
+                        "labels": {
+                            "content.halo.run/published": "true",
+                            "content.halo.run/deleted": "false",
+                        },
+                        "annotations": {},
+                        "creationTimestamp": "2025-10-29T08:00:00Z",
+                        "version": i,
+                    },
+                    "spec": {
+                        "title": f"第 {i} 篇文章：Halo MCP 性能优化实践",
+                        "slug": f"post-{i}",
+                        "excerpt": {"autoGenerate": True, "raw": "这是一段文章摘要。" * 10},
+                        "cover": "https://example.com/cover.png",
+                        "visible": "PUBLIC",
+                        "pinned": False,
+                        "allowComment": True,
+                        "categories": ["category-a", "category-b"],
+                        "tags": ["tag-a", "tag-b", "tag-c"],
+                    },
+                    "status": {"phase": "PUBLISHED", "permalink": f"/archives/post-{i}"},
+                },
+                "categories": [
+                    {"metadata": {"name": "category-a"}, "spec": {"displayName": "技术"}}
+                ],
+                "tags": [{"metadata": {"name": "tag-a"}, "spec": {"displayName": "Python"}}],
+                "owner": {"name": "admin", "displayName": "管理员"},
+                "stats": {"visit": i * 3, "upvote": i, "comment": i % 7},
+            }
+        )
+    body = {"page": 1, "size": count, "total": count, "items": items}
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def stdlib_round_trip(body: bytes) -> str:
+    return json.dumps(json.loads(body), ensure_ascii=False, indent=2)
+
+
+def codec_round_trip(body: bytes) -> str:
+    return codec.dumps(codec.loads(body), pretty=True)
+
+
+def main(count: int, rounds: int) -> None:
+    body = make_post_list(count)
+    assert json.loads(stdlib_round_trip(body)) == json.loads(codec_round_trip(body))
+
+    std = min(timeit.repeat(lambda: stdlib_round_trip(body), number=rounds, repeat=3)) / rounds
+    fast = min(timeit.repeat(lambda: codec_round_trip(body), number=rounds, repeat=3)) / rounds
+
+    print(f"\n响应体：{count} 篇文章，{len(body) / 1024:.0f} KB；codec 后端：{codec.BACKEND}")
+    print(f"{'实现':<12}{'每次耗时(ms)':>14}")
+    print(f"{'json':<12}{std * 1000:>14.2f}")
+    print(f"{'codec':<12}{fast * 1000:>14.2f}")
+    print(f"加速比：{std / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500, help="列表中的文章数")
+    parser.add_argument("--rounds", type=int, default=50, help="每轮重复次数")
+    args = parser.parse_args()
+    main(args.items, args.rounds)
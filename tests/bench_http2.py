@@ -0,0 +1,148 @@
+"""HTTP/1.1 与 HTTP/2 传输基准测试
+
+在本地启动一个模拟 Halo 的 ASGI 服务（hypercorn，支持 h2c），分别以 HTTP/1.1
+连接池与 HTTP/2 多路复用模式，通过 BaseHTTPClient 发起 1 / 10 / 100 路并发请求，
+对比吞吐量与 p99 延迟。
+
+使用方法：
+    pip install "halo-mcp-server[http2]" hypercorn
+    python bench_http2.py [--requests 500] [--delay-ms 5]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from loguru import logger
+
+from halo_mcp_server.client.base import BaseHTTPClient
+from halo_mcp_server.config import settings
+
+CONCURRENCY_LEVELS = (1, 10, 100)
+
+
+def make_app(delay: float):
+    """构造返回固定 JSON 的 ASGI 应用，模拟 Halo 的处理耗时。"""
+    body = json.dumps({"items": [{"metadata": {"name": f"tag-{i}"}} for i in range(20)]}).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        await asyncio.sleep(delay)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_level(client: BaseHTTPClient, concurrency: int, total: int) -> dict:
+    """以指定并发发起 total 个请求，返回吞吐量与延迟分位数。"""
+    latencies = []
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker():
+        while not queue.empty():
+            i = queue.get_nowait()
+            start = time.perf_counter()
+            await client.get("/apis/content.halo.run/v1alpha1/tags", params={"i": i})
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "throughput_rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+async def bench_mode(base_url: str, http2: bool, total: int) -> list:
+    settings.enable_http2 = http2
+    settings.http2_prior_knowledge = http2
+    client = BaseHTTPClient(base_url)
+    await client.connect()
+    try:
+        # 预热连接
+        await run_level(client, 10, 20)
+        return [await run_level(client, c, total) for c in CONCURRENCY_LEVELS]
+    finally:
+        await client.close()
+
+
+async def main(total: int, delay_ms: float) -> None:
+    try:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+    except ImportError:
+        logger.error("需要安装 hypercorn：pip install hypercorn")
+        sys.exit(1)
+
+    # 只测量传输层，关闭缓存、请求合并与熔断
+    settings.enable_cache = False
+    settings.enable_request_coalescing = False
+    settings.enable_circuit_breaker = False
+
+    port = free_port()
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.loglevel = "WARNING"
+    shutdown = asyncio.Event()
+    server = asyncio.create_task(
+        serve(make_app(delay_ms / 1000), config, shutdown_trigger=shutdown.wait)
+    )
+    await asyncio.sleep(0.5)
+
+    base_url = f"http://127.0.0.1:{port}"
+    results = {}
+    try:
+        results["HTTP/1.1"] = await bench_mode(base_url, http2=False, total=total)
+        results["HTTP/2"] = await bench_mode(base_url, http2=True, total=total)
+    finally:
+        shutdown.set()
+        await server
+
+    print(
+        f"\n请求数/并发级别：{total}，模拟服务端耗时：{delay_ms} ms，连接池：{settings.http_pool_size}"
+    )
+    print(f"{'模式':<10}{'并发':>6}{'吞吐(req/s)':>14}{'p50(ms)':>10}{'p99(ms)':>10}")
+    for mode, rows in results.items():
+        for row in rows:
+            print(
+                f"{mode:<10}{row['concurrency']:>6}{row['throughput_rps']:>14}"
+                f"{row['p50_ms']:>10}{row['p99_ms']:>10}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="每个并发级别的请求数")
+    parser.add_argument("--delay-ms", type=float, default=5.0, help="模拟服务端处理耗时（毫秒）")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.delay_ms))
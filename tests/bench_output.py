@@ -0,0 +1,177 @@
+"""工具输出格式基准测试：综合测试套件中各工具结果在 compact 与 pretty 下的字节数对比
+
+运行 ``run_comprehensive_test.py`` 的全部工具调用，记录每个处理器返回的结果，
+再分别按 ``compact`` / ``pretty`` 排版（与 ``call_tool`` 一致）统计 UTF-8 字节数。
+这些字节最终会成为 LLM 的输入 token 与 stdio 传输量。
+
+数据来源（三选一）：
+- ``--replay PATH``：回放 ``run_comprehensive_test.py --record`` 录制的 cassette
+- ``--synthetic``：本地模拟 Halo，返回结构与 Halo 扩展资源一致的合成数据
+- 默认：连接 ``HALO_BASE_URL`` 指向的真实 Halo（会创建并删除测试数据）
+
+使用方法：
+    python bench_output.py --synthetic [--items 20]
+    python bench_output.py --replay cassettes/full.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx
+from loguru import logger
+
+from halo_mcp_server.client.halo_client import HaloClient
+from halo_mcp_server.config import settings
+from halo_mcp_server.tools.output import OUTPUT_FORMATS, format_tool_output
+from halo_mcp_server.tools.registry import TOOL_REGISTRY
+from run_comprehensive_test import HaloMCPComprehensiveTest
+
+# 结尾为集合名的 GET 请求返回列表
+COLLECTIONS = ("posts", "categories", "tags", "attachments", "groups", "policies", "snapshots")
+
+
+def make_resource(name: str, kind: str) -> dict:
+    """构造与 Halo 扩展资源结构一致的对象。"""
+    return {
+        "apiVersion": "content.halo.run/v1alpha1",
+        "kind": kind,
+        "metadata": {
+            "name": name,
+            "labels": {"content.halo.run/published": "true"},
+            "annotations": {"content.halo.run/content-json": "{}"},
+            "creationTimestamp": "2025-10-29T08:00:00Z",
+            "version": 3,
+        },
+        "spec": {
+            "displayName": f"{kind} {name}：Halo MCP 性能优化实践",
+            "title": f"{kind} {name}：Halo MCP 性能优化实践",
+            "slug": name,
+            "description": "这是一段用于基准测试的描述文字。" * 3,
+            "excerpt": {"autoGenerate": True, "raw": "这是一段文章摘要。" * 5},
+            "cover": "https://example.com/cover.png",
+            "priority": 0,
+            "categories": ["category-a", "category-b"],
+            "tags": ["tag-a", "tag-b"],
+            "visible": "PUBLIC",
+        },
+        "status": {"phase": "PUBLISHED", "permalink": f"/archives/{name}", "postCount": 3},
+    }
+
+
+def synthetic_handler(items: int):
+    """模拟 Halo：列表接口返回 ``items`` 条资源，写操作回显请求体。"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.rstrip("/")
+        last = path.rsplit("/", 1)[-1]
+        if path.endswith("/auth/login"):
+            return httpx.Response(200, json={"access_token": "synthetic"})
+        if request.method == "DELETE":
+            return httpx.Response(200, json=make_resource(last, "Deleted"))
+        if request.method in ("POST", "PUT"):
+            try:
+                body = json.loads(request.content or b"{}")
+            except ValueError:
+                body = {}
+            resource = make_resource(f"{last}-1", "Resource")
+            if isinstance(body, dict):
+                resource.update({k: v for k, v in body.items() if k in ("spec", "metadata")})
+                resource["metadata"].setdefault("name", f"{last}-1")
+            return httpx.Response(200, json=resource)
+        if last in COLLECTIONS or request.url.params.get("page") is not None:
+            kind = last.capitalize()
+            return httpx.Response(
+                200,
+                json={
+                    "page": 1,
+                    "size": items,
+                    "total": items,
+                    "items": [make_resource(f"{last}-{i}", kind) for i in range(items)],
+                    "first": True,
+                    "last": True,
+                    "hasNext": False,
+                    "hasPrevious": False,
+                },
+            )
+        return httpx.Response(200, json=make_resource(last, "Resource"))
+
+    return handler
+
+
+def record_outputs() -> dict:
+    """包装所有工具处理器，记录其返回的结果文本。"""
+    outputs = defaultdict(list)
+
+    for spec in TOOL_REGISTRY.values():
+        module = sys.modules[spec.handler.__module__]
+
+        def wrapper(client, args, _handler=spec.handler, _name=spec.name):
+            async def run():
+                result = await _handler(client, args)
+                outputs[_name].append(result)
+                return result
+
+            return run()
+
+        setattr(module, spec.handler.__name__, wrapper)
+    return outputs
+
+
+async def main(items: int, synthetic: bool) -> None:
+    logger.remove()
+    if synthetic:
+        original_connect = HaloClient.connect
+
+        async def connect(self) -> None:
+            await original_connect(self)
+            self._client._transport = httpx.MockTransport(synthetic_handler(items))
+
+        HaloClient.connect = connect
+
+    outputs = record_outputs()
+    await HaloMCPComprehensiveTest().run_all_tests()
+
+    print(f"\n{'工具':<28}{'调用':>6}" + "".join(f"{f + '(B)':>14}" for f in OUTPUT_FORMATS))
+    totals = dict.fromkeys(OUTPUT_FORMATS, 0)
+    for name, results in sorted(outputs.items()):
+        sizes = {
+            f: sum(len(format_tool_output(r, f).encode("utf-8")) for r in results)
+            for f in OUTPUT_FORMATS
+        }
+        for f in OUTPUT_FORMATS:
+            totals[f] += sizes[f]
+        print(f"{name:<28}{len(results):>6}" + "".join(f"{sizes[f]:>14}" for f in OUTPUT_FORMATS))
+
+    calls = sum(len(r) for r in outputs.values())
+    print(f"{'合计':<28}{calls:>6}" + "".join(f"{totals[f]:>14}" for f in OUTPUT_FORMATS))
+    if totals["pretty"]:
+        saved = 1 - totals["compact"] / totals["pretty"]
+        print(f"\ncompact 比 pretty 减少 {saved:.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--replay", metavar="PATH", help="从 cassette 文件离线回放")
+    source.add_argument("--synthetic", action="store_true", help="使用本地合成数据")
+    parser.add_argument("--items", type=int, default=20, help="合成数据中列表接口返回的条数")
+    args = parser.parse_args()
+
+    settings.enable_warmup = False
+    if args.replay:
+        settings.http_cassette_mode = "replay"
+        settings.http_cassette_path = args.replay
+        settings.http_cassette_latency_ms = 0
+    if args.replay or args.synthetic:
+        # 令牌不会发往真实服务端
+        settings.halo_token = settings.halo_token or "bench"
+    asyncio.run(main(args.items, args.synthetic))
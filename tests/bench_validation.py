@@ -0,0 +1,68 @@
+"""工具参数校验基准测试：预编译校验器与逐次 ``jsonschema.validate`` 的单次调用开销对比
+
+``jsonschema.validate`` 每次调用都会检查 Schema 并构造校验器（MCP SDK 默认的做法）；
+注册表在启动时为每个工具编译一次 ``ArgumentValidator``，调用时只做校验。
+
+使用方法：
+    python bench_validation.py [--iterations 20000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+import jsonschema
+
+from halo_mcp_server.tools.registry import TOOL_REGISTRY
+
+# 典型工具调用参数
+CASES = {
+    "get_post": {"name": "post-1"},
+    "list_my_posts": {"page": 0, "size": 20, "publish_phase": "PUBLISHED", "keyword": "halo"},
+    "create_post": {
+        "title": "标题",
+        "content": "<p>" + "正文" * 2000 + "</p>",
+        "categories": ["tech", "python"],
+        "tags": ["mcp", "halo", "bench"],
+        "publish": False,
+        "timeout": {"read": 30},
+    },
+    "create_post（参数错误）": {"title": 1, "tags": ["a", 2]},
+}
+
+
+def per_call_us(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def sdk_validate(schema, arguments) -> None:
+    try:
+        jsonschema.validate(instance=arguments, schema=schema)
+    except jsonschema.ValidationError:
+        pass
+
+
+def main(iterations: int) -> None:
+    print(f"\n每个用例 {iterations} 次")
+    print(f"{'用例':<26}{'预编译(µs)':>12}{'逐次校验(µs)':>14}{'加速':>8}")
+    for case, arguments in CASES.items():
+        spec = TOOL_REGISTRY[case.split("（")[0]]
+        schema = spec.tool.inputSchema
+        compiled = per_call_us(lambda: spec.validator.errors(arguments), iterations)
+        uncompiled = per_call_us(lambda: sdk_validate(schema, arguments), iterations // 10)
+        print(f"{case:<26}{compiled:>12.1f}{uncompiled:>14.1f}{uncompiled / compiled:>7.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000, help="每个用例的校验次数")
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,171 @@
+"""启动预热基准测试：冷启动与预热后首次工具调用耗时对比
+
+在本地启动一个模拟 Halo 的 ASGI 服务（hypercorn）：
+- 每个新连接的首个请求额外等待 ``--connect-ms``，模拟 DNS + TCP/TLS 握手开销
+- 登录接口额外等待 ``--login-ms``，模拟密码校验
+- 其余接口等待 ``--delay-ms``
+
+冷启动：首次工具调用依次承担建连、登录与查询；
+预热：先运行 ``warm_up_halo_client``（对应 stdio 握手期间的后台预热），再计时首次调用。
+
+使用方法：
+    pip install hypercorn
+    python bench_warmup.py [--rounds 5] [--connect-ms 50] [--login-ms 150] [--delay-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from loguru import logger
+
+from halo_mcp_server import server
+from halo_mcp_server.config import settings
+from halo_mcp_server.tools.category_tools import get_category_tool, list_categories_tool
+
+# 首次调用的工具：list_categories 会被预热预取，get_category 只受益于连接与登录
+FIRST_CALLS = {
+    "list_categories": (list_categories_tool, {}),
+    "get_category": (get_category_tool, {"name": "category-1"}),
+}
+
+
+def make_app(connect_delay: float, login_delay: float, delay: float):
+    """构造模拟 Halo 的 ASGI 应用。"""
+    seen_connections = set()
+    categories = json.dumps(
+        {"items": [{"metadata": {"name": f"category-{i}"}} for i in range(20)]}
+    ).encode()
+
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+
+        # 以客户端端口区分连接，新连接的首个请求模拟握手耗时
+        connection = tuple(scope["client"])
+        if connection not in seen_connections:
+            seen_connections.add(connection)
+            await asyncio.sleep(connect_delay)
+
+        path = scope["path"]
+        if path.endswith("/auth/login"):
+            await asyncio.sleep(login_delay)
+            body = b'{"access_token": "bench-token"}'
+        elif path.startswith("/actuator"):
+            body = b'{"status": "UP"}'
+        else:
+            await asyncio.sleep(delay)
+            body = categories
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def reset_client() -> None:
+    if server.halo_client is not None:
+        await server.halo_client.close()
+    server.halo_client = None
+    server._client_task = None
+
+
+async def first_call(tool: str) -> float:
+    """计时一次完整的首次工具调用（含客户端初始化）。"""
+    handler, args = FIRST_CALLS[tool]
+    start = time.perf_counter()
+    client = await server.get_halo_client()
+    await handler(client, args)
+    return time.perf_counter() - start
+
+
+async def run_round(tool: str, warm: bool) -> dict:
+    await reset_client()
+    warmup_ms = None
+    if warm:
+        start = time.perf_counter()
+        await server.warm_up_halo_client()
+        warmup_ms = (time.perf_counter() - start) * 1000
+    first_ms = await first_call(tool) * 1000
+    await reset_client()
+    return {"first_ms": first_ms, "warmup_ms": warmup_ms}
+
+
+async def main(rounds: int, connect_ms: float, login_ms: float, delay_ms: float) -> None:
+    try:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+    except ImportError:
+        logger.error("需要安装 hypercorn：pip install hypercorn")
+        sys.exit(1)
+
+    logger.remove()
+
+    port = free_port()
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.loglevel = "WARNING"
+    shutdown = asyncio.Event()
+    app = make_app(connect_ms / 1000, login_ms / 1000, delay_ms / 1000)
+    server_task = asyncio.create_task(serve(app, config, shutdown_trigger=shutdown.wait))
+    await asyncio.sleep(0.5)
+
+    settings.halo_base_url = f"http://127.0.0.1:{port}"
+    settings.halo_token = None
+    settings.halo_username = "bench"
+    settings.halo_password = "bench"
+
+    results = {(tool, mode): [] for tool in FIRST_CALLS for mode in ("冷启动", "预热")}
+    try:
+        for _ in range(rounds):
+            for tool in FIRST_CALLS:
+                results[(tool, "冷启动")].append(await run_round(tool, warm=False))
+                results[(tool, "预热")].append(await run_round(tool, warm=True))
+    finally:
+        shutdown.set()
+        await server_task
+
+    print(
+        f"\n轮数：{rounds}，模拟握手：{connect_ms} ms，登录：{login_ms} ms，"
+        f"接口耗时：{delay_ms} ms，预热连接数：{settings.warmup_connections}"
+    )
+    print(f"{'首次调用':<18}{'模式':<8}{'p50(ms)':>10}{'最大(ms)':>10}{'后台预热(ms)':>14}")
+    for (tool, mode), rows in results.items():
+        firsts = [r["first_ms"] for r in rows]
+        warmups = [r["warmup_ms"] for r in rows if r["warmup_ms"] is not None]
+        warmup = f"{statistics.median(warmups):.1f}" if warmups else "-"
+        print(
+            f"{tool:<18}{mode:<8}{statistics.median(firsts):>10.1f}"
+            f"{max(firsts):>10.1f}{warmup:>14}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=5, help="冷/热各运行的轮数")
+    parser.add_argument("--connect-ms", type=float, default=50.0, help="模拟新连接握手耗时（毫秒）")
+    parser.add_argument("--login-ms", type=float, default=150.0, help="模拟登录耗时（毫秒）")
+    parser.add_argument("--delay-ms", type=float, default=20.0, help="模拟接口处理耗时（毫秒）")
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.connect_ms, args.login_ms, args.delay_ms))
@@ -10,17 +10,22 @@
 
 使用方法：
     python run_comprehensive_test.py
+    python run_comprehensive_test.py --record cassettes/full.json   # 录制真实 Halo 的请求
+    python run_comprehensive_test.py --replay cassettes/full.json   # 离线回放，无需 Halo
+    python run_comprehensive_test.py --replay cassettes/full.json --latency-ms 0
 
 环境要求：
     - Python 3.10+
-    - 配置 HALO_BASE_URL 和 HALO_TOKEN 环境变量
+    - 配置 HALO_BASE_URL 和 HALO_TOKEN 环境变量（回放模式不需要）
 """
 
+import argparse
 import asyncio
 import json
 import os
 import sys
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -31,6 +36,7 @@ sys.path.insert(0, str(project_root / "src"))
 from loguru import logger
 
 from halo_mcp_server.client.halo_client import HaloClient
+from halo_mcp_server.config import settings
 
 
 class HaloMCPComprehensiveTest:
@@ -701,6 +707,7 @@ class HaloMCPComprehensiveTest:
 
     async def run_all_tests(self):
         """运行所有测试"""
+        started_at = time.perf_counter()
         await self.setup()
 
         try:
@@ -744,9 +751,9 @@ class HaloMCPComprehensiveTest:
             await self.teardown()
 
         # 输出测试总结
-        self.print_summary()
+        self.print_summary(time.perf_counter() - started_at)
 
-    def print_summary(self):
+    def print_summary(self, elapsed: float):
         """打印测试总结"""
         logger.info("=" * 80)
         logger.info("🎉 测试总结")
@@ -756,7 +763,7 @@ class HaloMCPComprehensiveTest:
         passed = sum(1 for r in self.test_results if r["success"])
         failed = total - passed
 
-        logger.info(f"\n总测试数: {total}")
+        logger.info(f"\n总测试数: {total}，总耗时: {elapsed:.2f} 秒")
         logger.success(f"✓ 通过: {passed}")
         if failed > 0:
             logger.error(f"✗ 失败: {failed}")
@@ -786,4 +793,24 @@ async def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Halo MCP Server 综合测试套件")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", metavar="PATH", help="将请求/响应录制到 cassette 文件")
+    mode.add_argument("--replay", metavar="PATH", help="从 cassette 文件离线回放，无需 Halo 实例")
+    parser.add_argument(
+        "--latency-ms", type=float, default=-1.0, help="回放时每个请求的模拟延迟，-1 为录制时耗时"
+    )
+    args = parser.parse_args()
+
+    if args.record:
+        settings.http_cassette_mode = "record"
+        settings.http_cassette_path = args.record
+    elif args.replay:
+        settings.http_cassette_mode = "replay"
+        settings.http_cassette_path = args.replay
+        settings.http_cassette_latency_ms = args.latency_ms
+        if not settings.has_valid_auth:
+            # 回放时令牌不会发往任何服务端
+            settings.halo_token = "replay"
+
     asyncio.run(main())
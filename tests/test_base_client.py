@@ -0,0 +1,756 @@
+"""BaseHTTPClient 单元测试
+
+使用 httpx.MockTransport 模拟 Halo 服务端，无需真实 Halo 实例。
+"""
+
+import asyncio
+import gzip
+import json
+from dataclasses import replace
+
+import httpx
+import pytest
+
+from halo_mcp_server.client.base import BaseHTTPClient
+from halo_mcp_server.client.breaker import BreakerState, api_group_of
+from halo_mcp_server.client.cache import ResponseCache, make_cache_key
+from halo_mcp_server.client.cassette import CassetteMiss
+from halo_mcp_server.client.limiter import AdaptiveLimiter
+from halo_mcp_server.client.metrics import Histogram, route_template
+from halo_mcp_server.client.retry import RetryPolicy, parse_retry_after
+from halo_mcp_server.client.timeouts import (
+    build_timeout_profiles,
+    deadline_scope,
+    normalize_timeout_override,
+    operation_class_for,
+    override_timeouts,
+)
+from halo_mcp_server.config import settings
+from halo_mcp_server.exceptions import DeadlineExceededError, NetworkError
+
+
+def make_client(handler) -> BaseHTTPClient:
+    """创建挂载 MockTransport 的客户端。"""
+    client = BaseHTTPClient("http://halo.test")
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch):
+    monkeypatch.setattr(settings, "enable_cache", True)
+    monkeypatch.setattr(settings, "cache_ttl", 300)
+    monkeypatch.setattr(settings, "max_retries", 0)
+
+
+class TestResponseCache:
+    def test_cache_key_normalizes_params(self):
+        assert make_cache_key("/a", {"size": 20, "page": 0}) == make_cache_key(
+            "/a", {"page": 0, "size": 20, "keyword": None}
+        )
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10, ttl=60)
+        cache.set("a", "/a", b"1234")
+        cache.set("b", "/b", b"1234")
+        cache.get("a")
+        cache.set("c", "/c", b"1234")
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1234"
+        cache.set("d", "/d", b"12345678")
+        assert len(cache) == 1
+        assert cache.stats()["evictions"] == 3
+
+    def test_expired_entry_is_a_miss(self):
+        cache = ResponseCache(max_entries=2, max_bytes=10, ttl=60)
+        cache.set("a", "/a", b"1")
+        cache._entries["a"].expires_at = 0
+        assert cache.get("a") is None
+
+
+class TestGetCache:
+    async def test_get_is_cached_and_invalidated_by_write(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            if request.method == "GET":
+                return httpx.Response(200, json={"items": [len(calls)]})
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        tags = "/apis/content.halo.run/v1alpha1/tags"
+
+        first = await client.get(tags, params={"page": 0, "size": 100})
+        second = await client.get(tags, params={"size": 100, "page": 0})
+        assert first == second
+        assert len(calls) == 1
+
+        # 命中时复用条目已解码的对象，不再重复解析
+        assert second is first
+        # use_cache=False 返回独立的对象，可安全修改
+        fresh = await client.get(tags, params={"page": 0, "size": 100}, use_cache=False)
+        fresh["items"].append("mutated")
+        assert await client.get(tags, params={"page": 0, "size": 100}) == first
+
+        await client.put(f"{tags}/tag-a", json={})
+        await client.get(tags, params={"page": 0, "size": 100})
+        assert len(calls) == 4
+
+        stats = client.get_cache_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        assert stats["hit_rate"] == 0.5
+
+    async def test_post_write_invalidates_cross_resource_listings(self):
+        posts_total = 0
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal posts_total
+            if request.method == "POST":
+                posts_total += 1
+                return httpx.Response(200, json={})
+            return httpx.Response(200, json={"total": posts_total})
+
+        client = make_client(handler)
+        tag_posts = "/apis/api.content.halo.run/v1alpha1/tags/t1/posts"
+        tags = "/apis/api.console.halo.run/v1alpha1/tags"
+        attachments = "/apis/api.console.halo.run/v1alpha1/attachments"
+        for path in (tag_posts, tags, attachments):
+            assert (await client.get(path))["total"] == 0
+
+        await client.post("/apis/uc.api.content.halo.run/v1alpha1/posts", json={})
+
+        assert (await client.get(tag_posts))["total"] == 1
+        assert (await client.get(tags))["total"] == 1
+        # 无关资源的缓存保留
+        assert (await client.get(attachments))["total"] == 0
+
+    async def test_in_flight_get_is_not_cached_after_write(self, monkeypatch):
+        monkeypatch.setattr(settings, "enable_request_coalescing", True)
+        release = asyncio.Event()
+        version = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal version
+            if request.method == "PUT":
+                version += 1
+                return httpx.Response(200, json={})
+            seen = version
+            if seen == 0:
+                await release.wait()
+            return httpx.Response(200, json={"version": seen})
+
+        client = make_client(handler)
+        tag = "/apis/content.halo.run/v1alpha1/tags/a"
+        stale = asyncio.ensure_future(client.get(tag))
+        await asyncio.sleep(0.01)
+
+        await client.put(tag, json={})
+        # 写操作之后的调用不加入写之前发出的请求
+        fresh = asyncio.ensure_future(client.get(tag))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        assert (await stale)["version"] == 0
+        assert (await fresh)["version"] == 1
+        assert (await client.get(tag))["version"] == 1
+
+    async def test_use_cache_false_bypasses_cache(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler)
+        await client.get("/apis/content.halo.run/v1alpha1/tags/a")
+        await client.get("/apis/content.halo.run/v1alpha1/tags/a", use_cache=False)
+        assert len(calls) == 2
+
+    async def test_get_raw_returns_body_bytes_and_shares_cache(self):
+        calls = []
+        payload = b'{"metadata":{"name":"a"},"spec":{"displayName":"\xe6\xa0\x87\xe7\xad\xbe"}}'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(
+                200, content=payload, headers={"Content-Type": "application/json"}
+            )
+
+        client = make_client(handler)
+        path = "/apis/content.halo.run/v1alpha1/tags/a"
+
+        assert await client.get_raw(path) == payload
+        assert await client.get_raw(path) == payload
+        assert (await client.get(path))["spec"]["displayName"] == "标签"
+        assert len(calls) == 1
+
+
+class TestStreamItems:
+    async def test_stream_items_yields_items_and_meta(self):
+        body = json.dumps(
+            {"page": 0, "total": 3, "items": [{"n": i} for i in range(3)], "hasNext": False}
+        ).encode()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=body)
+
+        client = make_client(handler)
+        meta = {}
+        items = [item async for item in client.stream_items("/apis/x/v1/posts", meta=meta)]
+
+        assert items == [{"n": 0}, {"n": 1}, {"n": 2}]
+        assert meta == {"page": 0, "total": 3, "hasNext": False}
+
+    async def test_stream_items_raises_for_error_status(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500, json={"detail": "boom"})
+
+        client = make_client(handler)
+        with pytest.raises(NetworkError, match="boom"):
+            async for _ in client.stream_items("/apis/x/v1/posts"):
+                pass
+
+
+class TestCoalescing:
+    async def test_concurrent_identical_gets_share_one_request(self, monkeypatch):
+        monkeypatch.setattr(settings, "enable_cache", False)
+        calls = []
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            await release.wait()
+            return httpx.Response(200, json={"items": []})
+
+        client = make_client(handler)
+        path = "/apis/content.halo.run/v1alpha1/categories"
+        tasks = [asyncio.create_task(client.get(path, params={"page": 0})) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert len(calls) == 1
+        assert all(r == {"items": []} for r in results)
+        # 每个调用方拿到独立对象
+        assert len({id(r) for r in results}) == 5
+        stats = client.get_coalescing_stats()
+        assert stats == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+    async def test_cancelled_follower_does_not_cancel_leader(self, monkeypatch):
+        monkeypatch.setattr(settings, "enable_cache", False)
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await release.wait()
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler)
+        leader = asyncio.create_task(client.get("/x"))
+        follower = asyncio.create_task(client.get("/x"))
+        await asyncio.sleep(0)
+        follower.cancel()
+        release.set()
+        assert await leader == {"ok": True}
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+
+
+class TestRevalidation:
+    async def test_expired_entry_is_revalidated_with_etag(self):
+        seen_headers = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"spec": {"title": "hello"}}, headers={"ETag": '"v1"'})
+
+        client = make_client(handler)
+        path = "/apis/uc.api.content.halo.run/v1alpha1/posts/p1"
+        first = await client.get(path)
+        assert first == {"spec": {"title": "hello"}}
+
+        for entry in client._cache._entries.values():
+            entry.expires_at = 0
+        # 304 复用缓存的响应体及其解码结果
+        assert await client.get(path) is first
+        # 刷新后的条目重新生效
+        assert await client.get(path) == {"spec": {"title": "hello"}}
+
+        assert seen_headers == [None, '"v1"']
+        stats = client.get_cache_stats()
+        assert stats["revalidations"] == 1
+        assert stats["bytes_saved"] > 0
+
+
+class TestRetryPolicy:
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monkeypatch.setattr(settings, "max_retries", 3)
+        monkeypatch.setattr("halo_mcp_server.client.base.asyncio.sleep", fake_sleep)
+        return delays
+
+    def test_backoff_is_capped_full_jitter(self):
+        policy = RetryPolicy(max_retries=5, base_delay=1.0, max_delay=4.0, idempotent=True)
+        for attempt in range(1, 6):
+            assert 0 <= policy.backoff(attempt) <= min(4.0, 2 ** (attempt - 1))
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+
+    async def test_get_retries_503_and_honors_retry_after(self, sleeps):
+        statuses = iter([503, 429, 200])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = next(statuses)
+            if status == 200:
+                return httpx.Response(200, json={"ok": True})
+            return httpx.Response(status, headers={"Retry-After": "2"})
+
+        client = make_client(handler)
+        assert await client.get("/x", use_cache=False) == {"ok": True}
+        assert len(sleeps) == 2
+        assert all(d >= 2 for d in sleeps)
+        assert client.get_retry_stats()["by_method"] == {"GET": 2}
+
+    async def test_post_is_not_retried_on_503(self, sleeps):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.method)
+            return httpx.Response(503, json={"message": "busy"})
+
+        client = make_client(handler)
+        with pytest.raises(NetworkError) as exc:
+            await client.post("/x", json={})
+        assert exc.value.status_code == 503
+        assert calls == ["POST"]
+        assert sleeps == []
+
+    async def test_post_retries_only_when_request_was_not_sent(self, sleeps):
+        errors = iter([httpx.ConnectError("refused"), httpx.ReadTimeout("slow")])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise next(errors)
+
+        client = make_client(handler)
+        with pytest.raises(NetworkError):
+            await client.post("/x", json={})
+        assert client.get_retry_stats()["retries"] == 1
+
+
+class TestCircuitBreaker:
+    def test_api_group_of(self):
+        assert api_group_of("/apis/uc.api.content.halo.run/v1alpha1/posts") == (
+            "uc.api.content.halo.run"
+        )
+        assert api_group_of("/actuator/health") == "default"
+
+    async def test_opens_after_threshold_and_fails_fast(self, monkeypatch):
+        monkeypatch.setattr(settings, "circuit_breaker_threshold", 2)
+        monkeypatch.setattr(settings, "circuit_breaker_recovery_timeout", 60)
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.path)
+            return httpx.Response(500, json={"message": "down"})
+
+        client = make_client(handler)
+        path = "/apis/api.console.halo.run/v1alpha1/posts"
+        for _ in range(2):
+            with pytest.raises(NetworkError):
+                await client.get(path, use_cache=False)
+        with pytest.raises(NetworkError) as exc:
+            await client.get(path, use_cache=False)
+
+        assert len(calls) == 2
+        assert exc.value.details["circuit_state"] == "open"
+        breakers = client.get_circuit_breakers()
+        assert breakers["api.console.halo.run"]["state"] == "open"
+        assert breakers["api.console.halo.run"]["rejected"] == 1
+        # 其他 API 组不受影响
+        with pytest.raises(NetworkError) as exc:
+            await client.get("/apis/content.halo.run/v1alpha1/tags", use_cache=False)
+        assert exc.value.status_code == 500
+        await client.close()
+
+    async def test_background_probe_closes_breaker(self):
+        healthy = False
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200 if healthy else 503, json={})
+
+        client = make_client(handler)
+        breaker = client._breaker_for("content.halo.run")
+        breaker.recovery_timeout = 0
+        breaker.trip()
+        breaker.probe_path = "/apis/content.halo.run/v1alpha1/tags"
+
+        healthy = True
+        await client._probe_until_closed(breaker)
+        assert breaker.state == BreakerState.CLOSED
+
+
+class TestHttp2:
+    def test_falls_back_to_http11_without_h2(self, monkeypatch):
+        monkeypatch.setattr(settings, "enable_http2", True)
+        monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+        assert BaseHTTPClient("https://halo.test")._http2_available() is False
+
+    def test_disabled_by_default(self):
+        assert BaseHTTPClient("https://halo.test")._http2_available() is False
+
+
+class TestAdaptiveConcurrency:
+    async def test_aimd_window(self):
+        limiter = AdaptiveLimiter("g", initial_limit=4, min_limit=1, max_limit=8)
+        for _ in range(8):
+            started = await limiter.acquire()
+            await limiter.release(started, overloaded=False)
+        assert limiter.limit > 5
+
+        started = [await limiter.acquire() for _ in range(3)]
+        for s in started:
+            await limiter.release(s, overloaded=True)
+        # 同一轮拥塞只收缩一次
+        assert limiter.decreases == 1
+        assert 2.5 <= limiter.limit < 3.5
+
+    async def test_requests_queue_beyond_limit(self, monkeypatch):
+        monkeypatch.setattr(settings, "http_pool_size", 2)
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await release.wait()
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        tasks = [
+            asyncio.create_task(client.get("/apis/content.halo.run/v1alpha1/tags", params={"i": i}))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        snapshot = client.get_concurrency_limits()["content.halo.run"]
+        assert snapshot["in_flight"] == 2
+        assert snapshot["queued"] == 3
+        release.set()
+        await asyncio.gather(*tasks)
+        assert client.get_concurrency_limits()["content.halo.run"]["queued"] == 0
+
+
+class TestWarmUp:
+    async def test_warm_up_opens_connections_without_metrics(self, monkeypatch):
+        monkeypatch.setattr(settings, "http_pool_size", 6)
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.method, request.url.path))
+            return httpx.Response(200)
+
+        client = make_client(handler)
+        assert await client.warm_up(10) == 3
+        assert seen == [("HEAD", "/actuator/health")] * 3
+        assert client.get_metrics() == {}
+
+    async def test_warm_up_failures_never_raise(self, monkeypatch):
+        monkeypatch.setattr(settings, "http_pool_size", 4)
+        outcomes = iter([httpx.ConnectError("refused"), CassetteMiss("HEAD /actuator/health")])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise next(outcomes)
+
+        client = make_client(handler)
+        assert await client.warm_up(2) == 0
+
+
+class TestRequestCompression:
+    @pytest.fixture(autouse=True)
+    def compression(self, monkeypatch):
+        monkeypatch.setattr(settings, "enable_request_compression", True)
+        monkeypatch.setattr(settings, "request_compression_min_kb", 1)
+
+    async def test_large_json_body_is_gzipped(self):
+        bodies = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            bodies.append((request.headers.get("Content-Encoding"), request.content))
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        raw = "<p>" + "正文内容 " * 2000 + "</p>"
+        await client.put("/apis/content.halo.run/v1alpha1/posts/p1", json={"raw": raw})
+        await client.put("/apis/content.halo.run/v1alpha1/posts/p1", json={"raw": "short"})
+
+        encoding, body = bodies[0]
+        assert encoding == "gzip"
+        assert json.loads(gzip.decompress(body)) == {"raw": raw}
+        assert bodies[1][0] is None
+        assert client._request_gzip is True
+
+    async def test_rejected_gzip_is_resent_plain_and_remembered(self):
+        encodings = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            encoding = request.headers.get("Content-Encoding")
+            encodings.append(encoding)
+            if encoding == "gzip":
+                return httpx.Response(415, json={"detail": "Unsupported Media Type"})
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler)
+        body = {"raw": "x" * 4096}
+        path = "/apis/content.halo.run/v1alpha1/posts/p1"
+        assert await client.put(path, json=body) == {"ok": True}
+        assert await client.put(path, json=body) == {"ok": True}
+
+        assert encodings == ["gzip", None, None]
+        assert client._request_gzip is False
+
+
+class TestMetrics:
+    def test_route_template_replaces_resource_names(self):
+        assert (
+            route_template("/apis/uc.api.content.halo.run/v1alpha1/posts/abc/draft?patched=true")
+            == "/apis/uc.api.content.halo.run/v1alpha1/posts/{name}/draft"
+        )
+        assert (
+            route_template("http://halo.test/apis/content.halo.run/v1alpha1/tags")
+            == "/apis/content.halo.run/v1alpha1/tags"
+        )
+        assert (
+            route_template("/apis/api.console.halo.run/v1alpha1/attachments/-/upload-from-url")
+            == "/apis/api.console.halo.run/v1alpha1/attachments/-/upload-from-url"
+        )
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram((10, 100, 1000))
+        for value in [5] * 90 + [50] * 9 + [5000]:
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 100
+        assert 0 < snapshot["p50"] <= 10
+        assert snapshot["p90"] <= 10
+        assert 10 < snapshot["p99"] <= 100
+        assert snapshot["max"] == 5000
+
+    async def test_records_per_route_and_resets(self, monkeypatch):
+        monkeypatch.setattr(settings, "enable_cache", False)
+        monkeypatch.setattr(settings, "max_retries", 1)
+
+        async def fake_sleep(delay):
+            pass
+
+        monkeypatch.setattr("halo_mcp_server.client.base.asyncio.sleep", fake_sleep)
+        statuses = iter([503, 200, 200, 404])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(next(statuses), json={"metadata": {"name": "a"}})
+
+        client = make_client(handler)
+        await client.get("/apis/content.halo.run/v1alpha1/tags/a")
+        await client.put("/apis/content.halo.run/v1alpha1/tags/b", json={"spec": {}})
+        with pytest.raises(Exception):
+            await client.get("/apis/content.halo.run/v1alpha1/tags/c")
+
+        metrics = client.get_metrics(reset=True)
+        get_tag = metrics["GET /apis/content.halo.run/v1alpha1/tags/{name}"]
+        assert get_tag["requests"] == 2
+        assert get_tag["retries"] == 1
+        assert get_tag["status_counts"] == {"200": 1, "404": 1}
+        assert get_tag["latency_ms"]["count"] == 2
+
+        put_tag = metrics["PUT /apis/content.halo.run/v1alpha1/tags/{name}"]
+        assert put_tag["request_bytes"]["total"] == len(b'{"spec":{}}')
+        assert put_tag["response_bytes"]["total"] > 0
+
+        assert client.get_metrics() == {}
+
+
+class TestCassette:
+    async def test_record_then_replay_offline(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "enable_cache", False)
+        monkeypatch.setattr(settings, "http_cassette_path", str(tmp_path / "halo.json"))
+        versions = iter([1, 2])
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/auth/login"):
+                return httpx.Response(200, json={"access_token": "secret-token"})
+            if request.method == "GET":
+                return httpx.Response(200, json={"metadata": {"version": next(versions)}})
+            return httpx.Response(200, json={"ok": True})
+
+        monkeypatch.setattr(settings, "http_cassette_mode", "record")
+        recorder = BaseHTTPClient("http://halo.test")
+        _, hooks = recorder._cassette_hooks()
+        recorder._client = httpx.AsyncClient(
+            base_url=recorder.base_url, transport=httpx.MockTransport(handler), event_hooks=hooks
+        )
+        post = "/apis/content.halo.run/v1alpha1/posts/p1"
+        await recorder.post("/apis/api.console.halo.run/v1alpha1/auth/login", json={})
+        await recorder.get(post, params={"a": 1, "b": 2})
+        await recorder.put(post, json={"spec": {}})
+        await recorder.get(post, params={"b": 2, "a": 1})
+        await recorder.close()
+
+        assert "secret-token" not in (tmp_path / "halo.json").read_text(encoding="utf-8")
+
+        monkeypatch.setattr(settings, "http_cassette_mode", "replay")
+        monkeypatch.setattr(settings, "http_cassette_latency_ms", 0)
+        replayer = BaseHTTPClient("http://other.test")
+        await replayer.connect()
+        login = await replayer.post("/apis/api.console.halo.run/v1alpha1/auth/login", json={})
+        assert login == {"access_token": "redacted"}
+        assert (await replayer.get(post, params={"a": 1, "b": 2}))["metadata"]["version"] == 1
+        assert await replayer.put(post, json={"spec": {"changed": True}}) == {"ok": True}
+        assert (await replayer.get(post, params={"a": 1, "b": 2}))["metadata"]["version"] == 2
+
+        with pytest.raises(NetworkError, match="cassette"):
+            await replayer.get("/apis/content.halo.run/v1alpha1/tags")
+        await replayer.close()
+
+
+class TestTimeouts:
+    def test_operation_class(self):
+        posts = "/apis/api.console.halo.run/v1alpha1/posts"
+        assert operation_class_for("GET", posts) == "metadata_read"
+        assert operation_class_for("POST", posts) == "content_write"
+        assert operation_class_for("PUT", f"{posts}/p1/publish") == "publish"
+        assert operation_class_for("PUT", f"{posts}/p1/unpublish") == "publish"
+        attachments = "/apis/api.console.halo.run/v1alpha1/attachments"
+        assert operation_class_for("POST", f"{attachments}/upload") == "upload"
+        assert operation_class_for("POST", f"{attachments}/-/upload-from-url") == "upload"
+
+    def test_omitted_phases_fall_back_to_mcp_timeout(self, monkeypatch):
+        monkeypatch.setattr(settings, "mcp_timeout", 42)
+        monkeypatch.setattr(settings, "timeout_upload", "write=300")
+        profile = build_timeout_profiles()["upload"]
+        assert profile.write == 300
+        assert profile.connect == profile.read == profile.pool == 42
+
+    def test_tool_override(self):
+        client = BaseHTTPClient("http://halo.test")
+        path = "/apis/content.halo.run/v1alpha1/posts"
+        default = client.timeout_for("GET", path)
+
+        with override_timeouts(normalize_timeout_override(3)):
+            timeout = client.timeout_for("GET", path)
+        assert (timeout.read, timeout.write) == (3, 3)
+        assert timeout.connect == default.connect
+
+        with override_timeouts(normalize_timeout_override({"connect": 1})):
+            timeout = client.timeout_for("GET", path)
+        assert timeout.connect == 1
+        assert timeout.read == default.read
+        assert client.timeout_for("GET", path) == default
+
+    async def test_request_uses_profile(self):
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen[request.method] = request.extensions["timeout"]
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        client.timeout_profiles["metadata_read"] = replace(
+            client.timeout_profiles["metadata_read"], read=7
+        )
+        path = "/apis/content.halo.run/v1alpha1/posts/p1"
+        await client.get(path, use_cache=False)
+        with override_timeouts({"write": 9}):
+            await client.put(path, json={})
+        await client.close()
+
+        assert seen["GET"]["read"] == 7
+        assert seen["PUT"]["write"] == 9
+
+    @pytest.mark.parametrize("value", [0, -1, True, "10", {"total": 5}, {"read": 0}])
+    def test_invalid_override(self, value):
+        with pytest.raises(ValueError):
+            normalize_timeout_override(value)
+
+
+class TestDeadline:
+    def test_timeouts_are_capped_by_remaining_budget(self):
+        client = BaseHTTPClient("http://halo.test")
+        path = "/apis/content.halo.run/v1alpha1/posts"
+        with deadline_scope(2):
+            timeout = client.timeout_for("POST", path)
+        assert 0 < timeout.read <= 2
+        assert 0 < timeout.connect <= 2
+        assert client.timeout_for("POST", path).read > 2
+
+    async def test_retry_that_cannot_finish_in_time_is_skipped(self, monkeypatch):
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(settings, "max_retries", 3)
+        monkeypatch.setattr("halo_mcp_server.client.base.asyncio.sleep", fake_sleep)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, headers={"Retry-After": "5"})
+
+        client = make_client(handler)
+        with deadline_scope(1), pytest.raises(NetworkError) as exc:
+            await client.get("/x", use_cache=False)
+        assert exc.value.status_code == 503
+        assert sleeps == []
+        assert client.get_retry_stats()["deadline_skipped"] == 1
+
+    async def test_slow_request_is_aborted_at_deadline(self):
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(5)
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with deadline_scope(0.05), pytest.raises(DeadlineExceededError):
+            await client.get("/apis/content.halo.run/v1alpha1/posts", use_cache=False)
+        assert loop.time() - started < 1
+        # 调用方的截止时间不说明服务端异常，不计入熔断器
+        breaker = client._breaker_for(api_group_of("/apis/content.halo.run/v1alpha1/posts"))
+        assert breaker.consecutive_failures == 0
+
+    async def test_expired_deadline_sends_nothing(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={})
+
+        client = make_client(handler)
+        with deadline_scope(0), pytest.raises(DeadlineExceededError):
+            await client.post("/x", json={})
+        assert calls == []
+
+    async def test_stream_items_keeps_items_read_before_deadline(self):
+        async def body():
+            yield b'{"items":[{"n":1},'
+            await asyncio.sleep(0.1)
+            yield b'{"n":2},'
+            yield b'{"n":3}],"total":3}'
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, content=body())
+
+        client = make_client(handler)
+        items = []
+        with deadline_scope(0.05), pytest.raises(DeadlineExceededError):
+            async for item in client.stream_items("/x"):
+                items.append(item)
+        # 超时后到达的数据块仍会被解析，之后不再继续读取
+        assert items == [{"n": 1}, {"n": 2}]
@@ -0,0 +1,28 @@
+"""JSON codec 单元测试"""
+
+import json
+
+import pytest
+
+from halo_mcp_server.utils import codec
+
+
+def test_round_trip_keeps_non_ascii():
+    data = {"title": "你好", "items": [1, 2.5, None, True]}
+    assert "你好" in codec.dumps(data)
+    assert codec.loads(codec.dumps_bytes(data)) == data
+
+
+def test_pretty_matches_stdlib_indentation():
+    data = {"a": [1, {"b": "中文"}]}
+    assert json.loads(codec.dumps(data, pretty=True)) == data
+    assert codec.dumps(data, pretty=True).splitlines()[1].startswith("  ")
+
+
+def test_big_int_falls_back_to_stdlib():
+    assert codec.loads(codec.dumps({"n": 2**70})) == {"n": 2**70}
+
+
+def test_decode_error_is_json_decode_error():
+    with pytest.raises(codec.JSONDecodeError):
+        codec.loads(b"{not json")
@@ -0,0 +1,379 @@
+"""HaloClient 认证与令牌缓存单元测试"""
+
+import asyncio
+import base64
+import json
+import os
+import stat
+import time
+
+import httpx
+import pytest
+
+from halo_mcp_server import server
+from halo_mcp_server.client.halo_client import AuthState, HaloClient
+from halo_mcp_server.client.token_store import CachedToken, TokenStore, token_expiry
+from halo_mcp_server.config import settings
+from halo_mcp_server.exceptions import AuthenticationError, NetworkError
+from halo_mcp_server.tools.attachment_tools import list_attachments, upload_attachment
+
+
+@pytest.fixture(autouse=True)
+def password_auth(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "halo_base_url", "http://halo.test")
+    monkeypatch.setattr(settings, "halo_token", None)
+    monkeypatch.setattr(settings, "halo_username", "admin")
+    monkeypatch.setattr(settings, "halo_password", "secret")
+    monkeypatch.setattr(settings, "enable_token_cache", True)
+    monkeypatch.setattr(settings, "token_cache_path", str(tmp_path / "tokens.json"))
+    monkeypatch.setattr(settings, "http_cassette_mode", "off")
+    monkeypatch.setattr(settings, "max_retries", 0)
+
+
+def make_handler(logins, revoked=()):
+    """模拟 Halo：logins 记录登录请求，revoked 中的令牌返回 401。"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/auth/login"):
+            logins.append(request)
+            return httpx.Response(
+                200, json={"access_token": f"token-{len(logins)}", "expires_in": 3600}
+            )
+        # 让并发请求都带着旧令牌到达服务端
+        await asyncio.sleep(0.01)
+        authorization = request.headers.get("Authorization")
+        if authorization in {f"Bearer {token}" for token in revoked}:
+            return httpx.Response(401)
+        return httpx.Response(200, json={"auth": authorization})
+
+    return handler
+
+
+def make_halo_client(logins, revoked=()):
+    """创建挂载 MockTransport 的 HaloClient。"""
+    client = HaloClient()
+    client._client = httpx.AsyncClient(
+        base_url=client.base_url, transport=httpx.MockTransport(make_handler(logins, revoked))
+    )
+    return client
+
+
+def jwt_with_exp(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).rstrip(b"=")
+    return f"header.{payload.decode()}.signature"
+
+
+class TestTokenStore:
+    def test_round_trip_with_private_permissions(self, tmp_path):
+        store = TokenStore(tmp_path / "cache" / "tokens.json")
+        key = TokenStore.key_for("http://halo.test/", "admin")
+        store.save(key, CachedToken("abc", time.time() + 60))
+
+        assert store.load(key).token == "abc"
+        assert store.load(TokenStore.key_for("http://other.test", "admin")) is None
+        if os.name == "posix":
+            assert stat.S_IMODE(store.path.stat().st_mode) == 0o600
+            assert stat.S_IMODE(store.path.parent.stat().st_mode) == 0o700
+
+    def test_expired_and_corrupt_entries_are_ignored(self, tmp_path):
+        store = TokenStore(tmp_path / "tokens.json")
+        store.save("old", CachedToken("abc", time.time() - 1))
+        assert store.load("old") is None
+
+        store.path.write_text("{not json", encoding="utf-8")
+        assert store.load("old") is None
+        store.save("new", CachedToken("def", time.time() + 60))
+        assert store.load("new").token == "def"
+
+    def test_token_expiry_sources(self):
+        now = time.time()
+        assert token_expiry("t", {"expires_in": 100}, 10) == pytest.approx(now + 100, abs=5)
+        assert token_expiry(jwt_with_exp(now + 500), {}, 10) == pytest.approx(now + 500)
+        assert token_expiry("not-a-jwt", {}, 10) == pytest.approx(now + 10, abs=5)
+
+
+class TestPasswordAuth:
+    async def test_token_is_reused_across_clients(self):
+        logins = []
+        first = make_halo_client(logins)
+        await first.authenticate()
+        await first.close()
+
+        second = make_halo_client(logins)
+        await second.authenticate()
+        response = await second.get("/apis/content.halo.run/v1alpha1/posts", use_cache=False)
+        await second.close()
+
+        assert len(logins) == 1
+        assert response["auth"] == "Bearer token-1"
+
+    async def test_token_near_expiry_is_not_reused(self):
+        TokenStore(settings.token_cache_path).save(
+            TokenStore.key_for(settings.halo_base_url, "admin"),
+            CachedToken("stale", time.time() + settings.token_refresh_margin / 2),
+        )
+        logins = []
+        client = make_halo_client(logins)
+        await client.authenticate()
+        await client.close()
+        assert len(logins) == 1
+
+    async def test_token_is_refreshed_in_background(self, monkeypatch):
+        monkeypatch.setattr(HaloClient, "_refresh_delay", lambda self: 0.01)
+        logins = []
+        client = make_halo_client(logins)
+        await client.authenticate()
+        for _ in range(100):
+            if len(logins) >= 2:
+                break
+            await asyncio.sleep(0.01)
+        response = await client.get("/apis/content.halo.run/v1alpha1/posts", use_cache=False)
+        await client.close()
+
+        assert len(logins) >= 2
+        assert response["auth"] != "Bearer token-1"
+        cached = TokenStore(settings.token_cache_path).load(client._cache_key())
+        assert cached.token == client._token.token
+
+
+class TestReauthentication:
+    async def test_concurrent_401s_share_one_login(self):
+        logins = []
+        revoked = set()
+        client = make_halo_client(logins, revoked)
+        await client.authenticate()
+        revoked.add("token-1")
+
+        responses = await asyncio.gather(
+            *(
+                client.get(f"/apis/content.halo.run/v1alpha1/posts/p{i}", use_cache=False)
+                for i in range(5)
+            )
+        )
+        await client.close()
+
+        assert len(logins) == 2
+        assert all(r["auth"] == "Bearer token-2" for r in responses)
+        assert client.get_auth_stats() == {"reauths": 1, "replays": 5, "failures": 0}
+        assert client.auth_state is AuthState.READY
+
+    async def test_static_token_is_not_replayed(self, monkeypatch):
+        monkeypatch.setattr(settings, "halo_token", "fixed")
+        logins = []
+        client = make_halo_client(logins, revoked={"fixed"})
+        await client.authenticate()
+
+        with pytest.raises(AuthenticationError):
+            await client.post("/apis/content.halo.run/v1alpha1/posts", json={})
+        await client.close()
+
+        assert logins == []
+        assert client.auth_state is AuthState.UNINITIALIZED
+        assert client.get_auth_stats()["replays"] == 0
+
+    async def test_failed_relogin_is_reported(self):
+        logins = []
+        revoked = {"token-1"}
+        client = make_halo_client(logins, revoked)
+        await client.authenticate()
+        client._client._transport = httpx.MockTransport(
+            lambda request: httpx.Response(401 if "login" not in request.url.path else 500)
+        )
+
+        with pytest.raises(AuthenticationError):
+            await client.get("/apis/content.halo.run/v1alpha1/posts", use_cache=False)
+        await client.close()
+
+        assert client.get_auth_stats() == {"reauths": 0, "replays": 0, "failures": 1}
+
+
+class TestAuthState:
+    async def test_concurrent_callers_share_one_login(self):
+        logins = []
+        client = make_halo_client(logins)
+        assert client.auth_state is AuthState.UNINITIALIZED
+
+        await asyncio.gather(*(client.ensure_authenticated() for _ in range(10)))
+        await client.close()
+
+        assert len(logins) == 1
+        assert client.auth_state is AuthState.READY
+
+    async def test_failure_is_recorded_and_retried(self, monkeypatch):
+        monkeypatch.setattr(settings, "halo_username", None)
+        client = make_halo_client([])
+
+        with pytest.raises(Exception):
+            await client.ensure_authenticated()
+        assert client.auth_state is AuthState.FAILED
+        assert client.auth_error is not None
+
+        monkeypatch.setattr(settings, "halo_username", "admin")
+        await client.ensure_authenticated()
+        await client.close()
+        assert client.auth_state is AuthState.READY
+
+
+class TestClientSingleton:
+    @pytest.fixture(autouse=True)
+    def fresh_server(self, monkeypatch):
+        monkeypatch.setattr(server, "halo_client", None)
+        monkeypatch.setattr(server, "_client_task", None)
+
+    def mock_client_class(self, monkeypatch, logins, created):
+        class MockHaloClient(HaloClient):
+            async def connect(self):
+                created.append(self)
+                self._client = httpx.AsyncClient(
+                    base_url=self.base_url, transport=httpx.MockTransport(make_handler(logins))
+                )
+
+        monkeypatch.setattr(server, "HaloClient", MockHaloClient)
+
+    async def test_concurrent_cold_calls_create_one_client(self, monkeypatch):
+        logins, created = [], []
+        self.mock_client_class(monkeypatch, logins, created)
+
+        clients = await asyncio.gather(*(server.get_halo_client() for _ in range(10)))
+        await clients[0].close()
+
+        assert len(created) == 1
+        assert len(logins) == 1
+        assert all(c is clients[0] for c in clients)
+
+    async def test_failed_init_is_retried(self, monkeypatch):
+        logins, created = [], []
+        self.mock_client_class(monkeypatch, logins, created)
+        monkeypatch.setattr(settings, "halo_password", None)
+
+        results = await asyncio.gather(
+            *(server.get_halo_client() for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(r, Exception) for r in results)
+        assert len(created) == 1
+        assert server.halo_client is None
+
+        monkeypatch.setattr(settings, "halo_password", "secret")
+        client = await server.get_halo_client()
+        await client.close()
+        assert len(created) == 2
+        assert client.auth_state is AuthState.READY
+
+
+class TestUploadCassette:
+    async def test_upload_is_recorded_and_replayed_offline(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "halo_token", "fixed")
+        monkeypatch.setattr(settings, "http_cassette_path", str(tmp_path / "halo.json"))
+        image = tmp_path / "cover.png"
+        image.write_bytes(b"\x89PNG")
+        uploads = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            uploads.append(request)
+            return httpx.Response(200, json={"metadata": {"name": "attachment-1"}})
+
+        monkeypatch.setattr(settings, "http_cassette_mode", "record")
+        recorder = HaloClient()
+        record_hooks = recorder._cassette_hooks
+
+        def mock_transport_with_record_hooks():
+            return httpx.MockTransport(handler), record_hooks()[1]
+
+        # 经 connect() 创建，带上客户端默认的 JSON 请求头
+        monkeypatch.setattr(recorder, "_cassette_hooks", mock_transport_with_record_hooks)
+        await recorder.connect()
+        recorded = await upload_attachment(str(image), client=recorder)
+        await recorder.close()
+
+        [upload] = uploads
+        assert upload.url.path == "/apis/api.console.halo.run/v1alpha1/attachments/upload"
+        assert upload.headers["Content-Type"].startswith("multipart/form-data; boundary=")
+        assert upload.headers["Authorization"] == "Bearer fixed"
+
+        monkeypatch.setattr(settings, "http_cassette_mode", "replay")
+        monkeypatch.setattr(settings, "http_cassette_latency_ms", 0)
+        replayer = HaloClient()
+        assert await upload_attachment(str(image), client=replayer) == recorded
+        await replayer.close()
+        assert len(uploads) == 1
+
+
+class TestUploadAttachment:
+    @pytest.fixture
+    def image(self, tmp_path):
+        path = tmp_path / "cover.png"
+        path.write_bytes(b"\x89PNG")
+        return str(path)
+
+    async def test_upload_invalidates_attachment_listings(self, monkeypatch, image):
+        monkeypatch.setattr(settings, "halo_token", "fixed")
+        monkeypatch.setattr(settings, "enable_cache", True)
+        attachments = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                attachments.append({"metadata": {"name": "attachment-1"}})
+                return httpx.Response(200, json=attachments[-1])
+            return httpx.Response(200, json={"items": attachments})
+
+        client = HaloClient()
+        client._client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        assert await list_attachments(client=client) == {"items": []}
+        await upload_attachment(image, client=client)
+        assert len((await list_attachments(client=client))["items"]) == 1
+        await client.close()
+
+    async def test_upload_follows_post_retry_policy(self, monkeypatch, image):
+        monkeypatch.setattr(settings, "halo_token", "fixed")
+        monkeypatch.setattr(settings, "max_retries", 3)
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr("halo_mcp_server.client.base.asyncio.sleep", fake_sleep)
+        outcomes = iter(
+            [httpx.ConnectError("refused"), httpx.ReadTimeout("slow"), httpx.Response(503)]
+        )
+        uploads = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            uploads.append(request.method)
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        client = HaloClient()
+        client._client = httpx.AsyncClient(
+            base_url=client.base_url, transport=httpx.MockTransport(handler)
+        )
+        # 未发出的请求可以重试；已发出的上传超时后不重试，避免重复创建附件
+        with pytest.raises(NetworkError):
+            await upload_attachment(image, client=client)
+        assert uploads == ["POST", "POST"]
+        assert len(sleeps) == 1
+
+        # 5xx 同样不重试
+        with pytest.raises(NetworkError) as exc:
+            await upload_attachment(image, client=client)
+        assert exc.value.status_code == 503
+        assert uploads == ["POST"] * 3
+        await client.close()
+
+    async def test_upload_relogs_in_after_401(self, monkeypatch, image):
+        monkeypatch.setattr(settings, "enable_metrics", True)
+        logins = []
+        client = make_halo_client(logins, revoked={"token-1"})
+
+        result = await upload_attachment(image, client=client)
+
+        assert result == {"auth": "Bearer token-2"}
+        assert len(logins) == 2
+        assert client.get_auth_stats()["replays"] == 1
+        # 上传与其他请求一样计入熔断器与请求指标
+        assert "api.console.halo.run" in client.get_circuit_breakers()
+        assert any("/attachments/upload" in route for route in client.get_metrics())
+        await client.close()
@@ -0,0 +1,58 @@
+"""流式列表解析单元测试"""
+
+import json
+
+import pytest
+
+from halo_mcp_server.utils import codec
+from halo_mcp_server.utils.jsonstream import ItemStreamParser
+
+DOC = {
+    "page": 0,
+    "size": 20,
+    "total": 4,
+    'key "quoted"': "a,b]}",
+    "items": [
+        {"post": {"spec": {"title": "中文标题, [括号]"}}, "tags": [{"items": [1]}]},
+        'text with "escapes" \\ and ]',
+        3,
+        None,
+    ],
+    "extra": {"nested": [1, 2]},
+    "hasNext": False,
+}
+
+
+def feed_in_chunks(raw: bytes, size: int):
+    parser = ItemStreamParser()
+    items = []
+    for i in range(0, len(raw), size):
+        items.extend(parser.feed(raw[i : i + size]))
+    parser.close()
+    return items, parser.meta
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 100000])
+def test_items_and_meta_survive_any_chunking(chunk_size):
+    raw = json.dumps(DOC, ensure_ascii=False).encode()
+    items, meta = feed_in_chunks(raw, chunk_size)
+
+    assert items == DOC["items"]
+    assert meta == {
+        "page": 0,
+        "size": 20,
+        "total": 4,
+        'key "quoted"': "a,b]}",
+        "hasNext": False,
+    }
+
+
+def test_top_level_array_is_the_item_list():
+    assert feed_in_chunks(b'[{"a": 1}, 2]', 4) == ([{"a": 1}, 2], {})
+
+
+def test_truncated_stream_raises():
+    parser = ItemStreamParser()
+    assert parser.feed(b'{"items": [{"a": 1}, {"b":') == [{"a": 1}]
+    with pytest.raises(codec.JSONDecodeError):
+        parser.close()
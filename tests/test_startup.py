@@ -0,0 +1,69 @@
+"""启动导入耗时预算测试
+
+MCP 客户端每个会话都会启动新的 stdio 进程，冷启动耗时直接影响首次响应。
+使用 ``python -X importtime`` 导入 ``halo_mcp_server.server``，检查：
+
+- Markdown、slugify、Pillow 等重型依赖只在工具需要时才导入
+- 本项目模块自身的导入耗时与整体导入耗时不超过预算
+
+较慢的 CI 机器可通过环境变量 ``HALO_IMPORT_BUDGET_MS`` / ``HALO_IMPORT_TOTAL_BUDGET_MS``
+调整预算。
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).parent.parent / "src"
+
+# 本项目模块自身（不含第三方依赖）的导入耗时预算
+OWN_BUDGET_MS = float(os.environ.get("HALO_IMPORT_BUDGET_MS", 250))
+# 导入 server 的整体耗时预算（含 mcp、pydantic、httpx 等依赖）
+TOTAL_BUDGET_MS = float(os.environ.get("HALO_IMPORT_TOTAL_BUDGET_MS", 2500))
+
+LAZY_MODULES = ("markdown", "markdown_it", "mdit_py_plugins", "mdit_py_toc", "slugify", "PIL")
+
+
+def import_times() -> dict:
+    """返回 ``{模块名: (自身耗时 µs, 累计耗时 µs)}``。"""
+    pythonpath = os.pathsep.join([str(SRC), os.environ.get("PYTHONPATH", "")])
+    env = {**os.environ, "PYTHONPATH": pythonpath}
+    command = [sys.executable, "-X", "importtime", "-c", "import halo_mcp_server.server"]
+    # 第一次运行可能包含字节码编译，只统计第二次
+    subprocess.run(command, env=env, capture_output=True, check=True)
+    result = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+@pytest.fixture(scope="module")
+def times():
+    return import_times()
+
+
+def test_heavy_dependencies_are_lazy(times):
+    loaded = sorted(name for name in times if name.split(".")[0] in LAZY_MODULES)
+    assert loaded == [], f"启动时不应导入：{loaded}"
+
+
+def test_import_budget(times):
+    own_us = sum(s for name, (s, _) in times.items() if name.startswith("halo_mcp_server"))
+    own_ms = own_us / 1000
+    total_ms = times["halo_mcp_server.server"][1] / 1000
+    assert (
+        own_ms <= OWN_BUDGET_MS
+    ), f"项目模块导入耗时 {own_ms:.0f} ms，超过预算 {OWN_BUDGET_MS:.0f} ms"
+    assert (
+        total_ms <= TOTAL_BUDGET_MS
+    ), f"导入 server 耗时 {total_ms:.0f} ms，超过预算 {TOTAL_BUDGET_MS:.0f} ms"
@@ -0,0 +1,428 @@
+"""工具注册表与 call_tool 分发单元测试"""
+
+import asyncio
+import json
+
+import pytest
+from mcp.types import Tool
+
+from halo_mcp_server import server
+from halo_mcp_server.client.timeouts import remaining_budget
+from halo_mcp_server.exceptions import DeadlineExceededError
+from halo_mcp_server.tools import post_tools
+from halo_mcp_server.tools.concurrency import ToolConcurrency
+from halo_mcp_server.tools.registry import (
+    ALL_TOOLS,
+    CONCURRENCY_CLASSES,
+    TOOL_REGISTRY,
+    ToolSpec,
+    build_registry,
+)
+from halo_mcp_server.config import settings
+from halo_mcp_server.tools.output import format_tool_output
+from halo_mcp_server.tools.projection import parse_fields, projection_scope, render_body
+from halo_mcp_server.tools.validation import ArgumentValidator
+
+
+def make_tool(name: str) -> Tool:
+    return Tool(name=name, description=name, inputSchema={"type": "object", "properties": {}})
+
+
+class TestRegistry:
+    def test_every_tool_is_registered_with_metadata(self):
+        assert list(TOOL_REGISTRY) == [tool.name for tool in ALL_TOOLS]
+        for spec in TOOL_REGISTRY.values():
+            assert spec.concurrency in CONCURRENCY_CLASSES
+            assert "timeout" in spec.tool.inputSchema["properties"]
+            assert "deadline_ms" in spec.tool.inputSchema["properties"]
+            if spec.cacheable:
+                assert spec.read_only
+            if spec.projectable:
+                assert spec.read_only
+                assert "fields" in spec.tool.inputSchema["properties"]
+
+        assert TOOL_REGISTRY["get_post"].read_only
+        assert not TOOL_REGISTRY["create_post"].read_only
+        assert TOOL_REGISTRY["publish_post"].concurrency == "publish"
+        assert TOOL_REGISTRY["upload_attachment"].concurrency == "upload"
+        assert not TOOL_REGISTRY["get_client_metrics"].cacheable
+        assert TOOL_REGISTRY["get_post_draft"].projectable
+        assert not TOOL_REGISTRY["get_halo_base_url"].projectable
+
+    def test_inconsistent_tables_are_rejected(self):
+        with pytest.raises(ValueError, match="缺少处理器"):
+            build_registry(ALL_TOOLS + [make_tool("no_handler")])
+        with pytest.raises(ValueError, match="重复"):
+            build_registry(ALL_TOOLS + [ALL_TOOLS[0]])
+        with pytest.raises(ValueError, match="没有对应的工具"):
+            build_registry(ALL_TOOLS[1:])
+
+    async def test_list_tools_comes_from_registry(self):
+        tools = await server.list_tools()
+        assert [tool.name for tool in tools] == list(TOOL_REGISTRY)
+
+
+class TestCallTool:
+    async def test_dispatches_through_registry(self, monkeypatch):
+        calls = []
+
+        async def handler(client, args):
+            calls.append((client, args))
+            return json.dumps({"success": True}, indent=2)
+
+        client = object()
+
+        async def get_client():
+            return client
+
+        tool = make_tool("fake")
+        spec = ToolSpec(
+            tool, handler, "read", True, True, False, ArgumentValidator(tool.inputSchema)
+        )
+        monkeypatch.setitem(TOOL_REGISTRY, "fake", spec)
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+
+        result = await server.call_tool("fake", {"a": 1, "timeout": 5})
+
+        assert result[0]["text"] == '{"success":true}'
+        assert calls == [(client, {"a": 1})]
+
+        result = await server.call_tool("fake", {"output_format": "pretty"})
+        assert result[0]["text"] == '{\n  "success": true\n}'
+        assert calls[-1] == (client, {})
+
+        monkeypatch.setattr(settings, "tool_output_format", "pretty")
+        result = await server.call_tool("fake", {})
+        assert result[0]["text"] == '{\n  "success": true\n}'
+
+    async def test_fields_projection(self, monkeypatch):
+        draft = {
+            "metadata": {
+                "name": "s1",
+                "annotations": {"content.halo.run/content-json": "{}", "a": "1"},
+            },
+            "spec": {"rawPatch": "x" * 100, "contentPatch": "y" * 100, "rawType": "html"},
+        }
+        calls = []
+
+        async def get_post_draft(client, args):
+            calls.append(args)
+            return render_body(json.dumps(draft).encode())
+
+        async def get_client():
+            return object()
+
+        spec = TOOL_REGISTRY["get_post_draft"]
+        monkeypatch.setitem(
+            TOOL_REGISTRY, "get_post_draft", ToolSpec(**{**vars(spec), "handler": get_post_draft})
+        )
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+
+        result = await server.call_tool("get_post_draft", {"name": "p1"})
+        assert json.loads(result[0]["text"]) == {
+            "metadata": {"name": "s1", "annotations": {"a": "1"}},
+            "spec": {"rawType": "html"},
+        }
+
+        result = await server.call_tool("get_post_draft", {"name": "p1", "fields": "full"})
+        assert json.loads(result[0]["text"]) == draft
+
+        result = await server.call_tool(
+            "get_post_draft", {"name": "p1", "fields": ["metadata.name", "spec.rawPatch"]}
+        )
+        assert json.loads(result[0]["text"]) == {
+            "metadata": {"name": "s1"},
+            "spec": {"rawPatch": "x" * 100},
+        }
+        assert calls[-1] == {"name": "p1"}
+
+    async def test_get_post_projects_shared_decoded_object(self, monkeypatch):
+        body = json.dumps(
+            {
+                "metadata": {"name": "p1", "annotations": {"content.halo.run/content-json": "{}"}},
+                "spec": {"title": "T"},
+            }
+        ).encode()
+        decoded = []
+
+        class Client:
+            async def ensure_authenticated(self):
+                pass
+
+            async def get_raw(self, path, params=None):
+                return body
+
+            def decode_raw(self, raw, path, params=None):
+                # 模拟缓存：同一响应体只解码一次，返回共享对象
+                if not decoded:
+                    decoded.append(json.loads(raw))
+                return decoded[0]
+
+        client = Client()
+
+        async def get_client():
+            return client
+
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+        for _ in range(2):
+            result = await server.call_tool("get_post", {"name": "p1"})
+            assert json.loads(result[0]["text"]) == {
+                "metadata": {"name": "p1", "annotations": {}},
+                "spec": {"title": "T"},
+            }
+        # 投影不修改共享的解码结果
+        assert decoded == [json.loads(body)]
+
+    async def test_unknown_tool(self, monkeypatch):
+        async def get_client():
+            raise AssertionError("未知工具不应初始化客户端")
+
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+        result = await server.call_tool("nope", {})
+        assert result[0]["text"] == "Unknown tool: nope"
+
+    async def test_invalid_arguments_fail_without_network(self, monkeypatch):
+        async def get_client():
+            raise AssertionError("参数不合法时不应初始化客户端")
+
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+        result = await server.call_tool(
+            "create_post", {"title": 1, "tags": ["a", 2], "timeout": -1}
+        )
+
+        payload = json.loads(result[0]["text"])
+        assert payload["success"] is False
+        paths = [error["path"] for error in payload["data"]["errors"]]
+        assert paths == ["(root)", "tags[1]", "timeout", "title"]
+
+
+class TestDeadline:
+    @pytest.fixture
+    def slow_tool(self, monkeypatch):
+        budgets = []
+
+        async def handler(client, args):
+            budgets.append(remaining_budget())
+            await asyncio.sleep(5)
+            return "{}"
+
+        async def get_client():
+            return object()
+
+        tool = make_tool("slow")
+        spec = ToolSpec(
+            tool, handler, "read", True, True, False, ArgumentValidator(tool.inputSchema)
+        )
+        monkeypatch.setitem(TOOL_REGISTRY, "slow", spec)
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+        return budgets
+
+    async def test_deadline_aborts_tool_call(self, slow_tool):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await server.call_tool("slow", {"deadline_ms": 50})
+        assert loop.time() - started < 1
+
+        payload = json.loads(result[0]["text"])
+        assert payload["success"] is False
+        assert payload["data"] == {"deadline_ms": 50}
+        assert 0 < slow_tool[0] <= 0.05
+
+    async def test_cancellation_propagates(self, slow_tool):
+        task = asyncio.ensure_future(server.call_tool("slow", {}))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert slow_tool == [None]
+
+    async def test_list_my_posts_returns_partial_items(self):
+        class Client:
+            async def ensure_authenticated(self):
+                pass
+
+            async def stream_items(self, path, params=None, meta=None):
+                yield {"post": {"metadata": {"name": "p1"}, "spec": {"title": "T"}}}
+                raise DeadlineExceededError("读取列表响应时超出截止时间")
+
+        payload = json.loads(await post_tools.list_my_posts_tool(Client(), {}))
+        assert payload["partial"] is True
+        assert [item["name"] for item in payload["items"]] == ["p1"]
+
+    async def test_update_post_reports_completed_steps(self):
+        class Client:
+            async def ensure_authenticated(self):
+                pass
+
+            async def get(self, path, params=None, use_cache=None):
+                if path.endswith("/draft"):
+                    raise DeadlineExceededError("请求超出截止时间")
+                return {"spec": {"title": "old"}}
+
+            async def put(self, path, json=None, params=None):
+                return {}
+
+        args = {"name": "p1", "title": "new", "content": "<p>x</p>"}
+        payload = json.loads(await post_tools.update_post_tool(Client(), args))
+        assert payload["success"] is False
+        assert payload["data"] == {"post_name": "p1", "completed_steps": ["metadata"]}
+
+
+class TestToolConcurrency:
+    async def test_uploads_queue_without_blocking_reads(self, monkeypatch):
+        release = asyncio.Event()
+
+        async def upload(client, args):
+            await release.wait()
+            return "{}"
+
+        async def read(client, args):
+            return '{"ok":true}'
+
+        async def get_client():
+            return object()
+
+        for name, handler, concurrency in (("up", upload, "upload"), ("rd", read, "read")):
+            tool = make_tool(name)
+            spec = ToolSpec(
+                tool, handler, concurrency, False, False, False, ArgumentValidator(tool.inputSchema)
+            )
+            monkeypatch.setitem(TOOL_REGISTRY, name, spec)
+        limits = ToolConcurrency({"read": 2, "write": 1, "upload": 1, "publish": 1})
+        monkeypatch.setattr(server, "TOOL_CONCURRENCY", limits)
+        monkeypatch.setattr(server, "get_halo_client", get_client)
+
+        uploads = [asyncio.ensure_future(server.call_tool("up", {})) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        result = await asyncio.wait_for(server.call_tool("rd", {}), 1)
+        assert result[0]["text"] == '{"ok":true}'
+
+        snapshot = limits.snapshot()["upload"]
+        assert (snapshot["in_flight"], snapshot["queued"], snapshot["waited"]) == (1, 2, 2)
+        assert limits.snapshot()["read"]["waited"] == 0
+
+        release.set()
+        await asyncio.gather(*uploads)
+        snapshot = limits.snapshot()["upload"]
+        assert (snapshot["in_flight"], snapshot["calls"]) == (0, 3)
+        assert snapshot["queue_ms"]["count"] == 3
+        assert snapshot["queue_ms"]["max"] > 0
+
+    def test_limits_come_from_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "tool_concurrency_upload", 3)
+        snapshot = ToolConcurrency.from_settings().snapshot()
+        assert list(snapshot) == list(CONCURRENCY_CLASSES)
+        assert snapshot["upload"]["limit"] == 3
+        assert snapshot["read"]["limit"] == settings.tool_concurrency_read
+
+
+class TestOutputFormat:
+    def test_compact_output_is_passed_through(self):
+        text = '{"a":"line\\nbreak","b":[1,2]}'
+        assert format_tool_output(text, "compact") is text
+        pretty = format_tool_output(text, "pretty")
+        assert pretty == json.dumps(json.loads(text), indent=2)
+
+    def test_pretty_output_is_compacted(self):
+        text = json.dumps({"名称": "标签", "n": 1}, ensure_ascii=False, indent=2)
+        assert format_tool_output(text, "compact") == '{"名称":"标签","n":1}'
+
+    def test_non_json_text_is_unchanged(self):
+        assert format_tool_output("Unknown tool: x", "pretty") == "Unknown tool: x"
+        assert format_tool_output("line 1\nline 2", "compact") == "line 1\nline 2"
+
+
+class TestProjection:
+    def test_list_items_are_projected(self):
+        data = {
+            "page": 1,
+            "total": 2,
+            "items": [
+                {"metadata": {"name": f"t{i}", "version": i}, "spec": {"displayName": f"T{i}"}}
+                for i in range(2)
+            ],
+        }
+        projected = parse_fields("metadata.name, spec.displayName").apply(data)
+        assert projected == {
+            "page": 1,
+            "total": 2,
+            "items": [
+                {"metadata": {"name": "t0"}, "spec": {"displayName": "T0"}},
+                {"metadata": {"name": "t1"}, "spec": {"displayName": "T1"}},
+            ],
+        }
+
+    def test_summary_preset_covers_listed_and_flattened_posts(self):
+        listed = {
+            "post": {"metadata": {"name": "p1", "labels": {}}, "spec": {"title": "T"}},
+            "categories": [{"metadata": {"name": "c1"}, "spec": {"displayName": "C"}}],
+        }
+        flattened = {"name": "p1", "title": "T", "categories": ["C"], "labels": {}}
+        summary = parse_fields("summary")
+        assert summary.apply(listed) == {
+            "post": {"metadata": {"name": "p1"}, "spec": {"title": "T"}},
+            "categories": [{"spec": {"displayName": "C"}}],
+        }
+        assert summary.apply(flattened) == {"name": "p1", "title": "T", "categories": ["C"]}
+
+    def test_dotted_keys_and_overlapping_paths(self):
+        data = {"metadata": {"labels": {"content.halo.run/published": "true", "x": "y"}}}
+        projection = parse_fields("metadata.labels.content.halo.run/published")
+        assert projection.apply(data) == {
+            "metadata": {"labels": {"content.halo.run/published": "true"}}
+        }
+        projection = parse_fields(["metadata", "metadata.labels.x"])
+        assert projection.apply(data) == data
+
+    def test_tool_results_and_plain_text_are_untouched(self):
+        error = '{"success":false,"message":"错误：rawPatch","data":null}'
+        with projection_scope(parse_fields("summary")):
+            assert render_body(error.encode()) == error
+            assert render_body(b"rawPatch") == "rawPatch"
+            assert render_body(b"") == "{}"
+
+    def test_default_projection_skips_parsing_without_heavy_fields(self):
+        def decode(body):
+            raise AssertionError("不应解析响应体")
+
+        with projection_scope(parse_fields(None)):
+            assert (
+                render_body(b'{"metadata":{"name":"p1"}}', decode) == '{"metadata":{"name":"p1"}}'
+            )
+
+    def test_apply_does_not_modify_input(self):
+        data = {
+            "metadata": {"annotations": {"content.halo.run/content-json": "{}", "a": "1"}},
+            "spec": {"title": "T"},
+            "items": [{"rawPatch": "x"}, {"name": "n"}],
+        }
+        snapshot = json.loads(json.dumps(data))
+        projected = parse_fields(None).apply(data)
+        assert data == snapshot
+        assert projected == {
+            "metadata": {"annotations": {"a": "1"}},
+            "spec": {"title": "T"},
+            "items": [{}, {"name": "n"}],
+        }
+        # 不含大字段的部分与原对象共享
+        assert projected["spec"] is data["spec"]
+        assert projected["items"][1] is data["items"][1]
+
+    def test_invalid_paths(self):
+        with pytest.raises(ValueError, match="字段路径"):
+            parse_fields("metadata..name")
+        with pytest.raises(ValueError, match="字段路径"):
+            parse_fields(["spec.title", " "])
+
+
+class TestArgumentValidator:
+    @pytest.mark.parametrize("name", list(TOOL_REGISTRY))
+    def test_tool_schemas_are_valid(self, name):
+        ArgumentValidator(TOOL_REGISTRY[name].tool.inputSchema, check_schema=True)
+
+    def test_valid_and_invalid(self):
+        validator = ArgumentValidator(TOOL_REGISTRY["get_post"].tool.inputSchema)
+        assert validator.errors({"name": "p1"}) == []
+        assert validator.errors({"name": "p1", "timeout": {"read": 5}}) == []
+        assert validator.errors({})[0]["message"] == "'name' is a required property"
+        assert validator.errors({"name": 3})[0]["path"] == "name"